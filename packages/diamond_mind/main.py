@@ -8,6 +8,12 @@ import asyncio
 import signal
 from typing import List
 
+try:
+    import uvloop
+    _UVLOOP_AVAILABLE = True
+except ImportError:
+    _UVLOOP_AVAILABLE = False
+
 from diamond_mind.shared import (
     settings,
     ensure_directories,
@@ -63,16 +69,25 @@ async def run_agents():
     # Start all agents
     tasks = [asyncio.create_task(agent.start()) for agent in agents]
     
-    # Wait for all agents
+    # Wait for all agents; if one fails, cancel the rest rather than leaving
+    # them running unsupervised (TaskGroup semantics, kept 3.10-compatible)
     try:
         await asyncio.gather(*tasks)
     except asyncio.CancelledError:
         logger.info("Received shutdown signal")
     finally:
-        # Stop all agents
+        for task in tasks:
+            task.cancel()
+        
+        # Stop all agents in parallel
         logger.info("Stopping agents...")
-        for agent in agents:
-            await agent.stop()
+        results = await asyncio.gather(
+            *(agent.stop() for agent in agents), return_exceptions=True
+        )
+        for agent, result in zip(agents, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error stopping {agent.agent_id.value}: {result}")
+        await asyncio.gather(*tasks, return_exceptions=True)
         
         # Shutdown messaging
         await shutdown_messaging()
@@ -87,9 +102,14 @@ def main():
     print(f"Debug Mode: {settings.debug_mode}")
     print(f"Log Level: {settings.log_level}")
     print(f"Redis: {settings.redis_host}:{settings.redis_port}")
+    print(f"Event Loop: {'uvloop' if _UVLOOP_AVAILABLE else 'asyncio'}")
     print("=" * 70)
     print()
     
+    # uvloop's libuv-based loop cuts per-await overhead on the Redis round trips
+    if _UVLOOP_AVAILABLE:
+        uvloop.install()
+    
     # Run the async main function
     try:
         asyncio.run(run_agents())
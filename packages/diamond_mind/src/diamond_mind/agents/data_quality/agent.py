@@ -12,13 +12,113 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import IsolationForest
 
-from shared.base_agent import BaseAgent
+from shared.base_agent import BaseAgent, TaskHandler
 from shared import AgentType, AgentTask, AgentResult, TaskStatus, AlertSeverity
 from shared.schemas import DataAnomalyReport, DataQualityMetrics
 
 
+def _score_fields(scores: Optional[np.ndarray], quantize: bool) -> Dict[str, Any]:
+    """
+    DataAnomalyReport score fields for non-negative per-row scores.
+
+    Quantized scores are int8 codes 0-127 against one per-report scale,
+    which keeps the JSON payload to a few characters per row.
+    """
+    if scores is None or len(scores) == 0:
+        return {}
+    if not quantize:
+        return {"anomaly_scores": scores.tolist()}
+    peak = float(scores.max())
+    scale = peak / 127 if peak > 0 else 1.0
+    return {
+        "anomaly_scores_q": np.round(scores / scale).astype(np.int8).tolist(),
+        "score_scale": scale,
+    }
+
+
+def run_anomaly_detection(
+    df: pd.DataFrame,
+    task_id: str,
+    threshold: float = 3.0,
+    contamination: float = 0.05,
+    include_rows: bool = False,
+    quantize_scores: bool = False,
+) -> List[DataAnomalyReport]:
+    """
+    Run Isolation Forest and Z-score anomaly detection on numeric columns.
+
+    Module-level (rather than a method) so it can be shipped to a worker
+    process via BaseAgent.run_cpu_bound. With ``include_rows`` each report
+    also carries the flagged row positions and their scores as parallel
+    arrays; ``quantize_scores`` sends those scores as int8 codes instead.
+    """
+    # Imported here so the agent module loads without pulling in sklearn
+    from sklearn.ensemble import IsolationForest
+
+    reports: List[DataAnomalyReport] = []
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+
+    if not numeric_cols:
+        return reports
+
+    X = df[numeric_cols].fillna(df[numeric_cols].median())
+
+    # Isolation Forest (multivariate), trees built across all cores
+    iso = IsolationForest(contamination=contamination, random_state=42, n_jobs=-1)
+    # Same as fit_predict (outliers score < 0), but keeps the scores
+    iso_scores = iso.fit(X).decision_function(X)
+    iso_rows = np.flatnonzero(iso_scores < 0)
+    iso_count = len(iso_rows)
+    if iso_count > 0:
+        reports.append(
+            DataAnomalyReport(
+                anomaly_id=f"iso_forest_{task_id}",
+                anomaly_type="isolation_forest_outliers",
+                severity=AlertSeverity.WARNING,
+                affected_columns=numeric_cols,
+                row_count=iso_count,
+                detection_method="isolation_forest",
+                auto_fixable=False,
+                row_ids=iso_rows.tolist() if include_rows else [],
+                **_score_fields(-iso_scores[iso_rows] if include_rows else None, quantize_scores),
+            )
+        )
+
+    # Z-score for all columns in one pass; NaNs are excluded per column
+    values = df[numeric_cols].to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    n_valid = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(valid, values, 0.0).sum(axis=0) / n_valid
+        centered = np.where(valid, values - mean, 0.0)
+        std = np.sqrt((centered ** 2).sum(axis=0) / (n_valid - 1))
+        abs_z = np.abs(centered / std)
+        flagged = abs_z > threshold
+    z_counts = flagged.sum(axis=0)
+
+    for j, (col, n, col_std, z_count) in enumerate(zip(numeric_cols, n_valid, std, z_counts)):
+        if n < 2 or col_std == 0 or z_count == 0:
+            continue
+        z_rows = np.flatnonzero(flagged[:, j]) if include_rows else np.empty(0, dtype=np.intp)
+        reports.append(
+            DataAnomalyReport(
+                anomaly_id=f"zscore_{col}_{task_id}",
+                anomaly_type="zscore_outlier",
+                severity=AlertSeverity.INFO,
+                affected_columns=[col],
+                row_count=int(z_count),
+                detection_method="zscore",
+                auto_fixable=True,
+                fix_description=f"Clip values beyond {threshold} std devs",
+                row_ids=z_rows.tolist(),
+                **_score_fields(abs_z[z_rows, j] if include_rows else None, quantize_scores),
+            )
+        )
+
+    return reports
+
+
 class DataQualityAgent(BaseAgent):
     """Agent responsible for monitoring and maintaining data quality."""
 
@@ -41,18 +141,13 @@ class DataQualityAgent(BaseAgent):
     # Task dispatch
     # ------------------------------------------------------------------
 
-    async def handle_task(self, task: AgentTask) -> AgentResult:
-        """Route tasks to the appropriate handler."""
-        handlers = {
+    def handlers(self) -> Dict[str, TaskHandler]:
+        return {
             "check_data_quality": self._check_data_quality,
             "detect_anomalies": self._detect_anomalies,
             "validate_schema": self._validate_schema,
             "repair_data": self._repair_data,
         }
-        handler = handlers.get(task.task_type)
-        if handler is None:
-            raise ValueError(f"Unknown task type: {task.task_type}")
-        return await handler(task)
 
     # ------------------------------------------------------------------
     # Public task handlers
@@ -64,11 +159,15 @@ class DataQualityAgent(BaseAgent):
         auto_fix = task.parameters.get("auto_fix", False)
         threshold = task.parameters.get("threshold", 3.0)
         contamination = task.parameters.get("contamination", 0.05)
+        include_rows = task.parameters.get("include_rows", False)
+        quantize_scores = task.parameters.get("quantize_scores", False)
 
         df = self._load_data(data_source)
 
-        anomaly_reports = self._run_anomaly_detection(
-            df, task.task_id, threshold=threshold, contamination=contamination
+        anomaly_reports = await self.run_cpu_bound(
+            run_anomaly_detection,
+            df, task.task_id, threshold=threshold, contamination=contamination,
+            include_rows=include_rows, quantize_scores=quantize_scores,
         )
         schema_report = self._run_schema_validation(df, data_source)
 
@@ -116,10 +215,14 @@ class DataQualityAgent(BaseAgent):
         data_source = task.parameters.get("data_source", "")
         threshold = task.parameters.get("threshold", 3.0)
         contamination = task.parameters.get("contamination", 0.05)
+        include_rows = task.parameters.get("include_rows", False)
+        quantize_scores = task.parameters.get("quantize_scores", False)
 
         df = self._load_data(data_source)
-        reports = self._run_anomaly_detection(
-            df, task.task_id, threshold=threshold, contamination=contamination
+        reports = await self.run_cpu_bound(
+            run_anomaly_detection,
+            df, task.task_id, threshold=threshold, contamination=contamination,
+            include_rows=include_rows, quantize_scores=quantize_scores,
         )
 
         total_anomalous = sum(r.row_count for r in reports)
@@ -216,65 +319,6 @@ class DataQualityAgent(BaseAgent):
             return pd.read_csv(path)
         raise ValueError(f"Unsupported file format: {path.suffix!r}. Use .parquet or .csv.")
 
-    def _run_anomaly_detection(
-        self,
-        df: pd.DataFrame,
-        task_id: str,
-        threshold: float = 3.0,
-        contamination: float = 0.05,
-    ) -> List[DataAnomalyReport]:
-        """Run Isolation Forest and Z-score anomaly detection on numeric columns."""
-        reports: List[DataAnomalyReport] = []
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-
-        if not numeric_cols:
-            return reports
-
-        X = df[numeric_cols].fillna(df[numeric_cols].median())
-
-        # Isolation Forest (multivariate)
-        iso = IsolationForest(contamination=contamination, random_state=42)
-        preds = iso.fit_predict(X)
-        iso_count = int((preds == -1).sum())
-        if iso_count > 0:
-            reports.append(
-                DataAnomalyReport(
-                    anomaly_id=f"iso_forest_{task_id}",
-                    anomaly_type="isolation_forest_outliers",
-                    severity=AlertSeverity.WARNING,
-                    affected_columns=numeric_cols,
-                    row_count=iso_count,
-                    detection_method="isolation_forest",
-                    auto_fixable=False,
-                )
-            )
-
-        # Z-score per column
-        for col in numeric_cols:
-            col_data = df[col].dropna()
-            if len(col_data) < 2:
-                continue
-            std = col_data.std()
-            if std == 0:
-                continue
-            z_scores = ((col_data - col_data.mean()) / std).abs()
-            z_count = int((z_scores > threshold).sum())
-            if z_count > 0:
-                reports.append(
-                    DataAnomalyReport(
-                        anomaly_id=f"zscore_{col}_{task_id}",
-                        anomaly_type="zscore_outlier",
-                        severity=AlertSeverity.INFO,
-                        affected_columns=[col],
-                        row_count=z_count,
-                        detection_method="zscore",
-                        auto_fixable=True,
-                        fix_description=f"Clip values beyond {threshold} std devs",
-                    )
-                )
-
-        return reports
-
     def _run_schema_validation(
         self, df: pd.DataFrame, data_source: str
     ) -> Dict[str, Any]:
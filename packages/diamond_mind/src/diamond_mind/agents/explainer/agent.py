@@ -22,7 +22,7 @@ from typing import Any, Dict, List, Optional
 
 import numpy as np
 
-from shared.base_agent import BaseAgent
+from shared.base_agent import BaseAgent, TaskHandler
 from shared import AgentType, AgentTask, AgentResult, TaskStatus, AlertSeverity
 from shared.schemas import ConfidenceLevel, PredictionExplanation
 from shared import message_queue, settings
@@ -113,17 +113,13 @@ class ExplainerAgent(BaseAgent):
     # Task dispatch
     # ------------------------------------------------------------------
 
-    async def handle_task(self, task: AgentTask) -> AgentResult:
-        handlers = {
+    def handlers(self) -> Dict[str, TaskHandler]:
+        return {
             "explain_prediction": self._explain_prediction,
             "explain_batch": self._explain_batch,
             "get_cached": self._get_cached,
             "clear_cache": self._clear_cache,
         }
-        handler = handlers.get(task.task_type)
-        if handler is None:
-            raise ValueError(f"Unknown task type: {task.task_type!r}")
-        return await handler(task)
 
     # ------------------------------------------------------------------
     # Task handlers
@@ -7,15 +7,14 @@ and generating counterfactual scenarios for XGBoost / tree-based models.
 
 from __future__ import annotations
 
+import importlib.util
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
-try:
-    import shap
-    _SHAP_AVAILABLE = True
-except ImportError:
-    _SHAP_AVAILABLE = False
+# Only check that shap is installed; importing it costs seconds, so that is
+# deferred until an explainer is actually built
+_SHAP_AVAILABLE = importlib.util.find_spec("shap") is not None
 
 
 def shap_available() -> bool:
@@ -43,6 +42,8 @@ def create_tree_explainer(model: Any) -> Any:
         )
     if model is None:
         raise ValueError("model must not be None")
+    import shap
+
     return shap.TreeExplainer(model)
 
 
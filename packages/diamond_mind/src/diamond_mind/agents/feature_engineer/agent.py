@@ -16,12 +16,8 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression, Ridge
-from sklearn.model_selection import cross_val_score
-from sklearn.pipeline import make_pipeline
-from sklearn.preprocessing import StandardScaler
 
-from shared.base_agent import BaseAgent
+from shared.base_agent import BaseAgent, TaskHandler
 from shared import AgentType, AgentTask, AgentResult, TaskStatus, AlertSeverity, TaskPriority
 from shared.schemas import FeatureCandidate, FeatureSearchResult
 from shared import settings
@@ -81,17 +77,13 @@ class FeatureEngineerAgent(BaseAgent):
     # Task dispatch
     # ------------------------------------------------------------------
 
-    async def handle_task(self, task: AgentTask) -> AgentResult:
-        handlers = {
+    def handlers(self) -> Dict[str, TaskHandler]:
+        return {
             "search_features": self._search_features,
             "evaluate_feature": self._evaluate_feature,
             "generate_features": self._generate_features,
             "get_llm_suggestions": self._get_llm_suggestions,
         }
-        handler = handlers.get(task.task_type)
-        if handler is None:
-            raise ValueError(f"Unknown task type: {task.task_type}")
-        return await handler(task)
 
     # ------------------------------------------------------------------
     # 5.5  Feature Search (GA + LLM + evaluation)
@@ -345,6 +337,11 @@ class FeatureEngineerAgent(BaseAgent):
         self, X: pd.DataFrame, y: pd.Series, cv: int = 3
     ) -> float:
         """Cross-validated R² for a Ridge model on the original feature set."""
+        from sklearn.linear_model import Ridge
+        from sklearn.model_selection import cross_val_score
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+
         X_clean, y_clean = self._drop_na_rows(X, y)
         if len(X_clean) < cv * 2 or X_clean.empty:
             return 0.0
@@ -371,6 +368,8 @@ class FeatureEngineerAgent(BaseAgent):
 
         VIF = 1 / (1 - R²).  Returns 1.0 if no other columns exist.
         """
+        from sklearn.linear_model import LinearRegression
+
         other_cols = [c for c in X.columns if c != feature_col]
         if not other_cols:
             return 1.0
@@ -15,10 +15,6 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import Ridge
-from sklearn.model_selection import cross_val_score
-from sklearn.preprocessing import StandardScaler
-from sklearn.pipeline import make_pipeline
 
 from shared.schemas import FeatureCandidate
 
@@ -279,6 +275,11 @@ class FeatureGA:
         Returns the mean cross-validated R² of a Ridge regression trained on
         (X + new_feature).  Returns ``baseline_score`` on any failure.
         """
+        from sklearn.linear_model import Ridge
+        from sklearn.model_selection import cross_val_score
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+
         if len(X) < self.cv_folds * 2:
             return baseline_score
 
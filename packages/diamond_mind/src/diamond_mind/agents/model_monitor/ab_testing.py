@@ -11,7 +11,6 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 import numpy as np
-from scipy import stats
 
 
 @dataclass
@@ -123,6 +122,8 @@ class ABTest:
         champ_errors = self.champion.errors
         chal_errors = self.challenger.errors
 
+        from scipy import stats  # deferred: scipy.stats is slow to import
+
         t_stat, p_value = stats.ttest_ind(champ_errors, chal_errors, equal_var=False)
 
         champ_mae = float(champ_errors.mean())
@@ -14,11 +14,16 @@ from typing import Any, Dict, List, Optional
 import numpy as np
 import pandas as pd
 
-from shared.base_agent import BaseAgent
+from shared.base_agent import BaseAgent, TaskHandler
 from shared import AgentType, AgentTask, AgentResult, TaskStatus, AlertSeverity, TaskPriority
 from shared.schemas import DriftDetectionResult, ModelPerformanceMetrics
 
-from .drift_detection import detect_feature_drift, calculate_psi, run_ks_test
+from .drift_detection import (
+    DEFAULT_APPROX_KS_MIN_SAMPLES,
+    detect_feature_drift,
+    calculate_psi,
+    run_ks_test,
+)
 from .ab_testing import ABTest
 
 
@@ -58,8 +63,8 @@ class ModelMonitorAgent(BaseAgent):
     # Task dispatch
     # ------------------------------------------------------------------
 
-    async def handle_task(self, task: AgentTask) -> AgentResult:
-        handlers = {
+    def handlers(self) -> Dict[str, TaskHandler]:
+        return {
             "check_drift": self._check_drift,
             "evaluate_performance": self._evaluate_performance,
             "trigger_retraining": self._trigger_retraining,
@@ -68,10 +73,6 @@ class ModelMonitorAgent(BaseAgent):
             "register_model_version": self._register_model_version,
             "rollback_model": self._rollback_model,
         }
-        handler = handlers.get(task.task_type)
-        if handler is None:
-            raise ValueError(f"Unknown task type: {task.task_type}")
-        return await handler(task)
 
     # ------------------------------------------------------------------
     # Task handlers
@@ -84,6 +85,9 @@ class ModelMonitorAgent(BaseAgent):
         model_name = task.parameters.get("model_name", data_source)
         psi_threshold = task.parameters.get("psi_threshold", 0.2)
         ks_p_threshold = task.parameters.get("ks_p_threshold", 0.05)
+        approx_ks_min_samples = task.parameters.get(
+            "approx_ks_min_samples", DEFAULT_APPROX_KS_MIN_SAMPLES
+        )
 
         current_df = self._load_data(data_source)
 
@@ -108,10 +112,12 @@ class ModelMonitorAgent(BaseAgent):
                 duration_seconds=0.0,
             )
 
-        drift_result = detect_feature_drift(
+        drift_result = await self.run_cpu_bound(
+            detect_feature_drift,
             baseline_df, current_df,
             psi_threshold=psi_threshold,
             ks_p_threshold=ks_p_threshold,
+            approx_ks_min_samples=approx_ks_min_samples,
         )
 
         if drift_result.drift_detected:
@@ -8,12 +8,15 @@ feature drift detection with no external ML dependencies.
 from __future__ import annotations
 
 import numpy as np
-from scipy import stats
 from typing import Dict, List, Tuple
 
 from shared.schemas import DriftDetectionResult
 
 
+# Samples at or above this size (on both sides) use asymptotic_ks_test
+DEFAULT_APPROX_KS_MIN_SAMPLES = 100_000
+
+
 def calculate_psi(expected: np.ndarray, actual: np.ndarray, bins: int = 10) -> float:
     """
     Calculate Population Stability Index between two distributions.
@@ -31,24 +34,58 @@ def calculate_psi(expected: np.ndarray, actual: np.ndarray, bins: int = 10) -> f
     Returns:
         PSI score (non-negative float).
     """
-    expected = np.asarray(expected, dtype=float)
-    actual = np.asarray(actual, dtype=float)
+    expected = np.asarray(expected, dtype=float).reshape(-1, 1)
+    actual = np.asarray(actual, dtype=float).reshape(-1, 1)
+    return round(float(calculate_psi_columns(expected, actual, bins)[0]), 6)
 
-    # Derive bin edges from the combined range
-    combined = np.concatenate([expected, actual])
-    bin_edges = np.linspace(combined.min(), combined.max(), bins + 1)
-    # Ensure last edge is inclusive
-    bin_edges[-1] += 1e-10
 
-    exp_counts, _ = np.histogram(expected, bins=bin_edges)
-    act_counts, _ = np.histogram(actual, bins=bin_edges)
+def calculate_psi_columns(
+    expected: np.ndarray, actual: np.ndarray, bins: int = 10
+) -> np.ndarray:
+    """
+    Calculate PSI for every column of two 2-D arrays in one vectorized pass.
 
-    # Convert to proportions, smoothing zeros to avoid log(0)
-    exp_pct = np.where(exp_counts == 0, 1e-6, exp_counts / len(expected))
-    act_pct = np.where(act_counts == 0, 1e-6, act_counts / len(actual))
+    Each column is binned into ``bins`` equal-width bins over the combined
+    range of its expected and actual values. NaNs are ignored, so columns
+    may have different numbers of valid values.
 
-    psi = float(np.sum((act_pct - exp_pct) * np.log(act_pct / exp_pct)))
-    return round(psi, 6)
+    Args:
+        expected: Baseline values, shape (n_expected, n_features).
+        actual:   Current values, shape (n_actual, n_features).
+        bins:     Number of histogram bins per feature.
+
+    Returns:
+        Array of PSI scores, one per column (NaN where a column has no
+        valid values on either side).
+    """
+    n_features = expected.shape[1]
+    with np.errstate(invalid="ignore"):
+        lo = np.fmin(np.nanmin(expected, axis=0, initial=np.inf),
+                     np.nanmin(actual, axis=0, initial=np.inf))
+        hi = np.fmax(np.nanmax(expected, axis=0, initial=-np.inf),
+                     np.nanmax(actual, axis=0, initial=-np.inf))
+    width = hi - lo
+    # Constant columns land in a single bin on both sides
+    scale = np.divide(bins, width, out=np.zeros_like(width), where=width > 0)
+
+    def _proportions(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        valid = ~np.isnan(values)
+        idx = np.floor((values - lo) * scale)
+        idx = np.clip(np.nan_to_num(idx), 0, bins - 1).astype(np.intp)
+        # Offset each column's bins so one bincount covers all features
+        flat = (idx + np.arange(n_features) * bins)[valid]
+        counts = np.bincount(flat, minlength=n_features * bins).reshape(n_features, bins)
+        n_valid = valid.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pct = counts / n_valid[:, None]
+        # Smooth empty bins to avoid log(0)
+        return np.where(counts == 0, 1e-6, pct), n_valid
+
+    exp_pct, exp_n = _proportions(expected)
+    act_pct, act_n = _proportions(actual)
+
+    psi = np.sum((act_pct - exp_pct) * np.log(act_pct / exp_pct), axis=1)
+    return np.where((exp_n > 0) & (act_n > 0), psi, np.nan)
 
 
 def run_ks_test(expected: np.ndarray, actual: np.ndarray) -> Tuple[float, float]:
@@ -62,15 +99,47 @@ def run_ks_test(expected: np.ndarray, actual: np.ndarray) -> Tuple[float, float]
     Returns:
         (ks_statistic, p_value) — p < 0.05 suggests significant drift.
     """
+    from scipy import stats  # deferred: scipy.stats is slow to import
+
     result = stats.ks_2samp(expected, actual)
     return float(result.statistic), float(result.pvalue)
 
 
+def asymptotic_ks_test(expected: np.ndarray, actual: np.ndarray) -> Tuple[float, float]:
+    """
+    Two-sample KS test with the asymptotic p-value, for large samples.
+
+    D = sup |F_x(t) - F_y(t)| is exact: both empirical step CDFs are
+    evaluated at every distinct value of either sample, so ties in
+    discrete features (counts, flags) are handled like in run_ks_test.
+    The p-value uses the asymptotic KS distribution for the effective
+    sample size n*m / (n + m), skipping scipy's per-call method selection.
+
+    Args:
+        expected: Baseline values (NaN-free).
+        actual:   Current values (NaN-free).
+
+    Returns:
+        (ks_statistic, p_value), comparable to run_ks_test.
+    """
+    from scipy import stats  # deferred: scipy.stats is slow to import
+
+    expected = np.sort(np.asarray(expected, dtype=float))
+    actual = np.sort(np.asarray(actual, dtype=float))
+    points = np.unique(np.concatenate([expected, actual]))
+    exp_cdf = np.searchsorted(expected, points, side="right") / len(expected)
+    act_cdf = np.searchsorted(actual, points, side="right") / len(actual)
+    d = float(np.max(np.abs(exp_cdf - act_cdf)))
+    effective_n = max(1, round(len(expected) * len(actual) / (len(expected) + len(actual))))
+    return d, float(stats.kstwo.sf(d, effective_n))
+
+
 def detect_feature_drift(
     baseline_df,
     current_df,
     psi_threshold: float = 0.2,
     ks_p_threshold: float = 0.05,
+    approx_ks_min_samples: int = DEFAULT_APPROX_KS_MIN_SAMPLES,
 ) -> DriftDetectionResult:
     """
     Compare numeric feature distributions between baseline and current DataFrames.
@@ -82,6 +151,9 @@ def detect_feature_drift(
         current_df:      Current/production distribution (pandas DataFrame).
         psi_threshold:   PSI threshold for flagging drift.
         ks_p_threshold:  KS p-value threshold (smaller → more sensitive).
+        approx_ks_min_samples: When both samples of a feature have at least
+                         this many values, the KS p-value comes from the
+                         asymptotic distribution (see asymptotic_ks_test).
 
     Returns:
         DriftDetectionResult schema instance.
@@ -95,21 +167,32 @@ def detect_feature_drift(
     ks_statistics: Dict[str, float] = {}
     affected_features: List[str] = []
 
-    for col in common_cols:
-        base_vals = baseline_df[col].dropna().values
-        curr_vals = current_df[col].dropna().values
-
-        if len(base_vals) < 2 or len(curr_vals) < 2:
-            continue
-
-        psi = calculate_psi(base_vals, curr_vals)
-        ks_stat, ks_p = run_ks_test(base_vals, curr_vals)
-
-        psi_scores[col] = psi
-        ks_statistics[col] = ks_stat
-
-        if psi >= psi_threshold or ks_p < ks_p_threshold:
-            affected_features.append(col)
+    if common_cols:
+        base_arr = baseline_df[common_cols].to_numpy(dtype=float)
+        curr_arr = current_df[common_cols].to_numpy(dtype=float)
+        base_n = (~np.isnan(base_arr)).sum(axis=0)
+        curr_n = (~np.isnan(curr_arr)).sum(axis=0)
+        psi_all = calculate_psi_columns(base_arr, curr_arr)
+
+        for j, col in enumerate(common_cols):
+            if base_n[j] < 2 or curr_n[j] < 2:
+                continue
+
+            base_vals = base_arr[:, j]
+            curr_vals = curr_arr[:, j]
+            base_vals = base_vals[~np.isnan(base_vals)]
+            curr_vals = curr_vals[~np.isnan(curr_vals)]
+            psi = round(float(psi_all[j]), 6)
+            if min(base_n[j], curr_n[j]) >= approx_ks_min_samples:
+                ks_stat, ks_p = asymptotic_ks_test(base_vals, curr_vals)
+            else:
+                ks_stat, ks_p = run_ks_test(base_vals, curr_vals)
+
+            psi_scores[col] = psi
+            ks_statistics[col] = ks_stat
+
+            if psi >= psi_threshold or ks_p < ks_p_threshold:
+                affected_features.append(col)
 
     drift_detected = len(affected_features) > 0
 
@@ -12,7 +12,7 @@ import json
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-from shared.base_agent import BaseAgent
+from shared.base_agent import BaseAgent, TaskHandler
 from shared import AgentType, AgentTask, AgentResult, TaskStatus, AlertSeverity, TaskPriority
 from shared.schemas import AgentHealthStatus, SystemStatus
 from shared import settings, message_queue
@@ -96,17 +96,13 @@ class OrchestratorAgent(BaseAgent):
     # Task dispatch
     # ------------------------------------------------------------------
 
-    async def handle_task(self, task: AgentTask) -> AgentResult:
-        handlers = {
+    def handlers(self) -> Dict[str, TaskHandler]:
+        return {
             "route_task": self._route_task,
             "system_health": self._system_health,
             "resolve_conflict": self._resolve_conflict,
             "retrain_model": self._retrain_model,
         }
-        handler = handlers.get(task.task_type)
-        if handler is None:
-            raise ValueError(f"Unknown task type: {task.task_type}")
-        return await handler(task)
 
     # ------------------------------------------------------------------
     # 4.2  Task Routing
@@ -8,7 +8,6 @@ Submits tasks to:
 - OrchestratorAgent — trigger retraining workflows
 """
 
-import asyncio
 import logging
 import uuid
 from pathlib import Path
@@ -24,7 +23,7 @@ if _dm_src not in _sys.path:
 
 from shared.config import settings  # noqa: E402
 from shared.messaging import MessageQueue  # noqa: E402
-from shared.schemas import AgentTask, AgentResult, AgentType, TaskPriority, TaskStatus  # noqa: E402
+from shared.schemas import AgentTask, AgentResult, AgentType, TaskPriority  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -311,25 +310,17 @@ class MatchupMachineIntegration:
         self,
         task_id: str,
         *,
-        poll_interval: float = 2.0,
         timeout: float = 300.0,
     ) -> Optional[AgentResult]:
         """
-        Poll the result queue until the task completes or times out.
+        Wait for the task's result notification or time out.
 
         Returns the AgentResult, or None if the timeout is reached.
         """
-        elapsed = 0.0
-        while elapsed < timeout:
-            result = await self._queue.get_result(task_id)
-            if result is not None:
-                status = result.get("status")
-                if status in (TaskStatus.COMPLETED, TaskStatus.FAILED):
-                    return AgentResult(**result)
-            await asyncio.sleep(poll_interval)
-            elapsed += poll_interval
-        logger.warning("Timed out waiting for task_id=%s after %.0fs", task_id, timeout)
-        return None
+        result = await self._queue.wait_for_result(task_id, timeout=timeout)
+        if result is None:
+            logger.warning("Timed out waiting for task_id=%s after %.0fs", task_id, timeout)
+        return result
 
     def _matchup_machine_path(self) -> Path:
         if self._settings.matchup_machine_path:
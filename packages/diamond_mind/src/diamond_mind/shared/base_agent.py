@@ -5,10 +5,18 @@ All specialized agents (orchestrator, data quality, etc.) inherit from this base
 """
 
 import asyncio
+import logging
+import multiprocessing
+import os
+import random
+import time
 import uuid
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Dict, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar, Union
 from contextlib import asynccontextmanager
 
 from shared import (
@@ -25,6 +33,31 @@ from shared import (
 )
 
 
+T = TypeVar("T")
+
+# Signature of the per-task_type handlers agents dispatch to from handle_task
+TaskHandler = Callable[[AgentTask], Awaitable[AgentResult]]
+
+# Backoff applied to the main loop after a Redis/consume error
+_BACKOFF_INITIAL_SECONDS = 1.0
+_BACKOFF_MAX_SECONDS = 30.0
+
+# Task/alert IDs are cut from one os.urandom call per this many IDs
+_ID_BATCH_SIZE = 256
+_id_pool: list[str] = []
+
+
+def _new_id() -> str:
+    """Return a random (version 4) UUID string, refilling the pool when empty."""
+    if not _id_pool:
+        raw = os.urandom(16 * _ID_BATCH_SIZE)
+        _id_pool.extend(
+            str(uuid.UUID(bytes=raw[i:i + 16], version=4))
+            for i in range(0, len(raw), 16)
+        )
+    return _id_pool.pop()
+
+
 class BaseAgent(ABC):
     """Base class for all Diamond Mind agents."""
     
@@ -36,18 +69,36 @@ class BaseAgent(ABC):
             agent_id: Type of agent (from AgentType enum)
         """
         self.agent_id = agent_id
-        self.logger = get_agent_logger(agent_id.value)
+        # Cached once; the enum value is read on every task and heartbeat
+        self._agent_id_str = agent_id.value
+        self.logger = get_agent_logger(self._agent_id_str)
         self.is_running = False
         self.start_time: Optional[datetime] = None
+        self._start_monotonic: Optional[float] = None
         self.tasks_completed = 0
         self.tasks_failed = 0
         self._heartbeat_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        # Monotonic time of the last heartbeat, including ones piggybacked on results
+        self._last_heartbeat = 0.0
+        # Work handed from the consume loop to the worker pool: either a task,
+        # or a space_id whose pending tasks one worker should drain in order
+        self._local_queue: Optional[asyncio.Queue] = None
+        self._space_queues: Dict[str, Deque[AgentTask]] = {}
+        # Caps tasks dispatched but not yet finished, including ones waiting
+        # in a space's deque, so a busy space can't drain the Redis queue
+        self._task_slots: Optional[asyncio.Semaphore] = None
+        # Created on first use by run_cpu_bound
+        self._cpu_pool: Optional[ProcessPoolExecutor] = None
+        # task_type -> handler, built once rather than per task
+        self._handlers: Dict[str, TaskHandler] = self.handlers()
         
     async def start(self):
         """Start the agent."""
-        self.logger.info(f"Starting agent: {self.agent_id.value}")
+        self.logger.info("Starting agent: %s", self._agent_id_str)
         self.is_running = True
         self.start_time = datetime.now()
+        self._start_monotonic = time.monotonic()
         
         # Start heartbeat
         self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
@@ -55,14 +106,26 @@ class BaseAgent(ABC):
         # Agent-specific initialization
         await self.initialize()
         
-        # Start main loop
-        await self._run_loop()
+        # Pick up tasks a previous instance consumed but never finished; tasks
+        # younger than the visibility timeout may belong to a live sibling
+        await message_queue.requeue_unacked(self.agent_id)
+        
+        # Start main loop; stop() cancels it to unblock the waiting consume
+        self._loop_task = asyncio.create_task(self._run_loop())
+        try:
+            await self._loop_task
+        except asyncio.CancelledError:
+            if self.is_running:
+                raise
     
     async def stop(self):
         """Stop the agent."""
-        self.logger.info(f"Stopping agent: {self.agent_id.value}")
+        self.logger.info("Stopping agent: %s", self._agent_id_str)
         self.is_running = False
         
+        if self._loop_task and self._loop_task is not asyncio.current_task():
+            self._loop_task.cancel()
+        
         if self._heartbeat_task:
             self._heartbeat_task.cancel()
             try:
@@ -70,6 +133,10 @@ class BaseAgent(ABC):
             except asyncio.CancelledError:
                 pass
         
+        if self._cpu_pool is not None:
+            self._cpu_pool.shutdown(wait=False, cancel_futures=True)
+            self._cpu_pool = None
+        
         # Agent-specific cleanup
         await self.cleanup()
     
@@ -92,39 +159,120 @@ class BaseAgent(ABC):
         """
         pass
     
-    @abstractmethod
+    def handlers(self) -> Dict[str, TaskHandler]:
+        """
+        Map each task_type this agent accepts to its handler.
+        
+        Called once from __init__; handle_task dispatches through the
+        result. Agents that override handle_task can leave it empty.
+        """
+        return {}
+    
     async def handle_task(self, task: AgentTask) -> AgentResult:
         """
         Handle a specific task.
         
-        Override this method to implement agent-specific task handling logic.
+        Dispatches to the handler handlers() registered for the task's
+        task_type. Override this method for agent-specific routing.
         
         Args:
             task: Task to handle
             
         Returns:
             Result of task execution
+            
+        Raises:
+            ValueError: If no handler is registered for the task_type
         """
-        pass
+        handler = self._handlers.get(task.task_type)
+        if handler is None:
+            raise ValueError(f"Unknown task type: {task.task_type}")
+        return await handler(task)
     
     async def _run_loop(self):
-        """Main agent run loop."""
-        self.logger.info(f"Agent {self.agent_id.value} entering main loop")
+        """
+        Main agent run loop.
         
-        while self.is_running:
+        Consumes tasks from Redis and hands them to a pool of
+        ``settings.max_concurrent_tasks`` workers, so one slow task doesn't
+        hold up the rest. Tasks sharing a ``space_id`` parameter run one at a
+        time in FIFO order; tasks in different spaces (or with none) run in
+        parallel.
+        """
+        self.logger.info("Agent %s entering main loop", self._agent_id_str)
+        concurrency = settings.max_concurrent_tasks
+        self._local_queue = asyncio.Queue(maxsize=concurrency)
+        self._space_queues = {}
+        self._task_slots = asyncio.Semaphore(concurrency)
+        workers = [asyncio.create_task(self._worker()) for _ in range(concurrency)]
+        backoff = _BACKOFF_INITIAL_SECONDS
+        
+        try:
+            while self.is_running:
+                try:
+                    # Blocks on this agent's own queue, then takes up to
+                    # max_concurrent_tasks already-queued tasks in one go
+                    async for batch in message_queue.iter_task_batches(self.agent_id, concurrency):
+                        backoff = _BACKOFF_INITIAL_SECONDS
+                        for task in batch:
+                            await self._dispatch(task)
+                        if not self.is_running:
+                            break
+                    
+                except Exception as e:
+                    self.logger.error("Error in main loop: %s", e, exc_info=True)
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, _BACKOFF_MAX_SECONDS)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+    
+    async def _dispatch(self, task: AgentTask):
+        """
+        Hand a task to the worker pool, waiting while
+        ``settings.max_concurrent_tasks`` tasks are already pending.
+        
+        Args:
+            task: Task to execute
+        """
+        await self._task_slots.acquire()
+        space_id = task.parameters.get("space_id")
+        if space_id is None:
+            await self._local_queue.put(task)
+            return
+        
+        # Parameters come off the wire; a list or dict can't key the dict
+        space_id = str(space_id)
+        pending = self._space_queues.get(space_id)
+        if pending is not None:
+            # A worker already owns this space; it will pick the task up
+            pending.append(task)
+            return
+        self._space_queues[space_id] = deque([task])
+        await self._local_queue.put(space_id)
+    
+    async def _worker(self):
+        """Execute tasks from the local queue until cancelled."""
+        while True:
+            item: Union[AgentTask, str] = await self._local_queue.get()
+            if isinstance(item, AgentTask):
+                try:
+                    await self._execute_task(item)
+                finally:
+                    self._task_slots.release()
+                continue
+            
+            # Drain the space in order; it stays claimed until empty
+            pending = self._space_queues[item]
             try:
-                # Check for tasks
-                task = await message_queue.consume_task(timeout=5)
-                
-                if task and task.agent_id == self.agent_id:
-                    await self._execute_task(task)
-                
-                # Allow other coroutines to run
-                await asyncio.sleep(0.1)
-                
-            except Exception as e:
-                self.logger.error(f"Error in main loop: {e}", exc_info=True)
-                await asyncio.sleep(1)  # Brief pause on error
+                while pending:
+                    try:
+                        await self._execute_task(pending.popleft())
+                    finally:
+                        self._task_slots.release()
+            finally:
+                del self._space_queues[item]
     
     async def _execute_task(self, task: AgentTask):
         """
@@ -133,57 +281,130 @@ class BaseAgent(ABC):
         Args:
             task: Task to execute
         """
-        start_time = datetime.now()
-        self.logger.info(f"Executing task {task.task_id}: {task.task_type}")
+        result = await self._run_task(task)
+        try:
+            await self._publish_results([task], [result])
+        except Exception as e:
+            self.logger.error("Failed to publish result for task %s: %s", task.task_id, e)
+    
+    async def _run_task(self, task: AgentTask) -> AgentResult:
+        """
+        Run a task with error handling, without publishing its result.
+        
+        Args:
+            task: Task to execute
+            
+        Returns:
+            The handler's result, or a FAILED result if the handler raised
+        """
+        start = time.perf_counter()
+        log_info = self.logger.isEnabledFor(logging.INFO)
+        if log_info:
+            self.logger.info("Executing task %s: %s", task.task_id, task.task_type)
         
         try:
             # Handle the task
             result = await self.handle_task(task)
             
             # Calculate duration
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = time.perf_counter() - start
             result.duration_seconds = duration
             
-            # Publish result
-            await message_queue.publish_result(result)
-            
             self.tasks_completed += 1
-            self.logger.info(f"Task {task.task_id} completed successfully in {duration:.2f}s")
+            if log_info:
+                self.logger.info("Task %s completed successfully in %.2fs", task.task_id, duration)
+            return result
             
         except Exception as e:
             self.tasks_failed += 1
-            self.logger.error(f"Task {task.task_id} failed: {e}", exc_info=True)
+            self.logger.error("Task %s failed: %s", task.task_id, e, exc_info=True)
             
             # Create failure result
-            duration = (datetime.now() - start_time).total_seconds()
-            result = AgentResult(
+            duration = time.perf_counter() - start
+            return AgentResult(
                 task_id=task.task_id,
                 agent_id=self.agent_id,
                 status=TaskStatus.FAILED,
                 error_message=str(e),
                 duration_seconds=duration
             )
-            await message_queue.publish_result(result)
-            
-            # Publish alert for critical failures
-            if task.priority == TaskPriority.CRITICAL:
-                await self.publish_alert(
-                    severity=AlertSeverity.CRITICAL,
-                    message=f"Critical task {task.task_id} failed: {e}",
-                    related_task_id=task.task_id
-                )
+    
+    async def _publish_results(self, tasks: list[AgentTask], results: list[AgentResult]):
+        """
+        Publish task results and any critical-failure alerts concurrently.
+        
+        The agent heartbeat rides along in the same pipeline as the results,
+        so busy agents don't need separate heartbeat round trips.
+        
+        Args:
+            tasks: Executed tasks
+            results: Results for ``tasks``, in the same order
+        """
+        alerts = [
+            self.publish_alert(
+                severity=AlertSeverity.CRITICAL,
+                message=f"Critical task {task.task_id} failed: {result.error_message}",
+                related_task_id=task.task_id
+            )
+            for task, result in zip(tasks, results)
+            if task.priority == TaskPriority.CRITICAL and result.status == TaskStatus.FAILED
+        ]
+        await asyncio.gather(
+            message_queue.publish_results(results, heartbeat_agent_id=self._agent_id_str),
+            *alerts
+        )
+        self._last_heartbeat = time.monotonic()
     
     async def _heartbeat_loop(self):
-        """Send periodic heartbeats."""
+        """
+        Send periodic heartbeats unless a result publish already sent one.
+        
+        The interval is jittered by +/-10% so agents started together don't
+        all hit Redis at the same moment.
+        """
         while self.is_running:
+            interval = settings.heartbeat_interval_seconds * (0.9 + 0.2 * random.random())
             try:
-                await message_queue.update_agent_heartbeat(self.agent_id.value)
-                await asyncio.sleep(settings.heartbeat_interval_seconds)
+                elapsed = time.monotonic() - self._last_heartbeat
+                if elapsed >= interval:
+                    await message_queue.update_agent_heartbeat(self._agent_id_str)
+                    self._last_heartbeat = time.monotonic()
+                    elapsed = 0.0
+                await asyncio.sleep(interval - elapsed)
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                self.logger.error(f"Heartbeat error: {e}")
-                await asyncio.sleep(settings.heartbeat_interval_seconds)
+                self.logger.error("Heartbeat error: %s", e)
+                await asyncio.sleep(interval)
+    
+    async def run_cpu_bound(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run CPU-heavy work without blocking the event loop.
+        
+        Work goes to a per-agent process pool of ``settings.cpu_workers``
+        processes, so it also sidesteps the GIL; ``func`` and its arguments
+        must therefore be picklable (module-level functions, arrays,
+        DataFrames). With ``cpu_workers`` set to 0 the default thread
+        executor is used instead.
+        
+        Args:
+            func: Function to run
+            *args: Positional arguments for ``func``
+            **kwargs: Keyword arguments for ``func``
+            
+        Returns:
+            Whatever ``func`` returns
+        """
+        if self._cpu_pool is None and settings.cpu_workers > 0:
+            # spawn rather than fork: this process runs the log listener and
+            # flusher threads and an event loop, none of which survive a fork
+            self._cpu_pool = ProcessPoolExecutor(
+                max_workers=settings.cpu_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._cpu_pool, partial(func, *args, **kwargs)
+        )
     
     async def publish_alert(
         self,
@@ -206,7 +427,7 @@ class BaseAgent(ABC):
             related_task_id: Related task ID if applicable
         """
         alert = AgentAlert(
-            alert_id=str(uuid.uuid4()),
+            alert_id=_new_id(),
             agent_id=self.agent_id,
             severity=severity,
             message=message,
@@ -237,7 +458,7 @@ class BaseAgent(ABC):
             Task ID
         """
         task = AgentTask(
-            task_id=str(uuid.uuid4()),
+            task_id=_new_id(),
             agent_id=target_agent,
             task_type=task_type,
             priority=priority,
@@ -248,6 +469,8 @@ class BaseAgent(ABC):
     
     def get_uptime_seconds(self) -> float:
         """Get agent uptime in seconds."""
+        if self._start_monotonic is not None:
+            return time.monotonic() - self._start_monotonic
         if self.start_time:
             return (datetime.now() - self.start_time).total_seconds()
         return 0
@@ -269,10 +492,10 @@ class BaseAgent(ABC):
                 # Do work
                 pass
         """
-        self.logger.info(f"Starting task {task_id}")
-        start_time = datetime.now()
+        self.logger.info("Starting task %s", task_id)
+        start = time.perf_counter()
         try:
             yield
         finally:
-            duration = (datetime.now() - start_time).total_seconds()
-            self.logger.info(f"Task {task_id} completed in {duration:.2f}s")
+            duration = time.perf_counter() - start
+            self.logger.info("Task %s completed in %.2fs", task_id, duration)
@@ -7,7 +7,7 @@ type-safe access to settings.
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -36,11 +36,18 @@ class Settings(BaseSettings):
     redis_port: int = Field(default=6379, description="Redis port")
     redis_db: int = Field(default=0, description="Redis database number")
     redis_password: Optional[str] = Field(default=None, description="Redis password")
+    redis_socket_path: Optional[str] = Field(
+        default=None, description="Unix socket path; used instead of host/port when set"
+    )
+    redis_max_connections: int = Field(default=64, description="Size of the shared Redis connection pool")
     
     # Task queue configuration
     task_queue_name: str = Field(default="diamond_mind:tasks", description="Redis queue for tasks")
     result_queue_name: str = Field(default="diamond_mind:results", description="Redis queue for results")
     alert_queue_name: str = Field(default="diamond_mind:alerts", description="Redis queue for alerts")
+    message_format: Literal["msgpack", "json"] = Field(
+        default="msgpack", description="Wire format for tasks, results and alerts (json for debugging)"
+    )
     
     # Agent configuration
     orchestrator_enabled: bool = Field(default=True)
@@ -56,7 +63,14 @@ class Settings(BaseSettings):
     # Task execution
     default_task_timeout_seconds: int = Field(default=300, description="Default task timeout")
     max_concurrent_tasks: int = Field(default=5, description="Max concurrent tasks per agent")
+    cpu_workers: int = Field(
+        default=2, description="Worker processes for CPU-bound analysis (0 runs it on threads)"
+    )
     task_retry_delay_seconds: int = Field(default=5, description="Delay between retries")
+    task_visibility_timeout_seconds: int = Field(
+        default=900, description="Unacknowledged tasks older than this are requeued on agent start-up"
+    )
+    result_ttl_seconds: int = Field(default=86400, description="How long task results stay retrievable")
     
     # Data quality agent settings
     dq_check_interval_hours: int = Field(default=1, description="Data quality check interval")
@@ -155,8 +169,10 @@ settings = Settings()
 
 # Helper functions
 def get_redis_url() -> str:
-    """Get Redis connection URL."""
+    """Get Redis connection URL (a unix:// URL when a socket path is configured)."""
     auth = f":{settings.redis_password}@" if settings.redis_password else ""
+    if settings.redis_socket_path:
+        return f"unix://{auth}{settings.redis_socket_path}?db={settings.redis_db}"
     return f"redis://{auth}{settings.redis_host}:{settings.redis_port}/{settings.redis_db}"
 
 
@@ -5,12 +5,19 @@ Provides consistent logging across all agents with JSON formatting
 for easy parsing and analysis.
 """
 
+import atexit
+import copy
 import logging
+import queue
 import sys
+import threading
+import time
+import weakref
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict, Optional
-from datetime import datetime
-import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
 
 from shared.config import settings
 
@@ -18,10 +25,25 @@ from shared.config import settings
 class JSONFormatter(logging.Formatter):
     """Format log records as JSON for structured logging."""
     
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # (whole second, "YYYY-MM-DDTHH:MM:SS") for the last record formatted;
+        # a single tuple so concurrent readers never see a torn pair
+        self._last_stamp: Tuple[int, str] = (-1, "")
+    
+    def _timestamp(self, created: float) -> str:
+        """Local-time ISO 8601 timestamp with microseconds, reusing the per-second prefix."""
+        sec = int(created)
+        last_sec, prefix = self._last_stamp
+        if sec != last_sec:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sec))
+            self._last_stamp = (sec, prefix)
+        return f"{prefix}.{int((created - sec) * 1e6):06d}"
+    
     def format(self, record: logging.LogRecord) -> str:
         """Format the log record as JSON."""
         log_data = {
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -38,28 +60,168 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "extra_fields"):
             log_data.update(record.extra_fields)
         
-        return json.dumps(log_data)
+        # orjson returns bytes; str() anything it can't encode rather than drop the record
+        return orjson.dumps(log_data, default=str).decode()
+
+
+class _AsyncQueueHandler(QueueHandler):
+    """
+    QueueHandler that hands records to a background QueueListener.
+    
+    Unlike the stdlib version it does not pre-format records, so each
+    downstream handler still applies its own formatter (and JSONFormatter
+    still sees exc_info). ``listener`` is the QueueListener doing the I/O.
+    """
+    
+    def __init__(self, log_queue: queue.Queue, listener: QueueListener):
+        super().__init__(log_queue)
+        self.listener = listener
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now; they may be mutated before the listener gets to them
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that coalesces records into large writes.
+    
+    The stdlib handler flushes after every record, i.e. one write syscall
+    per log line. Here records collect in a ``buffer_size`` buffer that is
+    written out when full, every ``_FLUSH_INTERVAL`` seconds by a shared
+    flusher thread, and on close (which ``shutdown_logging`` does at exit).
+    """
+    
+    def __init__(
+        self,
+        filename: Any,
+        mode: str = "a",
+        encoding: Optional[str] = None,
+        buffer_size: int = 64 * 1024,
+    ):
+        self.buffer_size = buffer_size
+        super().__init__(filename, mode, encoding)
+        _register_buffered_handler(self)
+    
+    def _open(self):
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+    
+    def flush(self):
+        # Called by emit() after every record; leave it to the buffer
+        pass
+    
+    def flush_buffer(self):
+        """Write out whatever is buffered."""
+        with self.lock:
+            if self.stream and not self.stream.closed:
+                self.stream.flush()
+    
+    def close(self):
+        self.flush_buffer()
+        super().close()
+
+
+_FLUSH_INTERVAL = 0.5
+_buffered_handlers: "weakref.WeakSet[BufferedFileHandler]" = weakref.WeakSet()
+_flusher_lock = threading.Lock()
+_flusher: Optional[threading.Thread] = None
+
+
+def _flush_buffered_handlers():
+    while True:
+        time.sleep(_FLUSH_INTERVAL)
+        for handler in list(_buffered_handlers):
+            try:
+                handler.flush_buffer()
+            except (OSError, ValueError):
+                # Disk full or closed mid-flush; the next record will report it
+                pass
+
+
+def _register_buffered_handler(handler: BufferedFileHandler):
+    """Add a handler to the periodic flush, starting the flusher thread on first use."""
+    global _flusher
+    _buffered_handlers.add(handler)
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(
+                target=_flush_buffered_handlers, name="log-flusher", daemon=True
+            )
+            _flusher.start()
+
+
+# Logger name -> listener thread writing its records
+_listeners: Dict[str, QueueListener] = {}
+_listeners_lock = threading.Lock()
+
+
+def _start_listener(agent_name: str, handlers: List[logging.Handler]) -> QueueHandler:
+    """Start a listener for ``handlers``, replacing any previous one for this logger."""
+    log_queue: queue.Queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    with _listeners_lock:
+        previous = _listeners.pop(agent_name, None)
+        if previous is not None:
+            _stop_listener(previous)
+        listener.start()
+        _listeners[agent_name] = listener
+    return _AsyncQueueHandler(log_queue, listener)
+
+
+def _stop_listener(listener: QueueListener):
+    """Drain a listener's queue, then close its handlers."""
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+def shutdown_logging():
+    """Flush all queued log records and stop the listener threads."""
+    with _listeners_lock:
+        for listener in _listeners.values():
+            _stop_listener(listener)
+        _listeners.clear()
+
+
+atexit.register(shutdown_logging)
 
 
 def setup_logging(
     agent_name: str,
     log_level: Optional[str] = None,
     log_file: Optional[Path] = None,
-    use_json: bool = True
+    use_json: bool = True,
+    propagate: bool = True,
 ) -> logging.Logger:
     """
     Set up logging for an agent.
     
+    The logger itself only enqueues records; a background QueueListener
+    thread writes them to the console and log files, so logging never
+    blocks the caller on I/O.
+    
     Args:
         agent_name: Name of the agent (used as logger name)
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional log file path. If None, uses settings.
         use_json: Whether to use JSON formatting
+        propagate: Whether records also go to ancestor (e.g. root) handlers;
+            pass False if those would write the same records again
         
     Returns:
         Configured logger instance
     """
     logger = logging.getLogger(agent_name)
+    logger.propagate = propagate
     
     # Set level
     level = log_level or settings.log_level
@@ -67,6 +229,7 @@ def setup_logging(
     
     # Remove existing handlers
     logger.handlers = []
+    handlers: List[logging.Handler] = []
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -79,13 +242,13 @@ def setup_logging(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler
     if log_file or settings.log_file:
         file_path = log_file or settings.log_file
         if file_path:
-            file_handler = logging.FileHandler(file_path)
+            file_handler = BufferedFileHandler(file_path)
             file_handler.setLevel(logging.DEBUG)
             
             if use_json:
@@ -95,14 +258,14 @@ def setup_logging(
                     '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
                 )
             file_handler.setFormatter(file_formatter)
-            logger.addHandler(file_handler)
+            handlers.append(file_handler)
     
     # Also log to agent-specific file
     agent_log_dir = settings.get_logs_dir() / agent_name
     agent_log_dir.mkdir(exist_ok=True)
     agent_log_file = agent_log_dir / f"{agent_name}.log"
     
-    agent_file_handler = logging.FileHandler(agent_log_file)
+    agent_file_handler = BufferedFileHandler(agent_log_file)
     agent_file_handler.setLevel(logging.DEBUG)
     
     if use_json:
@@ -112,8 +275,9 @@ def setup_logging(
             '%(asctime)s - %(levelname)s - %(message)s'
         )
     agent_file_handler.setFormatter(agent_file_formatter)
-    logger.addHandler(agent_file_handler)
+    handlers.append(agent_file_handler)
     
+    logger.addHandler(_start_listener(agent_name, handlers))
     return logger
 
 
@@ -132,9 +296,12 @@ def log_with_context(
         message: Log message
         **context: Additional context fields to include
     """
+    levelno = getattr(logging, level.upper())
+    if not logger.isEnabledFor(levelno):
+        return
     log_record = logger.makeRecord(
         logger.name,
-        getattr(logging, level.upper()),
+        levelno,
         "",
         0,
         message,
@@ -145,7 +312,20 @@ def log_with_context(
     logger.handle(log_record)
 
 
+# Loggers already configured through get_agent_logger
+_logger_cache: Dict[str, logging.Logger] = {}
+
+
 # Convenience functions
 def get_agent_logger(agent_name: str) -> logging.Logger:
-    """Get or create a logger for an agent."""
-    return setup_logging(agent_name)
+    """
+    Get or create a logger for an agent.
+    
+    The logger is configured on first use only; later calls return it
+    as-is instead of reopening its log files. Call ``setup_logging``
+    directly to reconfigure it.
+    """
+    logger = _logger_cache.get(agent_name)
+    if logger is None:
+        logger = _logger_cache[agent_name] = setup_logging(agent_name)
+    return logger
@@ -5,17 +5,198 @@ Provides pub/sub and task queue functionality for agents to
 communicate asynchronously.
 """
 
-import json
 import asyncio
-from typing import Any, Callable, Dict, Optional
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Type, TypeVar, Union
 from datetime import datetime
+import msgpack
+import orjson
 import redis.asyncio as redis
+from pydantic import BaseModel, TypeAdapter
 
 from shared.config import settings, get_redis_url
-from shared.schemas import AgentTask, AgentResult, AgentAlert, TaskStatus
+from shared.schemas import AgentTask, AgentResult, AgentAlert, AgentType, TaskStatus
 from shared.logging_utils import get_agent_logger
 
-logger = get_agent_logger("messaging")
+
+def _logger() -> logging.Logger:
+    """
+    The messaging logger, set up on first use rather than at import: setting
+    it up starts the log listener threads and opens log files, which
+    processes that only need the key helpers and codec (the dashboard)
+    shouldn't pay for.
+    """
+    return get_agent_logger("messaging")
+
+
+M = TypeVar("M", bound=BaseModel)
+
+
+# Built once at import; constructing a TypeAdapter compiles its schema
+_ADAPTERS: Dict[type, TypeAdapter] = {
+    model_cls: TypeAdapter(model_cls) for model_cls in (AgentTask, AgentResult, AgentAlert)
+}
+
+
+def _adapter(model_cls: type) -> TypeAdapter:
+    adapter = _ADAPTERS.get(model_cls)
+    if adapter is None:
+        adapter = _ADAPTERS[model_cls] = TypeAdapter(model_cls)
+    return adapter
+
+
+def encode_message(model: BaseModel) -> bytes:
+    """Serialize a task/result/alert in the configured wire format."""
+    adapter = _adapter(type(model))
+    if settings.message_format == "json":
+        return adapter.dump_json(model)
+    return msgpack.packb(adapter.dump_python(model, mode="json"), use_bin_type=True)
+
+
+def decode_message(model_cls: Type[M], payload: Union[bytes, str]) -> M:
+    """
+    Deserialize a task/result/alert payload.
+    
+    JSON payloads are recognised whatever ``settings.message_format`` says,
+    so messages queued before a format switch still decode.
+    """
+    adapter = _adapter(model_cls)
+    if isinstance(payload, str) or payload[:1] == b"{":
+        return adapter.validate_json(payload)
+    return adapter.validate_python(msgpack.unpackb(payload, raw=False))
+
+
+def task_queue_key(agent_id: Union[AgentType, str]) -> str:
+    """
+    Get the Redis list key holding tasks for a single agent.
+
+    Each agent consumes only its own list, so routing happens server-side
+    instead of every agent popping and discarding tasks meant for others.
+    """
+    agent = agent_id.value if isinstance(agent_id, AgentType) else agent_id
+    return f"{settings.task_queue_name}:{agent}"
+
+
+def processing_queue_key(agent_id: Union[AgentType, str]) -> str:
+    """
+    Get the Redis list key holding an agent's in-flight tasks.
+    
+    Tasks are moved here when consumed in batches and removed once their
+    result is published, so tasks from a crashed agent can be requeued.
+    """
+    return f"{task_queue_key(agent_id)}:processing"
+
+
+def processing_since_key(agent_id: Union[AgentType, str]) -> str:
+    """
+    Get the Redis sorted set scoring each in-flight task payload by the
+    epoch ms it was consumed at, so only stale tasks are requeued.
+    """
+    return f"{processing_queue_key(agent_id)}:since"
+
+
+def heartbeat_key(agent_id: str) -> str:
+    """Get the Redis key holding an agent's last heartbeat timestamp."""
+    return f"heartbeat:{agent_id}"
+
+
+def parse_heartbeat(raw: Union[bytes, str]) -> datetime:
+    """
+    Convert a stored heartbeat to a datetime: epoch milliseconds, or an ISO
+    string written before heartbeats switched to epoch millis.
+    """
+    if isinstance(raw, bytes):
+        raw = raw.decode()
+    if raw.isdigit():
+        return datetime.fromtimestamp(int(raw) / 1000)
+    return datetime.fromisoformat(raw)
+
+
+def result_channel(task_id: str) -> str:
+    """Get the pub/sub channel announcing that a task's result is stored."""
+    return f"results:{task_id}:ready"
+
+
+def _epoch_ms() -> int:
+    """Current time as integer epoch milliseconds, the format stored for timestamps."""
+    return int(time.time() * 1000)
+
+
+def _heartbeat_ttl_seconds() -> int:
+    """
+    Expire heartbeats once they are past the orchestrator's default
+    staleness threshold, so dead agents don't leave keys behind.
+    """
+    return settings.heartbeat_interval_seconds * 3
+
+
+# Store a result in one server-side step: queue it, keep it retrievable by
+# task id until it expires, and wake anyone waiting on it.
+# KEYS: result queue, result hash; ARGV: payload, epoch ms, ttl ms, channel
+_STORE_RESULT_LUA = """
+redis.call('LPUSH', KEYS[1], ARGV[1])
+redis.call('HSET', KEYS[2], 'data', ARGV[1], 'timestamp', ARGV[2])
+redis.call('PEXPIRE', KEYS[2], ARGV[3])
+redis.call('PUBLISH', ARGV[4], '1')
+"""
+
+
+# Requeue processing-list entries consumed at or before a cutoff, in one
+# atomic step so concurrently starting instances can't both requeue a task.
+# Entries without a consume time (the consumer died between BLMOVE and
+# ZADD) get one now and become eligible once they are old enough.
+# KEYS: task queue, processing list, processing-since zset; ARGV: cutoff ms, now ms
+_REQUEUE_STALE_LUA = """
+local moved = 0
+for _, payload in ipairs(redis.call('LRANGE', KEYS[2], 0, -1)) do
+    local since = redis.call('ZSCORE', KEYS[3], payload)
+    if not since then
+        redis.call('ZADD', KEYS[3], ARGV[2], payload)
+    elseif tonumber(since) <= tonumber(ARGV[1]) then
+        redis.call('LREM', KEYS[2], 1, payload)
+        redis.call('ZREM', KEYS[3], payload)
+        redis.call('RPUSH', KEYS[1], payload)
+        moved = moved + 1
+    end
+end
+return moved
+"""
+
+
+def _all_task_queue_keys() -> List[str]:
+    """Get the task list keys for every agent type."""
+    return [task_queue_key(agent_type) for agent_type in AgentType]
+
+
+# One pool shared by every MessageQueue in the process
+_connection_pool: Optional[redis.BlockingConnectionPool] = None
+
+
+def _get_connection_pool() -> redis.BlockingConnectionPool:
+    """Get the shared connection pool, creating it on first use."""
+    global _connection_pool
+    if _connection_pool is None:
+        options: Dict[str, Any] = {}
+        if not settings.redis_socket_path:
+            # TCP only; Unix socket connections reject this option
+            options["socket_keepalive"] = True
+        _connection_pool = redis.BlockingConnectionPool.from_url(
+            get_redis_url(),
+            max_connections=settings.redis_max_connections,
+            decode_responses=False,
+            health_check_interval=30,
+            **options,
+        )
+    return _connection_pool
+
+
+async def _close_connection_pool():
+    """Disconnect and drop the shared pool (it is bound to the running loop)."""
+    global _connection_pool
+    if _connection_pool is not None:
+        pool, _connection_pool = _connection_pool, None
+        await pool.disconnect()
 
 
 class MessageQueue:
@@ -24,26 +205,26 @@ class MessageQueue:
     def __init__(self):
         self.redis_client: Optional[redis.Redis] = None
         self._pubsub = None
+        # task_id -> raw payload for tasks sitting in a processing list
+        self._inflight: Dict[str, bytes] = {}
+        self._store_result_script = None
+        self._requeue_stale_script = None
         
     async def connect(self):
         """Connect to Redis."""
         try:
-            self.redis_client = await redis.from_url(
-                get_redis_url(),
-                encoding="utf-8",
-                decode_responses=True
-            )
+            self.redis_client = redis.Redis(connection_pool=_get_connection_pool())
             await self.redis_client.ping()
-            logger.info("Connected to Redis")
+            _logger().info("Connected to Redis")
         except Exception as e:
-            logger.error(f"Failed to connect to Redis: {e}")
+            _logger().error(f"Failed to connect to Redis: {e}")
             raise
     
     async def disconnect(self):
         """Disconnect from Redis."""
         if self.redis_client:
             await self.redis_client.close()
-            logger.info("Disconnected from Redis")
+            _logger().info("Disconnected from Redis")
     
     # Task Queue Operations
     async def publish_task(self, task: AgentTask) -> bool:
@@ -57,38 +238,159 @@ class MessageQueue:
             True if successful
         """
         try:
-            task_json = task.model_dump_json()
-            await self.redis_client.lpush(settings.task_queue_name, task_json)
-            logger.info(f"Published task {task.task_id} for agent {task.agent_id}")
+            task_json = encode_message(task)
+            await self.redis_client.lpush(task_queue_key(task.agent_id), task_json)
+            _logger().info(f"Published task {task.task_id} for agent {task.agent_id}")
             return True
         except Exception as e:
-            logger.error(f"Failed to publish task: {e}")
+            _logger().error(f"Failed to publish task: {e}")
             return False
     
-    async def consume_task(self, timeout: int = 5) -> Optional[AgentTask]:
+    async def consume_task(
+        self,
+        timeout: int = 5,
+        agent_id: Optional[AgentType] = None
+    ) -> Optional[AgentTask]:
         """
         Consume a task from the queue.
         
         Args:
             timeout: Timeout in seconds
+            agent_id: Only consume tasks addressed to this agent. If None,
+                pops from whichever agent queue has a task first.
             
         Returns:
             AgentTask if available, None otherwise
         """
+        keys = [task_queue_key(agent_id)] if agent_id else _all_task_queue_keys()
         try:
-            result = await self.redis_client.brpop(
-                settings.task_queue_name,
-                timeout=timeout
-            )
+            result = await self.redis_client.brpop(keys, timeout=timeout)
             if result:
                 _, task_json = result
-                task_dict = json.loads(task_json)
-                return AgentTask(**task_dict)
+                return decode_message(AgentTask, task_json)
             return None
         except Exception as e:
-            logger.error(f"Failed to consume task: {e}")
+            _logger().error(f"Failed to consume task: {e}")
             return None
     
+    async def consume_task_batch(
+        self,
+        agent_id: AgentType,
+        max_tasks: int,
+        timeout: int = 0
+    ) -> List[AgentTask]:
+        """
+        Consume up to ``max_tasks`` tasks addressed to an agent.
+        
+        Blocks until at least one task is available, then drains whatever
+        else is already queued (up to the limit) without waiting further.
+        Consumed tasks are moved to the agent's processing list, stamped with
+        their consume time, and stay there until their result is published
+        (see publish_results). Payloads that don't decode are logged and
+        removed from the processing list; the rest are still returned.
+        
+        Args:
+            agent_id: Agent whose task list to consume
+            max_tasks: Maximum number of tasks to return
+            timeout: Timeout in seconds for the first task (0 blocks forever)
+            
+        Returns:
+            List of tasks in FIFO order; empty if the timeout expired (or
+            nothing consumed decoded)
+        """
+        key = task_queue_key(agent_id)
+        processing_key = processing_queue_key(agent_id)
+        first = await self.redis_client.blmove(key, processing_key, timeout, "RIGHT", "LEFT")
+        if first is None:
+            return []
+        
+        payloads = [first]
+        if max_tasks > 1:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for _ in range(max_tasks - 1):
+                pipe.lmove(key, processing_key, "RIGHT", "LEFT")
+            payloads.extend(p for p in await pipe.execute() if p is not None)
+        
+        tasks = []
+        good: List[bytes] = []
+        bad: List[bytes] = []
+        for payload in payloads:
+            try:
+                task = decode_message(AgentTask, payload)
+            except Exception as e:
+                _logger().error(f"Dropping undecodable task payload {payload[:100]!r}: {e}")
+                bad.append(payload)
+                continue
+            tasks.append(task)
+            good.append(payload)
+        
+        since_key = processing_since_key(agent_id)
+        pipe = self.redis_client.pipeline(transaction=False)
+        if good:
+            now = _epoch_ms()
+            pipe.zadd(since_key, {payload: now for payload in good})
+        # An undecodable payload can never be acked, and requeueing it would
+        # only fail again; take it out of the processing list instead
+        for payload in bad:
+            pipe.lrem(processing_key, 1, payload)
+            pipe.zrem(since_key, payload)
+        await pipe.execute()
+        
+        for task, payload in zip(tasks, good):
+            self._inflight[task.task_id] = payload
+        return tasks
+    
+    async def iter_task_batches(
+        self,
+        agent_id: AgentType,
+        max_tasks: int
+    ) -> AsyncIterator[List[AgentTask]]:
+        """Yield batches of tasks for an agent as they arrive (see consume_task_batch)."""
+        while True:
+            yield await self.consume_task_batch(agent_id, max_tasks, timeout=0)
+    
+    async def requeue_unacked(
+        self,
+        agent_id: AgentType,
+        min_idle_seconds: Optional[int] = None
+    ) -> int:
+        """
+        Move stale tasks in an agent's processing list back onto its queue.
+        
+        Call on agent start-up to recover tasks that a previous instance
+        consumed but never published a result for. Only tasks consumed at
+        least ``min_idle_seconds`` ago are moved, so tasks a live instance
+        of the same agent is still working on stay with it. Requeued tasks
+        are consumed again before anything queued after them.
+        
+        Args:
+            agent_id: Agent whose processing list to check
+            min_idle_seconds: Visibility timeout; defaults to
+                ``settings.task_visibility_timeout_seconds``
+            
+        Returns:
+            Number of tasks requeued
+        """
+        if min_idle_seconds is None:
+            min_idle_seconds = settings.task_visibility_timeout_seconds
+        script = self._requeue_stale_script
+        if script is None or script.registered_client is not self.redis_client:
+            script = self._requeue_stale_script = self.redis_client.register_script(
+                _REQUEUE_STALE_LUA
+            )
+        now = _epoch_ms()
+        count = await script(
+            keys=[
+                task_queue_key(agent_id),
+                processing_queue_key(agent_id),
+                processing_since_key(agent_id),
+            ],
+            args=[now - min_idle_seconds * 1000, now],
+        )
+        if count:
+            _logger().warning(f"Requeued {count} unacknowledged tasks for {agent_id.value}")
+        return count
+    
     async def get_task_by_id(self, task_id: str) -> Optional[AgentTask]:
         """Get a specific task by ID."""
         # In a real implementation, you'd store tasks in a hash
@@ -96,21 +398,89 @@ class MessageQueue:
         pass
     
     # Result Operations
+    async def _store_result(self, result: AgentResult, timestamp: int):
+        """
+        Run the store-result script for one result.
+        
+        The script is registered once per Redis client and invoked by SHA
+        (redis-py loads it on a NOSCRIPT miss).
+        """
+        script = self._store_result_script
+        if script is None or script.registered_client is not self.redis_client:
+            script = self._store_result_script = self.redis_client.register_script(
+                _STORE_RESULT_LUA
+            )
+        return await script(
+            keys=[settings.result_queue_name, f"results:{result.task_id}"],
+            args=[
+                encode_message(result),
+                timestamp,
+                settings.result_ttl_seconds * 1000,
+                result_channel(result.task_id),
+            ],
+        )
+    
     async def publish_result(self, result: AgentResult) -> bool:
         """Publish a task result."""
         try:
-            result_json = result.model_dump_json()
-            await self.redis_client.lpush(settings.result_queue_name, result_json)
+            await self._store_result(result, _epoch_ms())
+            _logger().info(f"Published result for task {result.task_id}")
+            return True
+        except Exception as e:
+            _logger().error(f"Failed to publish result: {e}")
+            return False
+    
+    async def publish_results(
+        self,
+        results: List[AgentResult],
+        heartbeat_agent_id: Optional[str] = None
+    ) -> bool:
+        """
+        Publish several task results in a single pipelined round trip.
+        
+        Tasks consumed via consume_task_batch are acknowledged (removed from
+        their processing list) in the same pipeline.
+        
+        Args:
+            results: Results to publish
+            heartbeat_agent_id: If given, also refresh this agent's heartbeat
+                in the same pipeline
             
-            # Also store in a hash for easy retrieval
-            await self.redis_client.hset(
-                f"results:{result.task_id}",
-                mapping={"data": result_json, "timestamp": datetime.now().isoformat()}
-            )
-            logger.info(f"Published result for task {result.task_id}")
+        Returns:
+            True if successful
+        """
+        if not results:
+            return True
+        try:
+            timestamp = _epoch_ms()
+            acked = []
+            pipe = self.redis_client.pipeline(transaction=False)
+            if heartbeat_agent_id:
+                pipe.set(heartbeat_key(heartbeat_agent_id), timestamp, ex=_heartbeat_ttl_seconds())
+            ttl_ms = settings.result_ttl_seconds * 1000
+            for result in results:
+                # Same steps as the store-result script, inlined: a script in a
+                # pipeline costs a SCRIPT EXISTS round trip on every execute
+                result_json = encode_message(result)
+                result_key = f"results:{result.task_id}"
+                pipe.lpush(settings.result_queue_name, result_json)
+                pipe.hset(result_key, mapping={"data": result_json, "timestamp": timestamp})
+                pipe.pexpire(result_key, ttl_ms)
+                pipe.publish(result_channel(result.task_id), "1")
+                # Forgotten only once the pipeline succeeds, so a failed
+                # publish can still be acknowledged by a later one
+                raw_task = self._inflight.get(result.task_id)
+                if raw_task is not None:
+                    pipe.lrem(processing_queue_key(result.agent_id), 1, raw_task)
+                    pipe.zrem(processing_since_key(result.agent_id), raw_task)
+                    acked.append(result.task_id)
+            await pipe.execute()
+            for task_id in acked:
+                self._inflight.pop(task_id, None)
+            _logger().info(f"Published {len(results)} results")
             return True
         except Exception as e:
-            logger.error(f"Failed to publish result: {e}")
+            _logger().error(f"Failed to publish results: {e}")
             return False
     
     async def get_result(self, task_id: str) -> Optional[AgentResult]:
@@ -118,27 +488,65 @@ class MessageQueue:
         try:
             result_data = await self.redis_client.hget(f"results:{task_id}", "data")
             if result_data:
-                result_dict = json.loads(result_data)
-                return AgentResult(**result_dict)
+                return decode_message(AgentResult, result_data)
             return None
         except Exception as e:
-            logger.error(f"Failed to get result: {e}")
+            _logger().error(f"Failed to get result: {e}")
+            return None
+    
+    async def wait_for_result(
+        self,
+        task_id: str,
+        timeout: float = 300.0
+    ) -> Optional[AgentResult]:
+        """
+        Wait for a task's result without polling.
+        
+        Subscribes to the task's result channel before checking for an
+        existing result, so a result published in between is not missed.
+        
+        Args:
+            task_id: Task to wait for
+            timeout: Maximum seconds to wait
+            
+        Returns:
+            The result, or None if the timeout expired first
+        """
+        pubsub = self.redis_client.pubsub()
+        await pubsub.subscribe(result_channel(task_id))
+        try:
+            result = await self.get_result(task_id)
+            if result is not None:
+                return result
+            
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while (remaining := deadline - loop.time()) > 0:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=remaining
+                )
+                if message is not None:
+                    return await self.get_result(task_id)
             return None
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
     
     # Alert Operations
     async def publish_alert(self, alert: AgentAlert) -> bool:
         """Publish an alert."""
         try:
-            alert_json = alert.model_dump_json()
-            await self.redis_client.lpush(settings.alert_queue_name, alert_json)
+            alert_json = encode_message(alert)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.lpush(settings.alert_queue_name, alert_json)
+                # Also publish to pub/sub for real-time notifications
+                pipe.publish("alerts", alert_json)
+                await pipe.execute()
             
-            # Also publish to pub/sub for real-time notifications
-            await self.redis_client.publish("alerts", alert_json)
-            
-            logger.warning(f"Published alert {alert.alert_id} from {alert.agent_id}: {alert.message}")
+            _logger().warning(f"Published alert {alert.alert_id} from {alert.agent_id}: {alert.message}")
             return True
         except Exception as e:
-            logger.error(f"Failed to publish alert: {e}")
+            _logger().error(f"Failed to publish alert: {e}")
             return False
     
     async def consume_alerts(self, callback: Callable[[AgentAlert], None]):
@@ -149,64 +557,82 @@ class MessageQueue:
             callback: Function to call with each alert
         """
         try:
-            pubsub = self.redis_client.pubsub()
-            await pubsub.subscribe("alerts")
-            
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    alert_dict = json.loads(message["data"])
-                    alert = AgentAlert(**alert_dict)
-                    callback(alert)
+            async for data in self._channel_messages("alerts"):
+                callback(decode_message(AgentAlert, data))
         except Exception as e:
-            logger.error(f"Error consuming alerts: {e}")
+            _logger().error(f"Error consuming alerts: {e}")
+    
+    async def _channel_messages(self, channel: str) -> AsyncIterator[bytes]:
+        """
+        Yield the payload of each message published to a channel.
+        
+        Subscribe confirmations are dropped inside redis-py rather than
+        surfaced as dicts, and the subscription is closed when the consumer
+        stops iterating.
+        """
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel)
+        try:
+            while True:
+                message = await pubsub.get_message(timeout=None)
+                if message is not None and message["type"] == "message":
+                    yield message["data"]
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
     
     # Pub/Sub for General Messages
     async def publish_message(self, channel: str, message: Dict[str, Any]) -> bool:
         """Publish a message to a channel."""
         try:
-            message_json = json.dumps(message)
-            await self.redis_client.publish(channel, message_json)
+            await self.redis_client.publish(channel, orjson.dumps(message))
             return True
         except Exception as e:
-            logger.error(f"Failed to publish message: {e}")
+            _logger().error(f"Failed to publish message: {e}")
             return False
     
     async def subscribe(self, channel: str, callback: Callable[[Dict[str, Any]], None]):
         """Subscribe to a channel."""
         try:
-            pubsub = self.redis_client.pubsub()
-            await pubsub.subscribe(channel)
-            
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    message_dict = json.loads(message["data"])
-                    callback(message_dict)
+            async for data in self._channel_messages(channel):
+                callback(orjson.loads(data))
         except Exception as e:
-            logger.error(f"Error subscribing to {channel}: {e}")
+            _logger().error(f"Error subscribing to {channel}: {e}")
     
     # Health & Monitoring
     async def update_agent_heartbeat(self, agent_id: str):
-        """Update agent heartbeat timestamp."""
-        await self.redis_client.hset(
-            "agent_heartbeats",
-            agent_id,
-            datetime.now().isoformat()
+        """Update agent heartbeat timestamp (a single SET with expiry)."""
+        await self.redis_client.set(
+            heartbeat_key(agent_id),
+            _epoch_ms(),
+            ex=_heartbeat_ttl_seconds()
         )
     
     async def get_agent_heartbeat(self, agent_id: str) -> Optional[datetime]:
         """Get last heartbeat time for an agent."""
-        heartbeat_str = await self.redis_client.hget("agent_heartbeats", agent_id)
-        if heartbeat_str:
-            return datetime.fromisoformat(heartbeat_str)
-        return None
+        heartbeat_raw = await self.redis_client.get(heartbeat_key(agent_id))
+        if not heartbeat_raw:
+            return None
+        return parse_heartbeat(heartbeat_raw)
     
     async def get_queue_depth(self, queue_name: str) -> int:
-        """Get current depth of a queue."""
+        """
+        Get current depth of a queue.
+        
+        ``settings.task_queue_name`` refers to the task queue as a whole and
+        returns the total across every agent's task list.
+        """
+        if queue_name == settings.task_queue_name:
+            depths = [await self.redis_client.llen(key) for key in _all_task_queue_keys()]
+            return sum(depths)
         return await self.redis_client.llen(queue_name)
     
     async def clear_queue(self, queue_name: str):
-        """Clear all messages from a queue."""
-        await self.redis_client.delete(queue_name)
+        """Clear all messages from a queue (every agent's list for the task queue)."""
+        if queue_name == settings.task_queue_name:
+            await self.redis_client.delete(*_all_task_queue_keys())
+        else:
+            await self.redis_client.delete(queue_name)
 
 
 # Global message queue instance
@@ -221,3 +647,4 @@ async def init_messaging():
 async def shutdown_messaging():
     """Shutdown the messaging system."""
     await message_queue.disconnect()
+    await _close_connection_pool()
@@ -8,7 +8,7 @@ data integrity and enable validation at boundaries.
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 # ============================================
@@ -74,8 +74,10 @@ class AgentTask(BaseModel):
     retry_count: int = Field(default=0, ge=0)
     max_retries: int = Field(default=3, ge=0)
     
-    class Config:
-        json_schema_extra = {
+    # Tasks are immutable once queued
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "task_id": "task_123",
                 "agent_id": "data_quality",
@@ -83,7 +85,8 @@ class AgentTask(BaseModel):
                 "priority": "high",
                 "parameters": {"data_source": "statcast"}
             }
-        }
+        },
+    )
 
 
 class AgentResult(BaseModel):
@@ -98,8 +101,9 @@ class AgentResult(BaseModel):
     completed_at: datetime = Field(default_factory=datetime.now)
     error_message: Optional[str] = Field(default=None)
     
-    class Config:
-        json_schema_extra = {
+    # Left mutable: BaseAgent stamps duration_seconds onto handler results
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "task_id": "task_123",
                 "agent_id": "data_quality",
@@ -107,7 +111,8 @@ class AgentResult(BaseModel):
                 "metrics": {"issues_found": 3, "auto_fixed": 2},
                 "duration_seconds": 45.2
             }
-        }
+        },
+    )
 
 
 # ============================================
@@ -125,6 +130,8 @@ class AgentAlert(BaseModel):
     requires_action: bool = Field(default=False)
     suggested_actions: List[str] = Field(default_factory=list)
     related_task_id: Optional[str] = Field(default=None)
+    
+    model_config = ConfigDict(frozen=True)
 
 
 # ============================================
@@ -142,8 +149,23 @@ class DataAnomalyReport(BaseModel):
     auto_fixable: bool
     fix_applied: bool = Field(default=False)
     fix_description: Optional[str] = Field(default=None)
+    # Optional per-row detail, stored column-wise (parallel arrays) rather
+    # than as one object per row
+    row_ids: List[int] = Field(default_factory=list, description="Positions of flagged rows")
+    anomaly_scores: List[float] = Field(
+        default_factory=list, description="Score for each entry in row_ids (higher = more anomalous)"
+    )
+    # int8-quantized alternative to anomaly_scores: score = code * score_scale
+    anomaly_scores_q: List[int] = Field(default_factory=list)
+    score_scale: Optional[float] = Field(default=None, gt=0)
     timestamp: datetime = Field(default_factory=datetime.now)
 
+    def get_anomaly_scores(self) -> List[float]:
+        """Per-row scores, dequantizing anomaly_scores_q if that is what was sent."""
+        if self.score_scale is not None:
+            return [code * self.score_scale for code in self.anomaly_scores_q]
+        return self.anomaly_scores
+
 
 class DataQualityMetrics(BaseModel):
     """Metrics for data quality assessment."""
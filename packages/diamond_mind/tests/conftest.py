@@ -42,7 +42,7 @@ from shared.messaging import MessageQueue, message_queue
 async def fake_mq():
     """Create a standalone MessageQueue with a fake Redis backend."""
     mq = MessageQueue()
-    mq.redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    mq.redis_client = fakeredis.aioredis.FakeRedis()
     yield mq
     await mq.redis_client.flushall()
     await mq.redis_client.aclose()
@@ -55,7 +55,7 @@ async def global_mq():
     Use this fixture for tests that exercise code relying on the
     module-level ``message_queue`` instance (e.g. BaseAgent).
     """
-    message_queue.redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    message_queue.redis_client = fakeredis.aioredis.FakeRedis()
     yield message_queue
     await message_queue.redis_client.flushall()
     await message_queue.redis_client.aclose()
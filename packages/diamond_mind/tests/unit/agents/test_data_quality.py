@@ -2,7 +2,7 @@
 Unit tests for the DataQualityAgent.
 
 Covers:
-- _run_anomaly_detection: Isolation Forest + Z-score detection
+- run_anomaly_detection: Isolation Forest + Z-score detection
 - _run_schema_validation: first-visit caching, missing/extra cols, type changes
 - _apply_repairs: duplicate removal, imputation, outlier clipping
 - _compute_quality_metrics: metric calculation
@@ -23,7 +23,7 @@ if _dm_src not in sys.path:
     sys.path.insert(0, _dm_src)
 
 from shared.schemas import AlertSeverity, AgentType, TaskStatus, AgentTask, TaskPriority
-from agents.data_quality.agent import DataQualityAgent
+from agents.data_quality.agent import DataQualityAgent, run_anomaly_detection
 
 
 # ---------------------------------------------------------------------------
@@ -123,59 +123,85 @@ class TestLoadData:
 
 
 # ---------------------------------------------------------------------------
-# _run_anomaly_detection
+# run_anomaly_detection
 # ---------------------------------------------------------------------------
 
 
 class TestRunAnomalyDetection:
-    def test_no_anomalies_on_clean_data(self, agent, clean_df):
+    def test_no_anomalies_on_clean_data(self, clean_df):
         # With contamination=0.0001 (near zero), no Isolation Forest anomalies expected
         # but Z-score on perfectly bounded data should also be minimal
-        reports = agent._run_anomaly_detection(clean_df, "task_1", contamination=0.001)
+        reports = run_anomaly_detection(clean_df, "task_1", contamination=0.001)
         iso_reports = [r for r in reports if r.detection_method == "isolation_forest"]
         # At extremely low contamination, very few (if any) rows flagged
         assert all(r.row_count >= 0 for r in iso_reports)
 
-    def test_detects_extreme_outliers_via_zscore(self, agent):
+    def test_detects_extreme_outliers_via_zscore(self):
         # 98 values clustered near 1.0–2.0; two extreme outliers at ±1000
         # With large n, std stays small and z-scores for outliers far exceed 3.0
         normal = np.ones(98) + np.random.default_rng(0).uniform(0, 0.5, 98)
         df = pd.DataFrame({"value": np.concatenate([normal, [1000.0, -1000.0]])})
-        reports = agent._run_anomaly_detection(df, "task_z", threshold=3.0)
+        reports = run_anomaly_detection(df, "task_z", threshold=3.0)
         zscore_reports = [r for r in reports if r.detection_method == "zscore"]
         assert len(zscore_reports) >= 1
         assert zscore_reports[0].affected_columns == ["value"]
         assert zscore_reports[0].row_count >= 1
 
-    def test_isolation_forest_returns_report(self, agent):
+    def test_isolation_forest_returns_report(self):
         np.random.seed(42)
         normal = np.random.normal(0, 1, (50, 3))
         outliers = np.array([[50, 50, 50], [-50, -50, -50]])
         data = np.vstack([normal, outliers])
         df = pd.DataFrame(data, columns=["a", "b", "c"])
-        reports = agent._run_anomaly_detection(df, "iso_task", contamination=0.05)
+        reports = run_anomaly_detection(df, "iso_task", contamination=0.05)
         iso = [r for r in reports if r.detection_method == "isolation_forest"]
         assert len(iso) == 1
         assert iso[0].row_count > 0
 
-    def test_returns_empty_for_non_numeric_df(self, agent):
+    def test_include_rows_reports_flagged_positions(self):
+        normal = np.ones(98) + np.random.default_rng(0).uniform(0, 0.5, 98)
+        df = pd.DataFrame({"value": np.concatenate([normal, [1000.0, -1000.0]])})
+        reports = run_anomaly_detection(df, "rows_task", include_rows=True)
+        zscore = [r for r in reports if r.detection_method == "zscore"][0]
+        assert zscore.row_ids == [98, 99]
+        assert len(zscore.anomaly_scores) == 2
+        assert all(score > 3.0 for score in zscore.anomaly_scores)
+
+        iso = [r for r in reports if r.detection_method == "isolation_forest"][0]
+        assert len(iso.row_ids) == iso.row_count == len(iso.anomaly_scores)
+
+    def test_quantized_scores_round_trip(self):
+        normal = np.ones(98) + np.random.default_rng(0).uniform(0, 0.5, 98)
+        df = pd.DataFrame({"value": np.concatenate([normal, [1000.0, -1000.0]])})
+        exact = run_anomaly_detection(df, "q_task", include_rows=True)
+        quantized = run_anomaly_detection(
+            df, "q_task", include_rows=True, quantize_scores=True
+        )
+        for e, q in zip(exact, quantized):
+            assert q.anomaly_scores == []
+            assert all(-128 <= code <= 127 for code in q.anomaly_scores_q)
+            np.testing.assert_allclose(
+                q.get_anomaly_scores(), e.anomaly_scores, atol=q.score_scale / 2
+            )
+
+    def test_returns_empty_for_non_numeric_df(self):
         df = pd.DataFrame({"team": ["NYY", "BOS", "LAD"], "player": ["A", "B", "C"]})
-        reports = agent._run_anomaly_detection(df, "str_task")
+        reports = run_anomaly_detection(df, "str_task")
         assert reports == []
 
-    def test_zscore_report_is_auto_fixable(self, agent):
+    def test_zscore_report_is_auto_fixable(self):
         # Same large-n approach: normal cluster plus extreme outliers
         normal = np.ones(98) + np.random.default_rng(1).uniform(0, 0.5, 98)
         df = pd.DataFrame({"x": np.concatenate([normal, [9999.0, -9999.0]])})
-        reports = agent._run_anomaly_detection(df, "fix_task", threshold=2.0)
+        reports = run_anomaly_detection(df, "fix_task", threshold=2.0)
         zscore = [r for r in reports if r.detection_method == "zscore"]
         assert len(zscore) >= 1
         assert zscore[0].auto_fixable is True
 
-    def test_skips_constant_column(self, agent):
+    def test_skips_constant_column(self):
         df = pd.DataFrame({"constant": [5.0] * 10, "normal": list(range(10))})
         # Constant column has std=0, should not raise ZeroDivisionError
-        reports = agent._run_anomaly_detection(df, "const_task")
+        reports = run_anomaly_detection(df, "const_task")
         assert isinstance(reports, list)
 
 
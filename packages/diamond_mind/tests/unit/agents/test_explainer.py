@@ -47,7 +47,7 @@ def agent():
 @pytest.fixture
 async def redis_mq():
     """Patch the global message_queue singleton with fake Redis."""
-    message_queue.redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    message_queue.redis_client = fakeredis.aioredis.FakeRedis()
     yield message_queue
     await message_queue.redis_client.flushall()
     await message_queue.redis_client.aclose()
@@ -23,7 +23,13 @@ if _dm_src not in sys.path:
 
 from shared.schemas import AgentType, TaskStatus, AgentTask, TaskPriority
 from agents.model_monitor.agent import ModelMonitorAgent
-from agents.model_monitor.drift_detection import calculate_psi, run_ks_test, detect_feature_drift
+from agents.model_monitor.drift_detection import (
+    calculate_psi,
+    calculate_psi_columns,
+    run_ks_test,
+    asymptotic_ks_test,
+    detect_feature_drift,
+)
 from agents.model_monitor.ab_testing import ABTest, VariantStats
 
 
@@ -113,6 +119,17 @@ class TestCalculatePSI:
         psi = calculate_psi(data, data, bins=5)
         assert psi < 0.01
 
+    def test_columns_match_per_feature_psi(self):
+        rng = np.random.default_rng(3)
+        expected = rng.normal(0, 1, (300, 3))
+        actual = rng.normal(0.5, 1, (200, 3))
+        actual[:10, 1] = np.nan
+
+        psi = calculate_psi_columns(expected, actual)
+        for j in range(3):
+            col = actual[:, j]
+            assert psi[j] == pytest.approx(calculate_psi(expected[:, j], col[~np.isnan(col)]), abs=1e-6)
+
 
 # ---------------------------------------------------------------------------
 # run_ks_test
@@ -139,6 +156,24 @@ class TestRunKSTest:
         assert len(result) == 2
         assert all(isinstance(v, float) for v in result)
 
+    def test_asymptotic_ks_matches_exact_statistic(self):
+        rng = np.random.default_rng(11)
+        expected = rng.normal(0, 1, 20_000)
+        actual = rng.normal(0.1, 1, 20_000)
+        exact_stat, _ = run_ks_test(expected, actual)
+        asymp_stat, asymp_p = asymptotic_ks_test(expected, actual)
+        assert asymp_stat == pytest.approx(exact_stat, abs=1e-12)
+        assert asymp_p < 0.05
+
+    def test_asymptotic_ks_handles_ties(self):
+        rng = np.random.default_rng(12)
+        expected = rng.poisson(2, 5_000).astype(float)
+        actual = rng.poisson(2, 4_000).astype(float)
+        exact_stat, exact_p = run_ks_test(expected, actual)
+        asymp_stat, asymp_p = asymptotic_ks_test(expected, actual)
+        assert asymp_stat == pytest.approx(exact_stat, abs=1e-12)
+        assert asymp_p == pytest.approx(exact_p, rel=0.05)
+
 
 # ---------------------------------------------------------------------------
 # detect_feature_drift
@@ -151,6 +186,23 @@ class TestDetectFeatureDrift:
         assert result.drift_detected is False
         assert result.drift_score == 0.0
 
+    def test_asymptotic_ks_flags_same_drift(self, baseline_df, drifted_df):
+        exact = detect_feature_drift(baseline_df, drifted_df)
+        approx = detect_feature_drift(baseline_df, drifted_df, approx_ks_min_samples=2)
+        assert approx.affected_features == exact.affected_features
+
+    def test_no_drift_on_discrete_columns(self):
+        rng = np.random.default_rng(21)
+
+        def sample(n):
+            return pd.DataFrame({
+                "balls": rng.poisson(1.5, n),
+                "flag": (rng.random(n) < 0.3).astype(np.int8),
+            })
+
+        result = detect_feature_drift(sample(200_000), sample(200_000))
+        assert result.affected_features == []
+
     def test_drift_detected_on_shifted_data(self, baseline_df, drifted_df):
         result = detect_feature_drift(baseline_df, drifted_df)
         assert result.drift_detected is True
@@ -1,6 +1,8 @@
 """Tests for shared/base_agent.py – Base agent lifecycle and task execution."""
 
 import asyncio
+import uuid
+
 import pytest
 from datetime import datetime
 
@@ -168,6 +170,107 @@ class TestLifecycle:
         assert agent.is_running is False
         assert agent.cleaned_up is True
 
+    async def test_run_loop_executes_queued_task_and_stops(self, global_mq):
+        agent = ConcreteAgent()
+        await global_mq.publish_task(_make_task("loop_001"))
+
+        runner = asyncio.create_task(agent.start())
+        for _ in range(50):
+            if agent.tasks_completed:
+                break
+            await asyncio.sleep(0.02)
+        await agent.stop()
+        await asyncio.wait_for(runner, timeout=1)
+
+        assert agent.tasks_completed == 1
+        assert (await global_mq.get_result("loop_001")).status == TaskStatus.COMPLETED
+
+    async def test_run_loop_serializes_tasks_within_a_space(self, global_mq):
+        events = []
+
+        class SlowAgent(ConcreteAgent):
+            async def handle_task(self, task):
+                events.append(("start", task.task_id))
+                await asyncio.sleep(0.05)
+                events.append(("end", task.task_id))
+                return await super().handle_task(task)
+
+        agent = SlowAgent()
+        for task_id, space in [("a1", "a"), ("a2", "a"), ("b1", "b")]:
+            task = _make_task(task_id)
+            task.parameters["space_id"] = space
+            await global_mq.publish_task(task)
+
+        runner = asyncio.create_task(agent.start())
+        for _ in range(50):
+            if agent.tasks_completed == 3:
+                break
+            await asyncio.sleep(0.02)
+        await agent.stop()
+        await asyncio.wait_for(runner, timeout=1)
+
+        assert agent.tasks_completed == 3
+        # Same space runs back to back; the other space overlaps with it
+        assert events.index(("end", "a1")) < events.index(("start", "a2"))
+        assert events.index(("start", "b1")) < events.index(("end", "a1"))
+
+    async def test_busy_space_does_not_drain_redis_queue(self, global_mq, monkeypatch):
+        from shared.config import settings
+        from shared.messaging import processing_queue_key
+
+        monkeypatch.setattr(settings, "max_concurrent_tasks", 2)
+        release = asyncio.Event()
+
+        class BlockedAgent(ConcreteAgent):
+            async def handle_task(self, task):
+                await release.wait()
+                return await super().handle_task(task)
+
+        agent = BlockedAgent()
+        for i in range(10):
+            task = _make_task(f"hot_{i}")
+            task.parameters["space_id"] = "hot"
+            await global_mq.publish_task(task)
+
+        runner = asyncio.create_task(agent.start())
+        await asyncio.sleep(0.1)
+        processing = processing_queue_key(AgentType.DATA_QUALITY)
+        # Two pending in the space plus at most one batch waiting to dispatch
+        assert await global_mq.get_queue_depth(processing) <= 4
+
+        release.set()
+        for _ in range(50):
+            if agent.tasks_completed == 10:
+                break
+            await asyncio.sleep(0.02)
+        await agent.stop()
+        await asyncio.wait_for(runner, timeout=1)
+        assert agent.tasks_completed == 10
+
+    async def test_unhashable_space_id_still_runs(self, global_mq):
+        agent = ConcreteAgent()
+        task = _make_task("list_space")
+        task.parameters["space_id"] = ["a", "b"]
+        await global_mq.publish_task(task)
+
+        runner = asyncio.create_task(agent.start())
+        for _ in range(50):
+            if agent.tasks_completed:
+                break
+            await asyncio.sleep(0.02)
+        await agent.stop()
+        await asyncio.wait_for(runner, timeout=1)
+
+        assert agent.tasks_completed == 1
+
+    async def test_run_cpu_bound_uses_process_pool_until_stopped(self):
+        agent = ConcreteAgent()
+        assert await agent.run_cpu_bound(sum, [1, 2, 3]) == 6
+        assert agent._cpu_pool is not None
+
+        await agent.stop()
+        assert agent._cpu_pool is None
+
 
 # ── Publishing helpers ─────────────────────────────────────────────────────
 
@@ -188,6 +291,16 @@ class TestPublishing:
         depth = await global_mq.get_queue_depth(settings.task_queue_name)
         assert depth == 1
 
+    async def test_published_task_ids_are_unique_uuids(self, global_mq):
+        agent = ConcreteAgent(AgentType.ORCHESTRATOR)
+        task_ids = [
+            await agent.publish_task(AgentType.DATA_QUALITY, "check_anomalies", {})
+            for _ in range(300)
+        ]
+
+        assert len(set(task_ids)) == len(task_ids)
+        assert all(uuid.UUID(task_id).version == 4 for task_id in task_ids)
+
 
 # ── Task context manager ──────────────────────────────────────────────────
 
@@ -116,6 +116,16 @@ class TestRedisUrl:
         url = get_redis_url()
         assert url == "redis://:s3cret@redis.prod:6380/2"
 
+    def test_url_with_unix_socket(self, monkeypatch):
+        from shared.config import settings
+
+        monkeypatch.setattr(settings, "redis_socket_path", "/var/run/redis/redis.sock")
+        monkeypatch.setattr(settings, "redis_db", 1)
+        monkeypatch.setattr(settings, "redis_password", None)
+
+        url = get_redis_url()
+        assert url == "unix:///var/run/redis/redis.sock?db=1"
+
 
 # ── Directory helpers ──────────────────────────────────────────────────────
 
@@ -3,9 +3,19 @@
 import json
 import logging
 import sys
+from datetime import datetime
+from pathlib import Path
+
 import pytest
 
-from shared.logging_utils import JSONFormatter, setup_logging, log_with_context, get_agent_logger
+from shared.logging_utils import (
+    BufferedFileHandler,
+    JSONFormatter,
+    setup_logging,
+    log_with_context,
+    get_agent_logger,
+    _buffered_handlers,
+)
 
 
 # ── JSONFormatter ──────────────────────────────────────────────────────────
@@ -30,6 +40,14 @@ class TestJSONFormatter:
         assert data["logger"] == "test_logger"
         assert "timestamp" in data
 
+    def test_timestamp_matches_record_time(self):
+        fmt = JSONFormatter()
+        record = logging.LogRecord("t", logging.INFO, "test.py", 1, "msg", (), None)
+        for created in (1_700_000_000.0, 1_700_000_000.25, 1_700_000_001.5):
+            record.created = created
+            stamp = datetime.fromisoformat(json.loads(fmt.format(record))["timestamp"])
+            assert stamp.timestamp() == pytest.approx(created, abs=1e-6)
+
     def test_exception_included(self):
         fmt = JSONFormatter()
         try:
@@ -66,6 +84,51 @@ class TestJSONFormatter:
         assert data["task_id"] == "t001"
         assert data["duration"] == 5.2
 
+    def test_unserializable_extra_fields_stringified(self):
+        fmt = JSONFormatter()
+        record = logging.LogRecord(
+            name="test",
+            level=logging.INFO,
+            pathname="test.py",
+            lineno=10,
+            msg="odd context",
+            args=(),
+            exc_info=None,
+        )
+        record.extra_fields = {"path": Path("/tmp/data.parquet")}
+
+        data = json.loads(fmt.format(record))
+        assert data["path"] == "/tmp/data.parquet"
+
+
+# ── BufferedFileHandler ────────────────────────────────────────────────────
+
+
+class TestBufferedFileHandler:
+    def _record(self, msg):
+        return logging.LogRecord("t", logging.INFO, "test.py", 1, msg, (), None)
+
+    def test_records_buffered_until_flush(self, tmp_path):
+        path = tmp_path / "buffered.log"
+        handler = BufferedFileHandler(path)
+        # Keep the periodic flusher from racing the assertions
+        _buffered_handlers.discard(handler)
+        try:
+            handler.emit(self._record("first"))
+            assert path.read_text() == ""
+            handler.flush_buffer()
+            assert path.read_text() == "first\n"
+        finally:
+            handler.close()
+
+    def test_close_writes_pending_records(self, tmp_path):
+        path = tmp_path / "buffered.log"
+        handler = BufferedFileHandler(path)
+        for i in range(3):
+            handler.emit(self._record(f"line {i}"))
+        handler.close()
+        assert path.read_text().splitlines() == ["line 0", "line 1", "line 2"]
+
 
 # ── setup_logging ──────────────────────────────────────────────────────────
 
@@ -88,6 +151,14 @@ class TestSetupLogging:
         logger = setup_logging("test_debug", log_level="DEBUG")
         assert logger.level == logging.DEBUG
 
+    def test_propagation_is_opt_out(self, tmp_path, monkeypatch):
+        from shared.config import settings
+
+        monkeypatch.setattr(settings, "project_root", tmp_path)
+
+        assert setup_logging("test_propagate").propagate is True
+        assert setup_logging("test_propagate", propagate=False).propagate is False
+
     def test_creates_agent_log_directory(self, tmp_path, monkeypatch):
         from shared.config import settings
 
@@ -103,14 +174,33 @@ class TestSetupLogging:
 
         logger = setup_logging("test_plain", use_json=False)
         assert len(logger.handlers) >= 1
-        # At least one handler should use a standard Formatter (not JSON)
+        # At least one output handler should use a standard Formatter (not JSON)
+        handlers = [h for qh in logger.handlers for h in qh.listener.handlers]
         has_standard = any(
             not isinstance(h.formatter, JSONFormatter)
-            for h in logger.handlers
+            for h in handlers
             if h.formatter is not None
         )
         assert has_standard
 
+    def test_records_written_by_listener(self, tmp_path, monkeypatch):
+        from shared.config import settings
+
+        monkeypatch.setattr(settings, "project_root", tmp_path)
+
+        logger = setup_logging("test_queue")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed %s", "task_1")
+        # Reconfiguring drains the previous listener before replacing it
+        setup_logging("test_queue")
+
+        line = (tmp_path / "logs" / "test_queue" / "test_queue.log").read_text().strip()
+        data = json.loads(line)
+        assert data["message"] == "failed task_1"
+        assert "ValueError" in data["exception"]
+
 
 # ── log_with_context ───────────────────────────────────────────────────────
 
@@ -124,6 +214,18 @@ class TestLogWithContext:
         logger = setup_logging("ctx_test")
         log_with_context(logger, "info", "Task started", task_id="t001", agent="dq")
 
+    def test_skips_records_below_level(self, tmp_path, monkeypatch):
+        from shared.config import settings
+
+        monkeypatch.setattr(settings, "project_root", tmp_path)
+
+        logger = setup_logging("ctx_level", log_level="WARNING")
+        handled = []
+        monkeypatch.setattr(logger, "handle", handled.append)
+        log_with_context(logger, "debug", "noise", task_id="t001")
+        log_with_context(logger, "error", "failure", task_id="t001")
+        assert [r.getMessage() for r in handled] == ["failure"]
+
 
 # ── get_agent_logger ───────────────────────────────────────────────────────
 
@@ -136,3 +238,14 @@ class TestGetAgentLogger:
 
         logger = get_agent_logger("my_agent")
         assert logger.name == "my_agent"
+
+    def test_configures_logger_once(self, tmp_path, monkeypatch):
+        from shared.config import settings
+
+        monkeypatch.setattr(settings, "project_root", tmp_path)
+
+        first = get_agent_logger("cached_agent")
+        handler = first.handlers[0]
+        second = get_agent_logger("cached_agent")
+        assert second is first
+        assert second.handlers == [handler]
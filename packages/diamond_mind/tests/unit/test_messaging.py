@@ -1,5 +1,8 @@
 """Tests for shared/messaging.py – Redis-based messaging system."""
 
+import asyncio
+from datetime import datetime
+
 import pytest
 
 from shared.schemas import (
@@ -12,6 +15,14 @@ from shared.schemas import (
     AgentAlert,
 )
 from shared.config import settings
+from shared.messaging import (
+    task_queue_key,
+    processing_queue_key,
+    heartbeat_key,
+    parse_heartbeat,
+    encode_message,
+    decode_message,
+)
 
 
 # ── Task operations ────────────────────────────────────────────────────────
@@ -77,6 +88,111 @@ class TestTaskOperations:
 
         assert consumed.parameters == task.parameters
 
+    async def test_tasks_routed_to_agent_queue(self, fake_mq, sample_task):
+        await fake_mq.publish_task(sample_task)
+
+        assert await fake_mq.get_queue_depth(task_queue_key(AgentType.DATA_QUALITY)) == 1
+        assert await fake_mq.get_queue_depth(task_queue_key(AgentType.MODEL_MONITOR)) == 0
+
+    async def test_consume_task_scoped_to_agent(self, fake_mq):
+        for agent_id in (AgentType.DATA_QUALITY, AgentType.MODEL_MONITOR):
+            await fake_mq.publish_task(
+                AgentTask(task_id=f"task_{agent_id.value}", agent_id=agent_id, task_type="check")
+            )
+
+        consumed = await fake_mq.consume_task(timeout=1, agent_id=AgentType.MODEL_MONITOR)
+        assert consumed.task_id == "task_model_monitor"
+        assert await fake_mq.consume_task(timeout=1, agent_id=AgentType.MODEL_MONITOR) is None
+        assert await fake_mq.get_queue_depth(settings.task_queue_name) == 1
+
+    async def test_iter_task_batches_yields_own_tasks(self, fake_mq, sample_task):
+        await fake_mq.publish_task(sample_task)
+
+        batches = fake_mq.iter_task_batches(AgentType.DATA_QUALITY, max_tasks=5)
+        batch = await asyncio.wait_for(batches.__anext__(), timeout=1)
+        await batches.aclose()
+
+        assert [t.task_id for t in batch] == [sample_task.task_id]
+
+    async def test_consume_task_batch_drains_up_to_limit(self, fake_mq):
+        for i in range(4):
+            await fake_mq.publish_task(
+                AgentTask(task_id=f"task_{i}", agent_id=AgentType.DATA_QUALITY, task_type="check")
+            )
+
+        batch = await fake_mq.consume_task_batch(AgentType.DATA_QUALITY, max_tasks=3, timeout=1)
+
+        assert [t.task_id for t in batch] == ["task_0", "task_1", "task_2"]
+        assert await fake_mq.get_queue_depth(settings.task_queue_name) == 1
+
+    async def test_consume_task_batch_drops_undecodable_payloads(self, fake_mq, sample_task):
+        await fake_mq.redis_client.lpush(task_queue_key(AgentType.DATA_QUALITY), b"{not json")
+        await fake_mq.publish_task(sample_task)
+
+        batch = await fake_mq.consume_task_batch(AgentType.DATA_QUALITY, max_tasks=5, timeout=1)
+
+        assert [t.task_id for t in batch] == [sample_task.task_id]
+        processing = processing_queue_key(AgentType.DATA_QUALITY)
+        assert await fake_mq.get_queue_depth(processing) == 1
+        assert await fake_mq.requeue_unacked(AgentType.DATA_QUALITY, min_idle_seconds=0) == 1
+        assert await fake_mq.get_queue_depth(processing) == 0
+
+    async def test_consume_task_batch_empty_returns_empty_list(self, fake_mq):
+        assert await fake_mq.consume_task_batch(AgentType.DATA_QUALITY, 5, timeout=1) == []
+
+    async def test_batch_tasks_acked_when_result_published(self, fake_mq, sample_task, sample_result):
+        await fake_mq.publish_task(sample_task)
+        await fake_mq.consume_task_batch(AgentType.DATA_QUALITY, max_tasks=5, timeout=1)
+        processing = processing_queue_key(AgentType.DATA_QUALITY)
+        assert await fake_mq.get_queue_depth(processing) == 1
+
+        await fake_mq.publish_results([sample_result])
+        assert await fake_mq.get_queue_depth(processing) == 0
+
+    async def test_requeue_unacked_tasks(self, fake_mq):
+        for i in range(3):
+            await fake_mq.publish_task(
+                AgentTask(task_id=f"task_{i}", agent_id=AgentType.DATA_QUALITY, task_type="check")
+            )
+        await fake_mq.consume_task_batch(AgentType.DATA_QUALITY, max_tasks=2, timeout=1)
+
+        assert await fake_mq.requeue_unacked(AgentType.DATA_QUALITY, min_idle_seconds=0) == 2
+        batch = await fake_mq.consume_task_batch(AgentType.DATA_QUALITY, max_tasks=5, timeout=1)
+        assert [t.task_id for t in batch] == ["task_0", "task_1", "task_2"]
+
+    async def test_requeue_leaves_recently_consumed_tasks(self, fake_mq, sample_task):
+        # A sibling instance starting up must not steal tasks still in flight
+        await fake_mq.publish_task(sample_task)
+        await fake_mq.consume_task_batch(AgentType.DATA_QUALITY, max_tasks=5, timeout=1)
+
+        assert await fake_mq.requeue_unacked(AgentType.DATA_QUALITY) == 0
+        processing = processing_queue_key(AgentType.DATA_QUALITY)
+        assert await fake_mq.get_queue_depth(processing) == 1
+
+    async def test_failed_publish_keeps_task_unacked(
+        self, fake_mq, sample_task, sample_result, monkeypatch
+    ):
+        await fake_mq.publish_task(sample_task)
+        await fake_mq.consume_task_batch(AgentType.DATA_QUALITY, max_tasks=5, timeout=1)
+        real_pipeline = fake_mq.redis_client.pipeline
+
+        def failing_pipeline(*args, **kwargs):
+            pipe = real_pipeline(*args, **kwargs)
+
+            async def boom():
+                raise ConnectionError("redis went away")
+
+            pipe.execute = boom
+            return pipe
+
+        monkeypatch.setattr(fake_mq.redis_client, "pipeline", failing_pipeline)
+        assert await fake_mq.publish_results([sample_result]) is False
+        monkeypatch.undo()
+
+        assert await fake_mq.publish_results([sample_result]) is True
+        processing = processing_queue_key(AgentType.DATA_QUALITY)
+        assert await fake_mq.get_queue_depth(processing) == 0
+
 
 # ── Result operations ──────────────────────────────────────────────────────
 
@@ -94,6 +210,40 @@ class TestResultOperations:
         assert retrieved.status == sample_result.status
         assert retrieved.metrics == sample_result.metrics
 
+    async def test_publish_results_batch(self, fake_mq, sample_result):
+        other = sample_result.model_copy(update={"task_id": "test_task_002"})
+        assert await fake_mq.publish_results([sample_result, other]) is True
+
+        assert await fake_mq.get_queue_depth(settings.result_queue_name) == 2
+        assert (await fake_mq.get_result("test_task_002")).task_id == "test_task_002"
+
+    async def test_wait_for_result_wakes_on_publish(self, fake_mq, sample_result):
+        waiter = asyncio.create_task(fake_mq.wait_for_result(sample_result.task_id, timeout=5))
+        await asyncio.sleep(0.05)
+        await fake_mq.publish_results([sample_result])
+        result = await asyncio.wait_for(waiter, timeout=1)
+        assert result.task_id == sample_result.task_id
+
+    async def test_wait_for_result_returns_existing_result(self, fake_mq, sample_result):
+        await fake_mq.publish_result(sample_result)
+        result = await fake_mq.wait_for_result(sample_result.task_id, timeout=1)
+        assert result.task_id == sample_result.task_id
+
+    async def test_wait_for_result_times_out(self, fake_mq):
+        assert await fake_mq.wait_for_result("never_published", timeout=0.1) is None
+
+    async def test_publish_results_refreshes_heartbeat(self, fake_mq, sample_result):
+        await fake_mq.publish_results([sample_result], heartbeat_agent_id="data_quality")
+        assert await fake_mq.get_agent_heartbeat("data_quality") is not None
+
+    async def test_published_results_expire(self, fake_mq, sample_result):
+        await fake_mq.publish_result(sample_result)
+        other = sample_result.model_copy(update={"task_id": "test_task_002"})
+        await fake_mq.publish_results([other])
+        for task_id in (sample_result.task_id, other.task_id):
+            ttl = await fake_mq.redis_client.ttl(f"results:{task_id}")
+            assert 0 < ttl <= settings.result_ttl_seconds
+
     async def test_get_nonexistent_result(self, fake_mq):
         assert await fake_mq.get_result("does_not_exist") is None
 
@@ -109,6 +259,20 @@ class TestAlertOperations:
         assert depth == 1
 
 
+    async def test_consume_alerts_delivers_published_alert(self, fake_mq, sample_alert):
+        received = asyncio.Queue()
+        consumer = asyncio.create_task(fake_mq.consume_alerts(received.put_nowait))
+        await asyncio.sleep(0.05)  # let the subscription register
+
+        await fake_mq.publish_alert(sample_alert)
+        alert = await asyncio.wait_for(received.get(), timeout=2)
+        assert alert.alert_id == sample_alert.alert_id
+
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+        assert (await fake_mq.redis_client.pubsub_numsub("alerts"))[0][1] == 0
+
+
 # ── Heartbeat operations ──────────────────────────────────────────────────
 
 
@@ -118,6 +282,30 @@ class TestHeartbeatOperations:
         heartbeat = await fake_mq.get_agent_heartbeat("data_quality")
         assert heartbeat is not None
 
+    async def test_heartbeat_expires(self, fake_mq):
+        await fake_mq.update_agent_heartbeat("data_quality")
+        ttl = await fake_mq.redis_client.ttl(heartbeat_key("data_quality"))
+        assert 0 < ttl <= settings.heartbeat_interval_seconds * 3
+
+    async def test_heartbeat_stored_as_epoch_millis(self, fake_mq):
+        before = datetime.now()
+        await fake_mq.update_agent_heartbeat("data_quality")
+        raw = await fake_mq.redis_client.get(heartbeat_key("data_quality"))
+        assert raw.isdigit()
+        heartbeat = await fake_mq.get_agent_heartbeat("data_quality")
+        assert abs((heartbeat - before).total_seconds()) < 5
+
+    async def test_legacy_iso_heartbeat_still_parsed(self, fake_mq):
+        stamp = datetime(2025, 6, 1, 12, 30)
+        await fake_mq.redis_client.set(heartbeat_key("data_quality"), stamp.isoformat())
+        assert await fake_mq.get_agent_heartbeat("data_quality") == stamp
+
+    def test_parse_heartbeat_accepts_decoded_strings(self):
+        stamp = datetime(2025, 6, 1, 12, 30)
+        millis = str(int(stamp.timestamp() * 1000))
+        assert parse_heartbeat(millis) == parse_heartbeat(millis.encode()) == stamp
+        assert parse_heartbeat(stamp.isoformat()) == stamp
+
     async def test_get_nonexistent_heartbeat(self, fake_mq):
         assert await fake_mq.get_agent_heartbeat("nonexistent") is None
 
@@ -140,3 +328,21 @@ class TestQueueUtilities:
     async def test_publish_generic_message(self, fake_mq):
         success = await fake_mq.publish_message("test_channel", {"key": "value"})
         assert success is True
+
+
+class TestWireFormat:
+    def test_msgpack_round_trip(self, sample_task):
+        payload = encode_message(sample_task)
+        assert not payload.startswith(b"{")
+        assert decode_message(AgentTask, payload) == sample_task
+
+    def test_json_payload_still_decodes(self, sample_task):
+        payload = sample_task.model_dump_json().encode()
+        assert decode_message(AgentTask, payload) == sample_task
+
+    async def test_json_format_flag(self, fake_mq, sample_task, monkeypatch):
+        monkeypatch.setattr(settings, "message_format", "json")
+        await fake_mq.publish_task(sample_task)
+        raw = await fake_mq.redis_client.lindex(task_queue_key(sample_task.agent_id), 0)
+        assert raw.startswith(b"{")
+        assert (await fake_mq.consume_task(timeout=1)).task_id == sample_task.task_id
@@ -235,7 +235,10 @@ def _run_projections(roster: List[Dict], matchups: Dict[str, Dict]) -> List[Dict
                 _sys.path.insert(0, str(_mm))
 
             from matchup_machine.fantasy_inference import find_player_id  # type: ignore
-            from matchup_machine.fantasy_scoring import expected_hitter_points_per_pa  # type: ignore
+            from matchup_machine.fantasy_scoring import (  # type: ignore
+                expected_hitter_points_per_pa,
+                expected_hitter_points_per_pa_batch,
+            )
             from matchup_machine.build_dataset import OUTCOME_LABELS  # type: ignore
 
             batter_id = int(find_player_id(player_index, name))
@@ -279,17 +282,11 @@ def _run_projections(roster: List[Dict], matchups: Dict[str, Dict]) -> List[Dict
                 projection_data = batter_pas
                 matchup_type = "general"
 
-            X = projection_data.reindex(columns=feature_cols, fill_value=0)
-            X_filled = X.copy()
-            for col in X_filled.columns:
-                if X_filled[col].isna().any():
-                    if str(X_filled[col].dtype).startswith("Int"):
-                        X_filled[col] = X_filled[col].astype("float64")
-                    X_filled[col] = X_filled[col].fillna(X_filled[col].median())
-                if str(X_filled[col].dtype).startswith("Int"):
-                    X_filled[col] = X_filled[col].astype("float64")
-
-            probs = model.predict_proba(X_filled)
+            # Missing values stay NaN (the outcome model was trained on
+            # unfilled features); the cast turns nullable Int32 <NA> into NaN
+            X = projection_data.reindex(columns=feature_cols, fill_value=0).astype("float64")
+
+            probs = model.predict_proba(X)
             avg_probs = probs.mean(axis=0)
             outcome_probs = {label: float(p) for label, p in zip(OUTCOME_LABELS, avg_probs)}
             ev_per_pa = expected_hitter_points_per_pa(outcome_probs)
@@ -301,12 +298,7 @@ def _run_projections(roster: List[Dict], matchups: Dict[str, Dict]) -> List[Dict
             # captures both sample size and prediction variance in one number.
             # Lower RSE = tighter distribution = higher confidence.
             import numpy as _np
-            per_pa_ev = _np.array([
-                expected_hitter_points_per_pa(
-                    {label: float(p) for label, p in zip(OUTCOME_LABELS, row)}
-                )
-                for row in probs
-            ])
+            per_pa_ev = expected_hitter_points_per_pa_batch(probs)
             n = len(per_pa_ev)
             mean_ev = per_pa_ev.mean()
             std_ev = per_pa_ev.std() if n > 1 else 1.0
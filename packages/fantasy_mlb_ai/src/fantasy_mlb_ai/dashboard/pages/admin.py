@@ -150,22 +150,19 @@ with tab_status:
     cols = st.columns(len(agents))
     now = datetime.now()
     for col, agent in zip(cols, agents):
-        ts_str = heartbeats.get(agent)
-        if ts_str:
-            try:
-                last = datetime.fromisoformat(ts_str)
-                elapsed = (now - last).total_seconds()
-                label = f"{elapsed:.0f}s ago"
-                icon = "🟢" if elapsed < 120 else "🟡" if elapsed < 300 else "🔴"
-                col.metric(agent, f"{icon} {label}")
-            except ValueError:
-                col.metric(agent, "⚠️ bad timestamp")
+        last = heartbeats.get(agent)
+        if last:
+            elapsed = (now - last).total_seconds()
+            label = f"{elapsed:.0f}s ago"
+            icon = "🟢" if elapsed < 120 else "🟡" if elapsed < 300 else "🔴"
+            col.metric(agent, f"{icon} {label}")
         else:
             col.metric(agent, "⚫ no heartbeat")
 
     st.caption(
         "Green = heartbeat within 2 min. Yellow = 2–5 min. Red = >5 min. "
-        "Black = agent has never sent a heartbeat (not running)."
+        "Black = no live heartbeat; heartbeats expire after three missed "
+        "intervals, so the agent is not running."
     )
 
     st.divider()
@@ -211,28 +208,28 @@ _TASK_DEFS: dict[str, dict[str, dict]] = {
     },
     "data_quality": {
         "check_data_quality": {
-            "data_source": "packages/matchup_machine/data/player_index.csv",
+            "data_source": "packages/matchup_machine/data/player_index.parquet",
             "auto_fix": False,
             "threshold": 3.0,
             "contamination": 0.05,
         },
         "detect_anomalies": {
-            "data_source": "packages/matchup_machine/data/player_index.csv",
+            "data_source": "packages/matchup_machine/data/player_index.parquet",
             "threshold": 3.0,
             "contamination": 0.05,
         },
         "validate_schema": {
-            "data_source": "packages/matchup_machine/data/player_index.csv",
+            "data_source": "packages/matchup_machine/data/player_index.parquet",
         },
         "repair_data": {
-            "data_source": "packages/matchup_machine/data/player_index.csv",
-            "output_path": "packages/matchup_machine/data/player_index_repaired.csv",
+            "data_source": "packages/matchup_machine/data/player_index.parquet",
+            "output_path": "packages/matchup_machine/data/player_index_repaired.parquet",
         },
     },
     "model_monitor": {
         "check_drift": {
             "model_name": "xgb_outcome_model",
-            "data_source": "packages/matchup_machine/data/player_index.csv",
+            "data_source": "packages/matchup_machine/data/player_index.parquet",
         },
         "evaluate_performance": {
             "model_name": "xgb_outcome_model",
@@ -261,7 +258,7 @@ _TASK_DEFS: dict[str, dict[str, dict]] = {
     },
     "feature_engineer": {
         "search_features": {
-            "data_source": "packages/matchup_machine/data/player_index.csv",
+            "data_source": "packages/matchup_machine/data/player_index.parquet",
             "target_column": "is_batter",
             "max_features": 20,
         },
@@ -271,7 +268,7 @@ _TASK_DEFS: dict[str, dict[str, dict]] = {
             "source_features": ["projected_pa"],
         },
         "generate_features": {
-            "data_source": "packages/matchup_machine/data/player_index.csv",
+            "data_source": "packages/matchup_machine/data/player_index.parquet",
             "existing_features": ["player_id", "is_batter", "is_pitcher"],
         },
     },
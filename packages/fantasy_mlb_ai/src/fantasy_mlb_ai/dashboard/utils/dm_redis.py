@@ -12,13 +12,35 @@ Usage:
 from __future__ import annotations
 
 import json
+import sys
 import uuid
 from datetime import datetime
+from pathlib import Path
 from typing import Any, Optional
 
 import redis
 import streamlit as st
 
+# diamond_mind's modules import each other as bare `shared.*`, so its
+# src/diamond_mind directory goes on sys.path (as in its integrations)
+for _candidate in [
+    Path(__file__).parents[5] / "diamond_mind" / "src" / "diamond_mind",  # packages/diamond_mind
+    Path(__file__).parents[6] / "diamond_mind" / "src" / "diamond_mind",
+]:
+    if _candidate.exists():
+        if str(_candidate) not in sys.path:
+            sys.path.insert(0, str(_candidate))
+        break
+
+from shared.config import settings  # noqa: E402
+from shared.messaging import (  # noqa: E402
+    decode_message,
+    heartbeat_key,
+    parse_heartbeat,
+    task_queue_key,
+)
+from shared.schemas import AgentAlert, AgentResult, AgentType  # noqa: E402
+
 
 # ---------------------------------------------------------------------------
 # Connection
@@ -45,9 +67,13 @@ def _redis_url() -> str:
 
 @st.cache_resource(show_spinner=False)
 def get_client() -> Optional[redis.Redis]:
-    """Return a cached sync Redis client, or None if Redis is unreachable."""
+    """
+    Return a cached sync Redis client, or None if Redis is unreachable.
+    Responses stay bytes: results and alerts may be MessagePack, which only
+    decode_message can read.
+    """
     try:
-        client = redis.Redis.from_url(_redis_url(), decode_responses=True)
+        client = redis.Redis.from_url(_redis_url(), decode_responses=False)
         client.ping()
         return client
     except Exception:
@@ -55,12 +81,21 @@ def get_client() -> Optional[redis.Redis]:
 
 
 # ---------------------------------------------------------------------------
-# Queue names (match diamond_mind defaults)
+# Queue names (from diamond_mind's settings)
 # ---------------------------------------------------------------------------
 
-TASK_QUEUE    = "diamond_mind:tasks"
-RESULT_QUEUE  = "diamond_mind:results"
-ALERT_QUEUE   = "diamond_mind:alerts"
+# Prefix of the per-agent task lists (task_queue_key), not a list itself
+TASK_QUEUE    = settings.task_queue_name
+RESULT_QUEUE  = settings.result_queue_name
+ALERT_QUEUE   = settings.alert_queue_name
+
+# Message schema stored in each queue the dashboard reads back
+_QUEUE_MODELS = {RESULT_QUEUE: AgentResult, ALERT_QUEUE: AgentAlert}
+
+
+def _task_queue_keys() -> list[str]:
+    """Every agent's task list; agents only consume their own."""
+    return [task_queue_key(agent_type) for agent_type in AgentType]
 
 
 # ---------------------------------------------------------------------------
@@ -75,7 +110,7 @@ def push_task(
     timeout_seconds: Optional[int] = None,
 ) -> Optional[str]:
     """
-    Push an AgentTask JSON payload onto the task queue.
+    Push an AgentTask JSON payload onto the target agent's task list.
     Returns the generated task_id, or None on failure.
     """
     client = get_client()
@@ -94,7 +129,7 @@ def push_task(
         "retry_count": 0,
         "max_retries": 3,
     }
-    client.lpush(TASK_QUEUE, json.dumps(payload))
+    client.lpush(task_queue_key(agent_id), json.dumps(payload))
     return task_id
 
 
@@ -109,21 +144,25 @@ def get_result_by_task_id(task_id: str) -> Optional[dict]:
         return None
     raw = client.hget(f"results:{task_id}", "data")
     if raw:
-        return json.loads(raw)
+        return decode_message(AgentResult, raw).model_dump(mode="json")
     return None
 
 
 def get_recent_raw(queue: str, n: int = 20) -> list[dict]:
-    """Return the last *n* JSON items from a list queue (newest first)."""
+    """
+    Return the last *n* results or alerts from RESULT_QUEUE / ALERT_QUEUE
+    (newest first) as plain dicts. Entries that don't decode are skipped.
+    """
     client = get_client()
     if client is None:
         return []
+    model_cls = _QUEUE_MODELS[queue]
     items = client.lrange(queue, 0, n - 1)
     out = []
     for item in items:
         try:
-            out.append(json.loads(item))
-        except json.JSONDecodeError:
+            out.append(decode_message(model_cls, item).model_dump(mode="json"))
+        except Exception:
             pass
     return out
 
@@ -136,25 +175,44 @@ def get_queue_depths() -> dict[str, int]:
     client = get_client()
     if client is None:
         return {q: -1 for q in (TASK_QUEUE, RESULT_QUEUE, ALERT_QUEUE)}
+    pipe = client.pipeline(transaction=False)
+    for key in _task_queue_keys():
+        pipe.llen(key)
     return {
-        TASK_QUEUE:   client.llen(TASK_QUEUE),
+        TASK_QUEUE:   sum(pipe.execute()),
         RESULT_QUEUE: client.llen(RESULT_QUEUE),
         ALERT_QUEUE:  client.llen(ALERT_QUEUE),
     }
 
 
-def get_heartbeats() -> dict[str, str]:
-    """Return {agent_id: iso_timestamp} for all agents that have sent a heartbeat."""
+def get_heartbeats() -> dict[str, datetime]:
+    """
+    Return {agent_id: last heartbeat} for every agent with a live heartbeat.
+    Each agent keeps its own expiring heartbeat:<id> key, so agents that
+    stopped beating simply have no entry.
+    """
     client = get_client()
     if client is None:
         return {}
-    return client.hgetall("agent_heartbeats") or {}
+    agent_ids = [agent_type.value for agent_type in AgentType]
+    raw_values = client.mget([heartbeat_key(agent_id) for agent_id in agent_ids])
+    return {
+        agent_id: parse_heartbeat(raw)
+        for agent_id, raw in zip(agent_ids, raw_values)
+        if raw
+    }
 
 
 def clear_queue(queue: str) -> bool:
-    """Delete all items from a queue. Returns True on success."""
+    """
+    Delete all items from a queue (every agent's list for TASK_QUEUE).
+    Returns True on success.
+    """
     client = get_client()
     if client is None:
         return False
-    client.delete(queue)
+    if queue == TASK_QUEUE:
+        client.delete(*_task_queue_keys())
+    else:
+        client.delete(queue)
     return True
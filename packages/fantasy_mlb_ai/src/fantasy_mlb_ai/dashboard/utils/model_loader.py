@@ -68,7 +68,7 @@ def _download_from_hub(hf_repo: str, hf_token: str) -> Optional[Path]:
     Expected repo layout:
         xgb_outcome_model.joblib
         matchups.parquet
-        player_index.csv
+        player_index.parquet
         pitcher_profiles.parquet  (optional)
         batter_profiles.parquet   (optional)
         pa_projections.parquet    (optional)
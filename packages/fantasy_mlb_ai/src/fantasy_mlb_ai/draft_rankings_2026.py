@@ -163,21 +163,11 @@ class DraftRankingEngine:
             if df.empty or len(df) < 50:
                 return None
             
-            X = df.reindex(columns=self.feature_cols, fill_value=0)
+            # NaNs stay in (the outcome model was trained on unfilled
+            # features); the cast turns nullable Int32 <NA> into NaN
+            X = df.reindex(columns=self.feature_cols, fill_value=0).astype('float64')
             
-            # Handle Int32 dtype issues
-            X_filled = X.copy()
-            for col in X_filled.columns:
-                if X_filled[col].isna().any():
-                    if X_filled[col].dtype.name.startswith('Int'):
-                        X_filled[col] = X_filled[col].astype('float64')
-                    X_filled[col] = X_filled[col].fillna(X_filled[col].median())
-            
-            for col in X_filled.columns:
-                if X_filled[col].dtype.name.startswith('Int'):
-                    X_filled[col] = X_filled[col].astype('float64')
-            
-            probs = self.model.predict_proba(X_filled)
+            probs = self.model.predict_proba(X)
             avg_probs = probs.mean(axis=0)
             
             return {label: float(p) for label, p in zip(OUTCOME_LABELS, avg_probs)}
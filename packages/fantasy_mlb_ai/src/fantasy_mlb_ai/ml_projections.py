@@ -40,25 +40,12 @@ def safe_estimate_batter_probs(model, feature_cols, matchups, batter_id, min_pas
     if len(df) < min_pas:
         print(f"Warning: only {len(df)} PAs for batter_id={batter_id} (min_pas={min_pas})")
     
-    # Align to feature cols and handle missing values
-    X = df.reindex(columns=feature_cols, fill_value=0)
-    
-    # Custom fill_missing_values that handles Int32 issues
-    X_filled = X.copy()
-    for col in X_filled.columns:
-        if X_filled[col].isna().any():
-            # Convert to float64 to avoid Int32 issues
-            if X_filled[col].dtype.name.startswith('Int'):
-                X_filled[col] = X_filled[col].astype('float64')
-            X_filled[col] = X_filled[col].fillna(X_filled[col].median())
-    
-    # Convert all Int types to float to avoid prediction issues
-    for col in X_filled.columns:
-        if X_filled[col].dtype.name.startswith('Int'):
-            X_filled[col] = X_filled[col].astype('float64')
+    # Align to feature cols. Missing values stay NaN: the outcome model was
+    # trained on unfilled features. Casting turns nullable Int32 <NA> into NaN.
+    X = df.reindex(columns=feature_cols, fill_value=0).astype('float64')
     
     # Run prediction
-    probs = model.predict_proba(X_filled)
+    probs = model.predict_proba(X)
     avg_probs = probs.mean(axis=0)
     
     return {label: float(p) for label, p in zip(OUTCOME_LABELS, avg_probs)}
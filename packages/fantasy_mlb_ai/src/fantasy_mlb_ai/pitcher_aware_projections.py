@@ -156,18 +156,12 @@ class PitcherAwareEngine:
                 projection_data = batter_pas
             
             # Generate prediction
-            X = projection_data.reindex(columns=self.feature_cols, fill_value=0)
-            
-            # Handle missing values
-            X_filled = X.copy()
-            for col in X_filled.columns:
-                if X_filled[col].isna().any():
-                    if X_filled[col].dtype.name.startswith('Int'):
-                        X_filled[col] = X_filled[col].astype('float64')
-                    X_filled[col] = X_filled[col].fillna(X_filled[col].median())
+            # Missing values stay NaN (the outcome model was trained on
+            # unfilled features); the cast turns nullable Int32 <NA> into NaN
+            X = projection_data.reindex(columns=self.feature_cols, fill_value=0).astype('float64')
             
             # Run prediction
-            probs = safe_predict_probs(self.model, X_filled)
+            probs = safe_predict_probs(self.model, X)
             avg_probs = probs.mean(axis=0)
             
             outcome_probs = {label: float(p) for label, p in zip(OUTCOME_LABELS, avg_probs)}
@@ -12,7 +12,7 @@ from .fantasy_inference import (
     find_player_id,
     estimate_batter_outcome_probs_from_history,
 )
-from .fantasy_scoring import expected_hitter_points_per_pa
+from .fantasy_scoring import expected_hitter_points_per_pa, expected_hitter_points_per_pa_batch
 from .build_dataset import OUTCOME_LABELS
 
 __all__ = [
@@ -20,5 +20,6 @@ __all__ = [
     "find_player_id",
     "estimate_batter_outcome_probs_from_history",
     "expected_hitter_points_per_pa",
+    "expected_hitter_points_per_pa_batch",
     "OUTCOME_LABELS",
 ]
@@ -5,31 +5,47 @@ from typing import List
 
 import numpy as np
 import pandas as pd
+import pyarrow.compute as pc
 
 from . import config
+from .build_dataset import iter_matchup_batches
 
 
-def load_terminal_pas() -> pd.DataFrame:
-    """
-    Load matchups.parquet and filter to terminal pitches (rows with outcome_id).
-    Each row here represents one plate appearance.
-    """
-    path = config.MODELING_DIR / "matchups.parquet"
-    df = pd.read_parquet(path)
-    df = df[df["outcome_id"].notna()].copy()
-    df["season"] = df["date"].dt.year
-    return df
-
-
-def compute_pa_history(df: pd.DataFrame) -> pd.DataFrame:
+def compute_pa_history(batch_size: int = 1_000_000) -> pd.DataFrame:
     """
     Compute PA counts per batter per season.
     Returns columns: [batter, season, pa].
+
+    Terminal pitches (rows with outcome_id) are the plate appearances. The
+    three columns this needs are streamed from matchups in record batches,
+    each batch reduced to its (batter, season) counts, so memory stays flat
+    no matter how many seasons the dataset holds.
     """
+    batch_counts = []
+    for batch in iter_matchup_batches(["batter", "date", "outcome_id"], batch_size):
+        valid = pc.and_(
+            pc.and_(pc.is_valid(batch["outcome_id"]), pc.is_valid(batch["batter"])),
+            pc.is_valid(batch["date"]),
+        )
+        terminal = batch.filter(valid)
+        if terminal.num_rows == 0:
+            continue
+        batch_counts.append(
+            pd.DataFrame({
+                "batter": terminal["batter"].to_numpy(),
+                "season": pc.year(terminal["date"]).to_numpy(),
+            }).value_counts()
+        )
+
+    if not batch_counts:
+        return pd.DataFrame({"batter": [], "season": [], "pa": []}, dtype="int64")
+
     pa_counts = (
-        df.groupby(["batter", "season"], as_index=False)
-          .size()
-          .rename(columns={"size": "pa"})
+        pd.concat(batch_counts)
+          .groupby(level=["batter", "season"])
+          .sum()
+          .rename("pa")
+          .reset_index()
     )
     return pa_counts
 
@@ -41,52 +57,46 @@ def project_pa_for_next_season(pa_history: pd.DataFrame, target_season: int) ->
 
     Example weighting if 3 seasons:
       oldest: 0.1, middle: 0.3, latest: 0.6
-    """
-    proj_rows = []
-
-    for batter, grp in pa_history.groupby("batter"):
-        grp = grp.sort_values("season")
-
-        seasons = grp["season"].tolist()
-        pas = grp["pa"].tolist()
-        n = len(pas)
-
-        if n == 0:
-            continue
 
-        if n >= 3:
-            # use last 3 seasons
-            pas = pas[-3:]
-            n = 3
-            base_weights = np.array([0.1, 0.3, 0.6])
-            weights = base_weights[-n:]
-        elif n == 2:
-            # 40% older, 60% latest
-            weights = np.array([0.4, 0.6])
-        else:  # n == 1
-            weights = np.array([1.0])
-
-        weights = weights / weights.sum()
-        proj_pa = int(round(float(np.dot(pas, weights))))
-
-        proj_rows.append(
-            {
-                "batter": batter,
-                "projected_season": target_season,
-                "projected_pa": proj_pa,
-            }
-        )
+    Weights are assigned by each season's position from the latest, so the
+    whole projection is a handful of groupby passes rather than a Python loop
+    over batters.
+    """
+    # Last (up to) 3 seasons per batter, oldest first
+    recent = (
+        pa_history.sort_values(["batter", "season"], kind="stable")
+        .groupby("batter")
+        .tail(3)
+    )
+    by_batter = recent.groupby("batter", sort=True)
+    rank = by_batter.cumcount(ascending=False).to_numpy()  # 0 = latest season
+    n = by_batter["season"].transform("size").to_numpy()
+
+    # Weights in tenths so the weighted sum is exact integer arithmetic:
+    # 3 seasons: 0.1 / 0.3 / 0.6; 2 seasons: 0.4 / 0.6; 1 season: 1.0
+    weights = np.select(
+        [n == 1, rank == 0, (rank == 1) & (n == 2), rank == 1],
+        [10, 6, 4, 3],
+        default=1,
+    )
 
-    proj_df = pd.DataFrame(proj_rows)
+    weighted_pa = pd.Series(recent["pa"].to_numpy(dtype="int64") * weights, index=recent.index)
+    projected = weighted_pa.groupby(recent["batter"], sort=True).sum() / 10
+
+    # One typed array per column, so the frame is built without inferring
+    # dtypes or broadcasting a scalar season
+    n_batters = len(projected)
+    proj_df = pd.DataFrame({
+        "batter": projected.index.to_numpy(dtype="int64"),
+        "projected_season": np.full(n_batters, target_season, dtype="int32"),
+        "projected_pa": np.round(projected.to_numpy()).astype("int32"),
+    })
     return proj_df
 
 
 def main():
-    print("Loading terminal plate appearances...")
-    df = load_terminal_pas()
-
     print("Computing PA history per batter...")
-    pa_history = compute_pa_history(df)
+    pa_history = compute_pa_history()
 
     # Your historical seasons are 2023–2025; we're projecting 2026:
     target_season = 2026
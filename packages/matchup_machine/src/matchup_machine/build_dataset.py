@@ -1,6 +1,11 @@
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 
 from . import config
 
@@ -8,21 +13,45 @@ def list_clean_month_files() -> List[Path]:
     """Return sorted list of cleaned month parquet files."""
     return sorted(config.PROCESSED_DIR.glob("statcast_clean_*.parquet"))
 
+# Compact dtypes for the columns the feature steps group and roll over.
+# clean_month stores IDs as nullable Int32; filter_valid_pitches guarantees
+# batter/pitcher are present, so plain int32 avoids masked groupby paths.
+LOAD_DTYPES = {
+    "batter": "int32",
+    "pitcher": "int32",
+    "launch_speed": "float32",
+    "launch_angle": "float32",
+    "batter_stand": "category",
+    "pitcher_hand": "category",
+    "pitch_type": "category",
+}
+
+
 def load_all_clean() -> pd.DataFrame:
     """Load, concatenate, and sort all cleaned Statcast months."""
     files = list_clean_month_files()
     if not files:
         raise FileNotFoundError("No cleaned month files found. Run clean_month.py first.")
 
-    dfs = [pd.read_parquet(f) for f in files]
-    df = pd.concat(dfs, ignore_index=True)
-    df = df.sort_values(["date", "game_pk", "at_bat_number", "pitch_number"])
-    return df.reset_index(drop=True)
+    # Read every month as one Arrow table (multi-threaded) and sort it
+    # columnar, so pandas only materializes the final frame once
+    table = ds.dataset(files, format="parquet").to_table(use_threads=True)
+    table = table.sort_by([
+        (col, "ascending") for col in ("date", "game_pk", "at_bat_number", "pitch_number")
+    ])
+    df = table.to_pandas(self_destruct=True)
+    return df.astype({c: t for c, t in LOAD_DTYPES.items() if c in df.columns})
+
+HIT_EVENTS = ["single", "double", "triple", "home_run"]
+
 
 def add_hit_label(df: pd.DataFrame) -> pd.DataFrame:
     """Add binary hit indicator based on Statcast event string."""
-    hit_events = {"single", "double", "triple", "home_run"}
-    df["is_hit"] = df["event"].isin(hit_events).astype("int8")
+    # Compare small-int category codes instead of hashing every event string
+    ev = df["event"].astype("category")
+    hit_codes = ev.cat.categories.get_indexer(HIT_EVENTS)
+    hit_codes = hit_codes[hit_codes >= 0]
+    df["is_hit"] = np.isin(ev.cat.codes.to_numpy(), hit_codes).astype("int8")
     return df
 
 OUTCOME_LABELS = [
@@ -39,46 +68,38 @@ OUTCOME_LABELS = [
 OUTCOME_TO_ID = {label: i for i, label in enumerate(OUTCOME_LABELS)}
 
 
+# Terminal events with a fixed outcome; anything containing "strikeout"
+# maps to strikeout and any other recorded event to "other"
+EVENT_TO_OUTCOME = {
+    "single": "single",
+    "double": "double",
+    "triple": "triple",
+    "home_run": "home_run",
+    "walk": "walk",
+    "intent_walk": "walk",
+    "field_out": "ball_in_play_out",
+    "grounded_into_double_play": "ball_in_play_out",
+    "force_out": "ball_in_play_out",
+    "double_play": "ball_in_play_out",
+    "field_error": "ball_in_play_out",
+    "sac_fly": "ball_in_play_out",
+    "sac_bunt": "ball_in_play_out",
+    "hit_by_pitch": "other",
+    "catcher_interf": "other",
+}
+
+
 def add_outcome_label(df: pd.DataFrame) -> pd.DataFrame:
-    def map_event(ev: str):
-        # If no event recorded, this is a non-terminal pitch: no outcome label
-        if pd.isna(ev):
-            return None
-
-        ev = str(ev).lower()
-
-        if ev == "single":
-            return "single"
-        if ev == "double":
-            return "double"
-        if ev == "triple":
-            return "triple"
-        if ev == "home_run":
-            return "home_run"
-
-        if ev in {"walk", "intent_walk"}:
-            return "walk"
-
-        if "strikeout" in ev:
-            return "strikeout"
-
-        if ev in {
-            "field_out",
-            "grounded_into_double_play",
-            "force_out",
-            "double_play",
-            "field_error",
-            "sac_fly",
-            "sac_bunt",
-        }:
-            return "ball_in_play_out"
-
-        if ev in {"hit_by_pitch", "catcher_interf"}:
-            return "other"
-
-        return "other"
-
-    df["outcome"] = df["event"].map(map_event)
+    """Add multiclass outcome label (None for non-terminal pitches) and its id."""
+    ev = df["event"].astype("string").str.lower()
+
+    outcome = ev.map(EVENT_TO_OUTCOME).astype(object)
+    outcome = outcome.mask(ev.str.contains("strikeout", regex=False, na=False), "strikeout")
+    outcome = outcome.fillna("other")
+    # If no event recorded, this is a non-terminal pitch: no outcome label
+    outcome[ev.isna().to_numpy()] = None
+
+    df["outcome"] = outcome
     df["outcome_id"] = df["outcome"].map(OUTCOME_TO_ID).astype("Int8")
 
     return df
@@ -97,29 +118,33 @@ def merge_pitcher_profiles(df: pd.DataFrame, profiles: pd.DataFrame) -> pd.DataF
     return df.merge(profiles, on="pitcher", how="left")
 
 def add_batter_rolling(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.sort_values(["batter", "date", "game_pk", "at_bat_number", "pitch_number"])
-
-    if "launch_speed" in df.columns:
-        df["rolling_launch_speed"] = (
-            df.groupby("batter")["launch_speed"]
-              .rolling(50, min_periods=1)
-              .mean()
-              .reset_index(level=0, drop=True)
-        )
+    """
+    Add rolling per-batter contact and hit-rate features.
 
-    if "launch_angle" in df.columns:
-        df["rolling_launch_angle"] = (
-            df.groupby("batter")["launch_angle"]
+    Expects rows in chronological order, as load_all_clean returns them;
+    a stable sort on batter alone then leaves each batter's pitches in order.
+    """
+    df = df.iloc[np.argsort(df["batter"].to_numpy(), kind="stable")]
+    g = df.groupby("batter", sort=False)
+
+    # Both contact-quality columns share a window, so roll them in one pass
+    contact = [c for c in ("launch_speed", "launch_angle") if c in df.columns]
+    if contact:
+        rolled = (
+            g[contact]
               .rolling(50, min_periods=1)
               .mean()
               .reset_index(level=0, drop=True)
         )
+        for col in contact:
+            df[f"rolling_{col}"] = rolled[col].astype("float32")
 
     df["rolling_hit_rate"] = (
-        df.groupby("batter")["is_hit"]
+        g["is_hit"]
           .rolling(100, min_periods=1)
           .mean()
           .reset_index(level=0, drop=True)
+          .astype("float32")
     )
 
     return df
@@ -131,25 +156,38 @@ def add_matchup_handedness(df: pd.DataFrame) -> pd.DataFrame:
       - is_lefty_batter: 1 if batter stands left
       - is_lefty_pitcher: 1 if pitcher throws left
     """
-    # Make sure we’re working with strings (batter_stand and pitcher_hand are categories)
-    df["batter_stand"] = df["batter_stand"].astype(str)
-    df["pitcher_hand"] = df["pitcher_hand"].astype(str)
-
-    df["is_same_hand"] = (df["batter_stand"] == df["pitcher_hand"]).astype("int8")
-    df["is_lefty_batter"] = (df["batter_stand"] == "L").astype("int8")
-    df["is_lefty_pitcher"] = (df["pitcher_hand"] == "L").astype("int8")
+    # Put both hands on one shared category set so their codes are comparable;
+    # missing hands get code -1 and never count as a match
+    bs = df["batter_stand"].astype("category")
+    ph = df["pitcher_hand"].astype("category")
+    hands = bs.cat.categories.union(ph.cat.categories)
+    bs_codes = bs.cat.set_categories(hands).cat.codes.to_numpy()
+    ph_codes = ph.cat.set_categories(hands).cat.codes.to_numpy()
+    left = hands.get_indexer(["L"])[0]
+
+    df["is_same_hand"] = ((bs_codes == ph_codes) & (bs_codes >= 0)).astype("int8")
+    df["is_lefty_batter"] = ((bs_codes == left) & (left >= 0)).astype("int8")
+    df["is_lefty_pitcher"] = ((ph_codes == left) & (left >= 0)).astype("int8")
 
     return df
 
+CONTEXT_FLAGS = ["is_two_strike", "is_two_ball", "is_full_count", "has_runner_on"]
+
+
 def add_pitch_context(df: pd.DataFrame) -> pd.DataFrame:
     """Add count/baserunner context flags."""
-    df["is_two_strike"] = (df["strikes"] == 2).astype("int8")
-    df["is_two_ball"] = (df["balls"] == 2).astype("int8")
-    df["is_full_count"] = ((df["balls"] == 3) & (df["strikes"] == 2)).astype("int8")
+    balls = df["balls"].to_numpy()
+    strikes = df["strikes"].to_numpy()
 
-    df["has_runner_on"] = (
-        df[["on_1b", "on_2b", "on_3b"]].notna().any(axis=1).astype("int8")
-    )
+    # One int8 buffer, one contiguous row per flag, filled in place
+    flags = np.empty((len(CONTEXT_FLAGS), len(df)), dtype=np.int8)
+    np.equal(strikes, 2, out=flags[0], casting="unsafe")
+    np.equal(balls, 2, out=flags[1], casting="unsafe")
+    np.multiply(balls == 3, flags[0], out=flags[2], casting="unsafe")
+    np.any(df[["on_1b", "on_2b", "on_3b"]].notna().to_numpy(), axis=1, out=flags[3])
+
+    for name, values in zip(CONTEXT_FLAGS, flags):
+        df[name] = values
 
     return df
 
@@ -189,16 +227,83 @@ FINAL_COLUMNS = [
 ]
 
 def finalize_and_save(df: pd.DataFrame) -> None:
-    """Keep modeling columns, append pitch-mix pct columns, and write parquet."""
+    """
+    Keep modeling columns, append pitch-mix pct columns, and write parquet
+    plus an uncompressed Arrow IPC copy that read_matchups memory-maps.
+    Rows are written in chronological order so date-split readers don't
+    have to sort.
+    """
     cols = [c for c in FINAL_COLUMNS if c in df.columns] + \
            [c for c in df.columns if c.endswith("_pct")]  # pitch mix
 
-    final = df[cols].copy()
+    final = df[cols]  # column selection already returns a new frame
     final_path = config.MODELING_DIR / "matchups.parquet"
     final_path.parent.mkdir(parents=True, exist_ok=True)
-    final.to_parquet(final_path, index=False)
+    # add_batter_rolling leaves rows grouped by batter; restore the
+    # load_all_clean order
+    sort_keys = [c for c in ("date", "game_pk", "at_bat_number", "pitch_number") if c in final.columns]
+    table = pa.Table.from_pandas(final, preserve_index=False)
+    table = table.sort_by([(col, "ascending") for col in sort_keys])
+    # zstd + dictionary pages keep the repetitive ID/category columns small;
+    # 1 MiB data pages cut per-page header overhead
+    pq.write_table(
+        table,
+        final_path,
+        compression="zstd",
+        compression_level=3,
+        use_dictionary=True,
+        data_page_size=1 << 20,
+    )
     print(f"Saved final dataset: {final_path} ({len(final):,} rows)")
 
+    # Uncompressed so readers can map it instead of decoding it
+    arrow_path = final_path.with_suffix(".arrow")
+    feather.write_feather(table, arrow_path, compression="uncompressed")
+    print(f"Saved memory-mappable copy: {arrow_path}")
+
+def _current_matchups_path() -> Path:
+    """
+    The uncompressed Arrow IPC copy finalize_and_save writes next to
+    matchups.parquet when it is at least as new as the parquet, otherwise
+    the parquet itself.
+    """
+    parquet_path = config.MODELING_DIR / "matchups.parquet"
+    arrow_path = parquet_path.with_suffix(".arrow")
+    if arrow_path.exists() and (
+        not parquet_path.exists()
+        or arrow_path.stat().st_mtime >= parquet_path.stat().st_mtime
+    ):
+        return arrow_path
+    return parquet_path
+
+def read_matchups(
+    columns: Optional[List[str]] = None, path: Optional[Path] = None
+) -> pd.DataFrame:
+    """
+    Read the modeling dataset (optionally just `columns`), preferring the
+    Arrow copy: it is memory-mapped rather than decompressed, so repeat runs
+    read straight from the OS page cache. Pass `path` (from
+    _current_matchups_path) to read a file the caller already resolved.
+    """
+    if path is None:
+        path = _current_matchups_path()
+    if path.suffix == ".arrow":
+        table = feather.read_table(path, columns=columns, memory_map=True)
+        return table.to_pandas(self_destruct=True)
+    return pd.read_parquet(path, columns=columns)
+
+def iter_matchup_batches(
+    columns: List[str], batch_size: int = 1_000_000
+) -> Iterator[pa.RecordBatch]:
+    """
+    Stream `columns` of the modeling dataset as Arrow record batches of at
+    most `batch_size` rows, for aggregations that never need the whole
+    dataset in memory.
+    """
+    path = _current_matchups_path()
+    dataset = ds.dataset(path, format="feather" if path.suffix == ".arrow" else "parquet")
+    yield from dataset.to_batches(columns=columns, batch_size=batch_size)
+
 def main():
     config.ensure_directories()
 
@@ -208,9 +313,6 @@ def main():
     print("Adding hit label...")
     df = add_hit_label(df)
 
-    print("Adding hit label...")
-    df = add_hit_label(df)
-
     print("Adding multiclass outcome label...")
     df = add_outcome_label(df)
 
@@ -1,7 +1,15 @@
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 from . import config
 
@@ -10,6 +18,15 @@ CLEAN_PATTERN = "statcast_clean_*.parquet"
 PARTIALS_NAME = "pitcher_partials_{:04d}_{:02d}.parquet"
 PROFILES_NAME = "pitcher_profiles.parquet"
 
+# statcast_clean_YYYY_MM
+_STEM_RE = re.compile(r"statcast_clean_(\d{4})_(\d{2})$")
+
+# Columns compute_monthly_pitcher_aggregates reads from a cleaned month
+AGG_COLS = ["date", "pitcher", "pitch_type", "release_vel", "spin_rate", "plate_x", "plate_z"]
+
+# Per-pitch-type averages stored in the partials, combined pitch-count-weighted
+PROFILE_METRICS = ["avg_release_vel", "avg_spin_rate", "avg_plate_x", "avg_plate_z"]
+
 
 def list_clean_month_files() -> List[Path]:
     """
@@ -18,12 +35,19 @@ def list_clean_month_files() -> List[Path]:
     return sorted(config.PROCESSED_DIR.glob(CLEAN_PATTERN))
 
 
+def _parse_stem(path: Path) -> Optional[Tuple[int, int]]:
+    """(year, month) from a cleaned month filename, or None if it doesn't match."""
+    m = _STEM_RE.match(path.stem)
+    return (int(m[1]), int(m[2])) if m else None
+
+
 def compute_monthly_pitcher_aggregates(clean_path: Path) -> pd.DataFrame:
-    df = pd.read_parquet(clean_path)
+    # Only decode the column chunks the aggregation needs
+    df = pd.read_parquet(clean_path, columns=AGG_COLS, engine="pyarrow")
 
-    stem_parts = clean_path.stem.split("_")
-    if len(stem_parts) >= 4:
-        year, month = int(stem_parts[2]), int(stem_parts[3])
+    year_month = _parse_stem(clean_path)
+    if year_month is not None:
+        year, month = year_month
     else:
         first_date = pd.to_datetime(df["date"]).iloc[0]
         year, month = int(first_date.year), int(first_date.month)
@@ -35,10 +59,11 @@ def compute_monthly_pitcher_aggregates(clean_path: Path) -> pd.DataFrame:
     df["pitcher"] = df["pitcher"].astype("int32")
     df["pitch_type"] = df["pitch_type"].astype(str)
 
-    # FIX 2 — enforce clean numeric types before aggregation
+    # FIX 2 — enforce clean numeric types before aggregation; cleaned months
+    # are already float32, so only older or hand-made files pay for a cast
     numeric_cols = ["release_vel", "spin_rate", "plate_x", "plate_z"]
     for col in numeric_cols:
-        if col in df.columns:
+        if df[col].dtype != np.float32:
             df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
 
     # Now grouping is safe
@@ -53,7 +78,6 @@ def compute_monthly_pitcher_aggregates(clean_path: Path) -> pd.DataFrame:
         )
     )
 
-    grouped["pitch_type"] = grouped["pitch_type"].astype(str)
     grouped["year"] = year
     grouped["month"] = month
 
@@ -77,7 +101,17 @@ def save_partial_pitcher_aggregates(df: pd.DataFrame, year: int, month: int) ->
     """
     output_path = config.PITCHER_PROFILES_DIR / PARTIALS_NAME.format(year, month)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(output_path, index=False)
+    # Dictionary-encode the low-cardinality pitch_type; a month fits in one
+    # row group, whose statistics let later scans skip it
+    pq.write_table(
+        pa.Table.from_pandas(df, preserve_index=False),
+        output_path,
+        compression="zstd",
+        compression_level=3,
+        use_dictionary=["pitch_type"],
+        row_group_size=65536,
+        write_statistics=True,
+    )
     print(f"Saved partials for {year}-{month:02d} to {output_path} ({len(df):,} rows)")
 
 
@@ -88,28 +122,44 @@ def build_all_monthly_partials() -> None:
       - save_partial_pitcher_aggregates
       - skip if partial already exists
     """
+    pending = []
     for clean_path in list_clean_month_files():
         print(f"Building partials for {clean_path.name}...")
 
-        stem_parts = clean_path.stem.split("_")
-        if len(stem_parts) < 4:
+        year_month = _parse_stem(clean_path)
+        if year_month is None:
             print(f"  Skipping malformed filename: {clean_path.name}")
             continue
 
-        # statcast_clean_YYYY_MM → ["statcast", "clean", "YYYY", "MM"]
-        year, month = int(stem_parts[2]), int(stem_parts[3])
+        year, month = year_month
 
         partials_path = config.PITCHER_PROFILES_DIR / PARTIALS_NAME.format(year, month)
         if partials_path.exists():
             print(f"  Skipping existing partials: {partials_path.name}")
             continue
 
-        monthly_df = compute_monthly_pitcher_aggregates(clean_path)
-        if monthly_df.empty:
-            print(f"  No pitcher data for {year}-{month:02d}, skipping save.")
-            continue
+        pending.append((clean_path, year, month))
+
+    if not pending:
+        return
+
+    # Months are independent and CPU-bound (parquet decode + groupby), so
+    # aggregate them in worker processes; saving stays in this process.
+    # spawn rather than fork: forking a process with Arrow's thread pools
+    # running is not safe.
+    workers = min(len(pending), os.cpu_count() or 1)
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        monthly_dfs = executor.map(
+            compute_monthly_pitcher_aggregates, [path for path, _, _ in pending]
+        )
+        for (_, year, month), monthly_df in zip(pending, monthly_dfs):
+            if monthly_df.empty:
+                print(f"  No pitcher data for {year}-{month:02d}, skipping save.")
+                continue
 
-        save_partial_pitcher_aggregates(monthly_df, year, month)
+            save_partial_pitcher_aggregates(monthly_df, year, month)
 
 
 def list_partials_files() -> List[Path]:
@@ -119,9 +169,10 @@ def list_partials_files() -> List[Path]:
     return sorted(config.PITCHER_PROFILES_DIR.glob("pitcher_partials_*.parquet"))
 
 
-def load_all_partials() -> pd.DataFrame:
+def load_all_partials() -> pa.Table:
     """
-    Load all monthly partials and concatenate into one DataFrame.
+    Scan all monthly partials as a single Arrow table (multi-threaded, no
+    per-file pandas frames), keeping only the columns the profiles use.
     """
     partial_paths = list_partials_files()
     if not partial_paths:
@@ -129,13 +180,13 @@ def load_all_partials() -> pd.DataFrame:
             "No pitcher partial files found. Run build_all_monthly_partials() first."
         )
 
-    dfs = [pd.read_parquet(p) for p in partial_paths]
-    combined = pd.concat(dfs, ignore_index=True)
-    print(f"Loaded {len(partial_paths)} partial files with {len(combined):,} rows")
+    columns = ["pitcher", "pitch_type", "pitch_count"] + PROFILE_METRICS
+    combined = ds.dataset(partial_paths, format="parquet").to_table(columns=columns)
+    print(f"Loaded {len(partial_paths)} partial files with {combined.num_rows:,} rows")
     return combined
 
 
-def aggregate_pitcher_profiles(partials: pd.DataFrame) -> pd.DataFrame:
+def aggregate_pitcher_profiles(partials: pa.Table) -> pd.DataFrame:
     """
     Aggregate monthly pitcher partials into a single pitcher profile table.
     For each pitcher, compute:
@@ -143,49 +194,61 @@ def aggregate_pitcher_profiles(partials: pd.DataFrame) -> pd.DataFrame:
       - pitch_mix (pitch_type percentages pivoted into columns)
       - overall average release_vel, spin_rate, plate_x, plate_z
 
+    Weighted averages are a multiply into one preallocated buffer plus a
+    segmented sum over the pitcher-sorted rows; the pitch mix is a bincount
+    into a dense pitchers x pitch types matrix.
     Return one row per pitcher with numeric features.
     """
-    if partials.empty:
+    if partials.num_rows == 0:
         return pd.DataFrame()
 
-    # Total pitches per pitcher.
-    pitcher_totals = (
-        partials.groupby("pitcher", as_index=False)["pitch_count"]
-        .sum()
-        .rename(columns={"pitch_count": "total_pitches"})
-    )
-
-    # Pitch-type totals for pitch mix.
-    type_totals = partials.groupby(["pitcher", "pitch_type"], as_index=False)["pitch_count"].sum()
+    # Sort rows by pitcher once and find where each pitcher's run starts.
+    pitchers = partials["pitcher"].to_numpy()
+    order = np.argsort(pitchers, kind="stable")
+    keys = pitchers[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
 
-    mix = type_totals.pivot(index="pitcher", columns="pitch_type", values="pitch_count").fillna(0)
+    # Total pitches per pitcher.
+    counts = partials["pitch_count"].to_numpy()[order]
+    total_pitches = np.add.reduceat(counts, starts)
+
+    # Weighted averages of velocity/spin/location across pitch types. Each
+    # metric is gathered into sorted order and multiplied straight into its
+    # column of one preallocated (rows x metrics) buffer, so no intermediate
+    # metrics matrix is built; missing metrics count as 0, as in a pandas
+    # groupby sum.
+    weighted = np.empty((len(order), len(PROFILE_METRICS)), dtype="float64")
+    for i, col in enumerate(PROFILE_METRICS):
+        # Partials are written as float32, so this cast is normally a no-op
+        values = partials[col].to_numpy(zero_copy_only=False).astype("float32", copy=False)
+        np.multiply(values[order], counts, out=weighted[:, i])
+    np.nan_to_num(weighted, copy=False)
+    averages = np.add.reduceat(weighted, starts, axis=0) / total_pitches[:, None]
+
+    profiles = pd.DataFrame({"pitcher": keys[starts], "total_pitches": total_pitches})
+    for i, col in enumerate(PROFILE_METRICS):
+        profiles[col] = averages[:, i]
+
+    # Pitch mix: accumulate pitch counts straight into a dense
+    # (pitchers x pitch types) matrix. Pitcher codes follow the sorted runs
+    # above; pitch-type codes come from a Categorical, whose sorted
+    # categories give the column order.
+    pitcher_codes = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(keys)]))
+    types = pd.Categorical(partials["pitch_type"].to_numpy(zero_copy_only=False)[order])
+    n_types = len(types.categories)
+    valid = types.codes >= 0
+    mix = np.bincount(
+        pitcher_codes[valid] * n_types + types.codes[valid],
+        weights=counts[valid],
+        minlength=len(starts) * n_types,
+    ).reshape(len(starts), n_types)
 
     # Avoid division by zero if a row somehow sums to 0.
-    row_sums = mix.sum(axis=1).replace(0, 1)
-    mix_pct = mix.div(row_sums, axis=0).add_suffix("_pct")
-    mix_pct.reset_index(inplace=True)
-
-    # Weighted averages of velocity/spin/location across pitch types.
-    weighted = partials.copy()
-    metrics = ["avg_release_vel", "avg_spin_rate", "avg_plate_x", "avg_plate_z"]
-
-    # Ensure metric columns are float for safe arithmetic.
-    for col in metrics:
-        weighted[col] = weighted[col].astype("float32")
-
-    for col in metrics:
-        weighted[col] = weighted[col] * weighted["pitch_count"]
-
-    weighted_sum = weighted.groupby("pitcher", as_index=False)[metrics + ["pitch_count"]].sum()
-    for col in metrics:
-        weighted_sum[col] = weighted_sum[col] / weighted_sum["pitch_count"]
-    weighted_sum = weighted_sum.drop(columns=["pitch_count"])
-
-    # Merge everything into a single DataFrame keyed by 'pitcher'.
-    profiles = pitcher_totals.merge(weighted_sum, on="pitcher", how="left")
-    profiles = profiles.merge(mix_pct, on="pitcher", how="left")
+    row_sums = mix.sum(axis=1, keepdims=True)
+    mix /= np.where(row_sums == 0, 1, row_sums)
 
-    return profiles
+    mix_pct = pd.DataFrame(mix, columns=[f"{t}_pct" for t in types.categories])
+    return pd.concat([profiles, mix_pct], axis=1)
 
 
 def save_pitcher_profiles(df: pd.DataFrame) -> None:
@@ -10,6 +10,8 @@ from pybaseball import playerid_reverse_lookup
 
 from . import config
 
+PLAYERID_CACHE_NAME = "playerid_cache.parquet"
+
 
 def load_matchups() -> pd.DataFrame:
     """
@@ -25,27 +27,17 @@ def load_matchups() -> pd.DataFrame:
     return df
 
 
-def extract_unique_player_ids(df: pd.DataFrame):
+def extract_unique_player_ids(
+    df: pd.DataFrame,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Extract unique batter and pitcher IDs from the matchups dataset.
-    Returns: (batter_ids, pitcher_ids, all_ids)
+    Returns: (batter_ids, pitcher_ids, all_ids) as sorted int64 arrays
     """
-    batter_ids = (
-        df["batter"]
-        .dropna()
-        .astype("int64")
-        .unique()
-        .tolist()
-    )
-    pitcher_ids = (
-        df["pitcher"]
-        .dropna()
-        .astype("int64")
-        .unique()
-        .tolist()
-    )
+    batter_ids = np.unique(df["batter"].dropna().to_numpy(dtype="int64"))
+    pitcher_ids = np.unique(df["pitcher"].dropna().to_numpy(dtype="int64"))
 
-    all_ids = sorted(set(batter_ids) | set(pitcher_ids))
+    all_ids = np.union1d(batter_ids, pitcher_ids)
 
     print(f"Unique batters:  {len(batter_ids):,}")
     print(f"Unique pitchers: {len(pitcher_ids):,}")
@@ -54,22 +46,42 @@ def extract_unique_player_ids(df: pd.DataFrame):
     return batter_ids, pitcher_ids, all_ids
 
 
-def lookup_player_metadata(all_ids: list[int]) -> pd.DataFrame:
+def lookup_player_metadata(all_ids: np.ndarray) -> pd.DataFrame:
     """
     Use pybaseball.playerid_reverse_lookup to fetch names & metadata
     for MLBAM IDs.
+
+    Lookups are cached by MLBAM ID in data/playerid_cache.parquet, so only IDs
+    not seen on an earlier run go to pybaseball. IDs the lookup doesn't know
+    aren't cached and are retried next run.
     """
-    if not all_ids:
+    if len(all_ids) == 0:
         raise ValueError("No player IDs provided for lookup.")
 
-    print("Looking up player metadata via pybaseball...")
-    # key_type="mlbam" because Statcast uses MLBAM IDs
-    meta = playerid_reverse_lookup(all_ids, key_type="mlbam")
+    all_ids = np.asarray(all_ids, dtype="int64")
+    cache_path = config.DATA_DIR / PLAYERID_CACHE_NAME
+    cache = pd.read_parquet(cache_path) if cache_path.exists() else None
+
+    cached_ids = cache["player_id"].to_numpy() if cache is not None else np.empty(0, dtype="int64")
+    missing = np.setdiff1d(all_ids, cached_ids)
+
+    if len(missing):
+        print(f"Looking up {len(missing):,} uncached players via pybaseball...")
+        # key_type="mlbam" because Statcast uses MLBAM IDs
+        fetched = playerid_reverse_lookup(list(map(int, missing)), key_type="mlbam")
+
+        # Typical columns include:
+        # key_mlbam, name_first, name_last, bats, throws, mlb_played_first, mlb_played_last, ...
+        fetched = fetched.rename(columns={"key_mlbam": "player_id"})
+        fetched["player_id"] = fetched["player_id"].astype("int64")
 
-    # Typical columns include:
-    # key_mlbam, name_first, name_last, bats, throws, mlb_played_first, mlb_played_last, ...
-    meta = meta.rename(columns={"key_mlbam": "player_id"})
-    meta["player_id"] = meta["player_id"].astype("int64")
+        cache = fetched if cache is None else pd.concat([cache, fetched], ignore_index=True)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache.to_parquet(cache_path, index=False)
+    else:
+        print(f"All {len(all_ids):,} players found in {cache_path.name}")
+
+    meta = cache[cache["player_id"].isin(all_ids)].copy()
 
     # Build full name
     meta["player_name"] = (
@@ -80,9 +92,9 @@ def lookup_player_metadata(all_ids: list[int]) -> pd.DataFrame:
 
 
 def build_player_index(
-    batter_ids: list[int],
-    pitcher_ids: list[int],
-    all_ids: list[int],
+    batter_ids: np.ndarray,
+    pitcher_ids: np.ndarray,
+    all_ids: np.ndarray,
     meta: pd.DataFrame,
 ) -> pd.DataFrame:
     """
@@ -97,34 +109,32 @@ def build_player_index(
       - bats (if available)
       - throws (if available)
     """
-    index_df = pd.DataFrame({"player_id": all_ids})
-    index_df["player_id"] = index_df["player_id"].astype("int64")
+    all_ids = np.asarray(all_ids, dtype="int64")
+
+    # Basic flags; every array holds unique IDs, so np.isin can take its
+    # sort-based path instead of hashing each ID
+    index_df = pd.DataFrame({
+        "player_id": all_ids,
+        "is_batter": np.isin(all_ids, batter_ids, assume_unique=True),
+        "is_pitcher": np.isin(all_ids, pitcher_ids, assume_unique=True),
+    })
 
     # Merge metadata (left join so all IDs are preserved)
     index_df = index_df.merge(meta, on="player_id", how="left")
 
-    # Basic flags
-    batter_set = set(batter_ids)
-    pitcher_set = set(pitcher_ids)
-
-    index_df["is_batter"] = index_df["player_id"].isin(batter_set)
-    index_df["is_pitcher"] = index_df["player_id"].isin(pitcher_set)
-
-    def role_row(row) -> str:
-        if row["is_batter"] and row["is_pitcher"]:
-            return "two-way"
-        if row["is_batter"]:
-            return "batter"
-        if row["is_pitcher"]:
-            return "pitcher"
-        return "unknown"
-
-    index_df["role"] = index_df.apply(role_row, axis=1)
+    is_batter = index_df["is_batter"].to_numpy()
+    is_pitcher = index_df["is_pitcher"].to_numpy()
+    index_df["role"] = np.select(
+        [is_batter & is_pitcher, is_batter, is_pitcher],
+        ["two-way", "batter", "pitcher"],
+        default="unknown",
+    )
 
     # Ensure we always have some name string
     # Fall back to "Unknown <id>" if name is missing
-    index_df["player_name"] = index_df["player_name"].fillna(
-        index_df["player_id"].apply(lambda x: f"Unknown {x}")
+    missing_name = index_df["player_name"].isna()
+    index_df.loc[missing_name, "player_name"] = (
+        "Unknown " + index_df.loc[missing_name, "player_id"].astype(str)
     )
 
     # Keep only useful columns
@@ -159,9 +169,9 @@ def main():
     print("Building player index table...")
     player_index = build_player_index(batter_ids, pitcher_ids, all_ids, meta)
 
-    out_path = config.DATA_DIR / "player_index.csv"
+    out_path = config.DATA_DIR / "player_index.parquet"
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    player_index.to_csv(out_path, index=False)
+    player_index.to_parquet(out_path, index=False, compression="zstd")
     print(f"Saved player index to {out_path} ({len(player_index):,} players)")
 
 
@@ -2,6 +2,8 @@ from pathlib import Path
 from typing import Iterable
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from . import config
 
 RAW_PATTERN = "statcast_*.parquet"
@@ -80,30 +82,44 @@ REQUIRED_FOR_VALID = [
 def list_raw_month_files() -> list[Path]:
     return sorted(config.RAW_DIR.glob(RAW_PATTERN))
 
-def load_raw_month(path: Path):
-    return pd.read_parquet(path)
-
-def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.rename(columns=COLUMN_RENAMES)
-    keep = [c for c in COLUMNS_TO_KEEP if c in df.columns]
-    df = df.loc[:, keep].copy()
+def load_raw_month(path: Path) -> pa.Table:
+    """Read only the raw columns that survive normalize_columns."""
+    raw_names = {new: old for old, new in COLUMN_RENAMES.items()}
+    available = set(pq.read_schema(path).names)
+    columns = [raw_names.get(c, c) for c in COLUMNS_TO_KEEP if raw_names.get(c, c) in available]
+    return pq.read_table(path, columns=columns)
+
+def normalize_columns(table: pa.Table) -> pa.Table:
+    table = table.rename_columns([COLUMN_RENAMES.get(c, c) for c in table.column_names])
+    keep = [c for c in COLUMNS_TO_KEEP if c in table.column_names]
+    return table.select(keep)
+
+def _downcast_type(arrow_type: pa.DataType) -> pa.DataType:
+    if pa.types.is_floating(arrow_type):
+        return pa.float32()
+    if pa.types.is_integer(arrow_type):
+        return pa.int32()
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type) or pa.types.is_null(arrow_type):
+        return pa.dictionary(pa.int32(), pa.string())
+    return arrow_type
+
+def downcast_dtypes(table: pa.Table) -> pd.DataFrame:
+    """
+    Downcast in a single Arrow cast, then convert to pandas once:
+    floats -> float32, ints -> nullable Int32, strings -> category.
+    """
+    target = pa.schema([field.with_type(_downcast_type(field.type)) for field in table.schema])
+    df = table.cast(target).to_pandas(
+        types_mapper={pa.int32(): pd.Int32Dtype()}.get,
+        ignore_metadata=True,
+    )
+    # Arrow dictionaries keep first-seen order; sort them as astype("category") would
+    for col in df.select_dtypes(include="category").columns:
+        df[col] = df[col].cat.reorder_categories(df[col].cat.categories.sort_values())
     if "date" in df.columns:
         df["date"] = pd.to_datetime(df["date"])
     return df
 
-def downcast_dtypes(df: pd.DataFrame) -> pd.DataFrame:
-    float_cols = df.select_dtypes(include=["float", "Float32", "Float64"]).columns
-    int_cols = df.select_dtypes(include=["int", "Int64", "int64"]).columns
-    obj_cols = df.select_dtypes(include=["object"]).columns
-    
-    for col in float_cols:
-        df[col] = df[col].astype("float32")
-    for col in int_cols:
-        df[col] = df[col].astype("Int32")
-    for col in obj_cols:
-        df[col] = df[col].astype("category")
-    return df
-
 def filter_valid_pitches(df: pd.DataFrame) -> pd.DataFrame:
     return df.dropna(subset=[c for c in REQUIRED_FOR_VALID if c in df.columns]).reset_index(drop=True)
 
@@ -129,14 +145,14 @@ def clean_all_months() -> None:
             print(f"  Skipping existing clean file: {output_path.name}")
             continue
 
-        # Load raw
-        df = load_raw_month(raw_path)
+        # Load raw (as Arrow, only the kept columns)
+        table = load_raw_month(raw_path)
 
         # Normalize
-        df = normalize_columns(df)
+        table = normalize_columns(table)
 
-        # Downcast
-        df = downcast_dtypes(df)
+        # Downcast (single Arrow cast, then one conversion to pandas)
+        df = downcast_dtypes(table)
 
         # Filter invalid pitches
         df = filter_valid_pitches(df)
@@ -1,5 +1,5 @@
-from calendar import monthrange
-from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from typing import List, Tuple
 from pybaseball import statcast
 import pandas as pd
@@ -7,23 +7,21 @@ import time
 
 from . import config
 
+# Months fetched concurrently; kept small to stay polite to Baseball Savant
+MAX_FETCH_WORKERS = 4
+
 def month_ranges(start: date, end: date) -> List[Tuple[date, date]]:
     if end < start:
         raise ValueError("end date must be on or after start date")
 
-    ranges: List[Tuple[date, date]] = []
-    current_start = start
-
-    while current_start <= end:
-        last_day = monthrange(current_start.year, current_start.month)[1]
-        current_end = date(current_start.year, current_start.month, last_day)
-        if current_end > end:
-            current_end = end
-
-        ranges.append((current_start, current_end))
-        current_start = current_end + timedelta(days=1)
+    # One period per calendar month touched; clamp the first and last to
+    # the requested window
+    months = pd.period_range(start, end, freq="M")
+    starts = months.start_time.date
+    ends = months.end_time.date
+    starts[0], ends[-1] = start, end
 
-    return ranges
+    return list(zip(starts, ends))
 
 
 def fetch_statcast_for_range(start: date, end: date):
@@ -47,8 +45,15 @@ def save_raw_month(df, year: int, month: int) -> None:
     print(f"Saved {output_path} ({len(df):,} rows)")
 
 
-def collect_all_months() -> None:
-    for start_dt, end_dt in month_ranges(config.STATCAST_START, config.STATCAST_END):
+def collect_ranges(ranges: List[Tuple[date, date]]) -> None:
+    """
+    Fetch and save every month in ``ranges`` that isn't on disk yet.
+
+    Fetches are network-bound and independent, so they run on a small
+    thread pool; saving stays on this thread so parquet writes are serial.
+    """
+    pending = []
+    for start_dt, end_dt in ranges:
         year, month = start_dt.year, start_dt.month
         output_path = config.RAW_DIR / f"statcast_{year:04d}_{month:02d}.parquet"
 
@@ -56,35 +61,29 @@ def collect_all_months() -> None:
             print(f"Skipping {output_path.name} (already exists)")
             continue
 
-        print(f"Fetching {year}-{month:02d} ({start_dt} to {end_dt})...")
-        df = fetch_statcast_for_range(start_dt, end_dt)
+        pending.append((start_dt, end_dt))
 
-        if df.empty:
-            print(f"No data for {year}-{month:02d}, skipping save.")
-            continue
+    def fetch(span: Tuple[date, date]) -> pd.DataFrame:
+        start_dt, end_dt = span
+        print(f"Fetching {start_dt.year}-{start_dt.month:02d} ({start_dt} to {end_dt})...")
+        return fetch_statcast_for_range(start_dt, end_dt)
+
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        for (start_dt, _), df in zip(pending, executor.map(fetch, pending)):
+            year, month = start_dt.year, start_dt.month
+            if df.empty:
+                print(f"No data for {year}-{month:02d}, skipping save.")
+                continue
 
-        save_raw_month(df, year, month)
+            save_raw_month(df, year, month)
+
+def collect_all_months() -> None:
+    collect_ranges(month_ranges(config.STATCAST_START, config.STATCAST_END))
 
 def collect_test_week() -> None:
     test_start = date(2023, 4, 1)
     test_end = date(2023, 4, 7)
-
-    for start_dt, end_dt in month_ranges(test_start, test_end):
-        year, month = start_dt.year, start_dt.month
-        output_path = config.RAW_DIR / f"statcast_{year:04d}_{month:02d}.parquet"
-
-        if output_path.exists():
-            print(f"Skipping {output_path.name} (already exists)")
-            continue
-
-        print(f"Fetching {year}-{month:02d} ({start_dt} to {end_dt})...")
-        df = fetch_statcast_for_range(start_dt, end_dt)
-
-        if df.empty:
-            print(f"No data for {year}-{month:02d}, skipping save.")
-            continue
-
-        save_raw_month(df, year, month)
+    collect_ranges(month_ranges(test_start, test_end))
 
 def main() -> None:
     print("Starting data collection...")
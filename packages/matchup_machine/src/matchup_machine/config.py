@@ -23,6 +23,10 @@ if _artifacts_dir:
     MODELING_DIR = _a
     PITCHER_PROFILES_DIR = _a
 
+# XGBoost training device: "cuda" trains on a GPU (needs a CUDA build of
+# xgboost and a visible GPU), "cpu" uses the CPU histogram method.
+XGB_DEVICE = os.getenv("MM_XGB_DEVICE", "cpu")
+
 # Date ranges
 STATCAST_START = date(2023, 4, 1)
 STATCAST_END   = date(2026, 4, 5)  # updated 2026-04-06
@@ -43,6 +43,7 @@ def cmd_hitter(args) -> None:
         min_pas=200,        # tweak if you want more/less strict
         recent_only=True,
         recent_start_year=2024,
+        use_cache=True,     # model and matchups come from load_artifacts
     )
 
     # 3) Compute EV per PA
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import re
+import weakref
 from pathlib import Path
 from typing import Dict, Tuple, Optional
 
@@ -12,8 +13,8 @@ import numpy as np
 import pandas as pd
 
 from . import config
-from .build_dataset import OUTCOME_LABELS
-from .train_hit_model import fill_missing_values  # reuse your imputer
+from .build_dataset import OUTCOME_LABELS, _current_matchups_path, read_matchups
+from .train_outcome_model import load_xgb
 
 
 def load_artifacts() -> Tuple[
@@ -46,27 +47,42 @@ def load_artifacts() -> Tuple[
     from matchup_machine import config as config  # noqa: F811
 
     model_path = config.MODELS_DIR / "xgb_outcome_model.joblib"
+    native_model_path = model_path.with_suffix(".ubj")
     features_path = config.MODELS_DIR / "outcome_feature_cols.json"
     pitcher_profiles_path = config.PITCHER_PROFILES_DIR / "pitcher_profiles.parquet"
     batter_profiles_path = config.DATA_DIR / "batter_profiles.parquet"
-    player_index_path = config.DATA_DIR / "player_index.csv"
+    player_index_path = config.DATA_DIR / "player_index.parquet"
+    # Artifact dirs built before the switch to parquet only have the CSV
+    if not player_index_path.exists():
+        player_index_path = config.DATA_DIR / "player_index.csv"
     pa_proj_path = config.DATA_DIR / "batter_pa_projection_2026.parquet"
     matchups_path = config.MODELING_DIR / "matchups.parquet"
+    matchups_arrow_path = matchups_path.with_suffix(".arrow")
 
-    if not model_path.exists():
+    if not model_path.exists() and not native_model_path.exists():
         raise FileNotFoundError(f"Model not found at {model_path}")
     if not features_path.exists():
         raise FileNotFoundError(f"Feature cols JSON not found at {features_path}")
     if not pitcher_profiles_path.exists():
         raise FileNotFoundError(f"Pitcher profiles not found at {pitcher_profiles_path}")
     if not player_index_path.exists():
-        raise FileNotFoundError(f"Player index CSV not found at {player_index_path}")
+        raise FileNotFoundError(f"Player index not found at {player_index_path}")
     if not pa_proj_path.exists():
         raise FileNotFoundError(f"PA projection parquet not found at {pa_proj_path}")
-    if not matchups_path.exists():
+    if not matchups_path.exists() and not matchups_arrow_path.exists():
         raise FileNotFoundError(f"matchups.parquet not found at {matchups_path}")
 
-    model = joblib.load(model_path)
+    # The native copy save_multiclass_model writes loads faster than the
+    # pickle; only trust it if it isn't older than the .joblib
+    if native_model_path.exists() and (
+        not model_path.exists()
+        or native_model_path.stat().st_mtime >= model_path.stat().st_mtime
+    ):
+        model_path = native_model_path
+        model = load_xgb(model_path)
+    else:
+        model = joblib.load(model_path)
+    _remember_artifact(model, model_path)
 
     with open(features_path, "r") as f:
         feature_cols = json.load(f)
@@ -78,9 +94,14 @@ def load_artifacts() -> Tuple[
     else:
         batter_profiles = None
 
-    player_index = pd.read_csv(player_index_path)
+    if player_index_path.suffix == ".parquet":
+        player_index = pd.read_parquet(player_index_path)
+    else:
+        player_index = pd.read_csv(player_index_path)
     pa_proj = pd.read_parquet(pa_proj_path)
-    matchups = pd.read_parquet(matchups_path)
+    matchups_file = _current_matchups_path()
+    matchups = read_matchups(path=matchups_file)
+    _remember_artifact(matchups, matchups_file)
 
     return model, feature_cols, pitcher_profiles, batter_profiles, player_index, pa_proj, matchups
 
@@ -94,6 +115,29 @@ def _normalize(s: str) -> str:
 _NAME_SUFFIXES = re.compile(r"\s+(jr\.?|sr\.?|ii|iii|iv)$", re.IGNORECASE)
 
 
+# id(player_index) -> (weakref to that frame, normalized names, known-name mask)
+_player_name_cache: Dict[int, Tuple[weakref.ref, np.ndarray, np.ndarray]] = {}
+
+
+def _normalized_player_names(player_index: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Normalized player names as a numpy string array, plus a mask of rows that
+    aren't "Unknown ######" placeholders. Built once per player_index frame.
+    """
+    key = id(player_index)
+    cached = _player_name_cache.get(key)
+    if cached is not None and cached[0]() is player_index:
+        return cached[1], cached[2]
+
+    raw = player_index["player_name"].astype(str)
+    names = np.array([_normalize(n) for n in raw], dtype=str)
+    known = ~raw.str.startswith("Unknown").to_numpy()
+
+    _player_name_cache[key] = (weakref.ref(player_index), names, known)
+    weakref.finalize(player_index, _player_name_cache.pop, key, None)
+    return names, known
+
+
 def find_player_id(player_index: pd.DataFrame, name_query: str) -> int:
     """
     Fuzzy lookup: find a player ID whose name contains the query (case-insensitive).
@@ -101,18 +145,19 @@ def find_player_id(player_index: pd.DataFrame, name_query: str) -> int:
     - Strips common suffixes (Jr, Sr, II) that may be absent from the index.
     - Ignores "Unknown ######" rows.
     """
-    known = player_index[~player_index["player_name"].astype(str).str.startswith("Unknown")].copy()
-    known["_norm"] = known["player_name"].astype(str).apply(_normalize)
+    names, known = _normalized_player_names(player_index)
 
     # Try progressively looser queries: full name, then without suffix
     normalized_query = _normalize(name_query)
     stripped_query = _NAME_SUFFIXES.sub("", normalized_query).strip()
 
     for query in dict.fromkeys([normalized_query, stripped_query]):  # dedup, preserve order
-        matches = known[known["_norm"].str.contains(re.escape(query), na=False)]
-        if not matches.empty:
+        mask = known & (np.char.find(names, query) >= 0)
+        if mask.any():
             break
 
+    matches = player_index[mask]
+
     if matches.empty:
         raise ValueError(f"No player found matching {name_query!r}")
 
@@ -144,6 +189,177 @@ def lookup_projected_pa(
     return int(row["projected_pa"].iloc[0])
 
 
+# id(matchups) -> (weakref to that frame, row order sorted by batter,
+# {batter_id: (start, end)} into that order)
+_batter_index_cache: Dict[int, Tuple[weakref.ref, np.ndarray, Dict[int, Tuple[int, int]]]] = {}
+
+
+def _batter_index(matchups: pd.DataFrame) -> Tuple[np.ndarray, Dict[int, Tuple[int, int]]]:
+    """
+    Group a matchups frame's rows by batter, once per frame.
+
+    A stable argsort keeps each batter's rows in their original order, so a
+    batter's rows are the contiguous slice order[start:end].
+    """
+    key = id(matchups)
+    cached = _batter_index_cache.get(key)
+    if cached is not None and cached[0]() is matchups:
+        return cached[1], cached[2]
+
+    batters = matchups["batter"].to_numpy(dtype="int64", na_value=-1)
+    order = np.argsort(batters, kind="stable")
+    ids, starts, counts = np.unique(batters[order], return_index=True, return_counts=True)
+    spans = {
+        int(bid): (int(start), int(start + count))
+        for bid, start, count in zip(ids, starts, counts)
+    }
+
+    _batter_index_cache[key] = (weakref.ref(matchups), order, spans)
+    weakref.finalize(matchups, _batter_index_cache.pop, key, None)
+    return order, spans
+
+
+def select_batter_rows(matchups: pd.DataFrame, batter_id: int) -> pd.DataFrame:
+    """Return ``matchups`` rows for one batter without scanning the whole frame."""
+    order, spans = _batter_index(matchups)
+    start, end = spans.get(int(batter_id), (0, 0))
+    return matchups.iloc[order[start:end]]
+
+
+def _predict_proba(model, X: pd.DataFrame) -> np.ndarray:
+    """
+    Class probabilities for the rows of X, shape (num_samples, num_classes).
+
+    XGBoost models are scored straight on their booster with a float32 array,
+    skipping the sklearn wrapper's DMatrix build; anything else goes through
+    predict_proba. X must already be in training column order.
+    """
+    if hasattr(model, "get_booster"):
+        X_np = np.ascontiguousarray(X.to_numpy(dtype=np.float32, na_value=np.nan))
+        return model.get_booster().inplace_predict(X_np)
+    return model.predict_proba(X)
+
+
+def _batter_probs_cache_path() -> Path:
+    return config.MODELS_DIR / "batter_avg_probs.parquet"
+
+
+# id(obj) -> (weakref to obj, file it was loaded from, that file's mtime at
+# load time), for the model and matchups load_artifacts read from disk
+_loaded_artifacts: Dict[int, Tuple[weakref.ref, str, int]] = {}
+
+
+def _remember_artifact(obj, path: Path) -> None:
+    key = id(obj)
+    _loaded_artifacts[key] = (weakref.ref(obj), path.name, path.stat().st_mtime_ns)
+    weakref.finalize(obj, _loaded_artifacts.pop, key, None)
+
+
+def _artifact(obj) -> Optional[Tuple[str, int]]:
+    """
+    (file name, mtime_ns) of the file load_artifacts loaded obj from; None
+    for anything else, whose derived outputs can't be keyed on disk.
+    """
+    entry = _loaded_artifacts.get(id(obj))
+    if entry is None or entry[0]() is not obj:
+        return None
+    return entry[1], entry[2]
+
+
+def compute_all_batter_avg_probs(
+    model,
+    feature_cols: list[str],
+    matchups: pd.DataFrame,
+    recent_start_year: Optional[int] = 2024,
+) -> pd.DataFrame:
+    """
+    Average outcome probabilities for every batter in one model pass.
+
+    Rows are filtered as in estimate_batter_outcome_probs_from_history,
+    sorted by batter, scored together, and averaged per batter with
+    np.add.reduceat on the batter boundaries. Missing features stay NaN, as
+    the outcome model was trained on them (no imputation).
+
+    Returns one row per batter: batter_id, n_pas, then one column per
+    OUTCOME_LABELS entry.
+    """
+    df = matchups[matchups["outcome_id"].notna()]
+    if recent_start_year is not None:
+        df = df[df["date"].dt.year >= recent_start_year]
+
+    batters = df["batter"].to_numpy(dtype="int64", na_value=-1)
+    order = np.argsort(batters, kind="stable")
+    batters = batters[order]
+    ids, starts, counts = np.unique(batters, return_index=True, return_counts=True)
+
+    X = df.reindex(columns=feature_cols, fill_value=0).iloc[order]
+    X = X.astype(np.float32)
+
+    probs = _predict_proba(model, X)
+    avg_probs = np.add.reduceat(probs, starts, axis=0) / counts[:, None]
+
+    out = pd.DataFrame(avg_probs, columns=OUTCOME_LABELS)
+    out.insert(0, "n_pas", counts)
+    out.insert(0, "batter_id", ids)
+    return out[out["batter_id"] >= 0].reset_index(drop=True)
+
+
+def _cached_batter_probs(
+    model,
+    feature_cols: list[str],
+    matchups: pd.DataFrame,
+    batter_id: int,
+    recent_start_year: Optional[int],
+) -> Optional[pd.Series]:
+    """
+    Look up a batter's averaged probabilities in batter_avg_probs.parquet.
+
+    Entries are keyed by (batter_id, model_file, model_version,
+    matchups_file, matchups_version, recent_start_year), where the file and
+    version pairs are the names and mtimes of the files load_artifacts
+    loaded `model` and `matchups` from. The first lookup for a model,
+    dataset and start year fills in every batter at once; entries from other
+    files are dropped when the cache is rewritten. Returns None when `model`
+    or `matchups` didn't come from load_artifacts or the batter has no
+    qualifying PAs.
+    """
+    model_artifact = _artifact(model)
+    matchups_artifact = _artifact(matchups)
+    if model_artifact is None or matchups_artifact is None:
+        return None
+    model_file, model_version = model_artifact
+    matchups_file, matchups_version = matchups_artifact
+
+    start_year = recent_start_year if recent_start_year is not None else 0
+    cache_path = _batter_probs_cache_path()
+    cache = pd.read_parquet(cache_path) if cache_path.exists() else None
+    if cache is not None:
+        if "matchups_file" in cache.columns:
+            cache = cache[
+                (cache["model_file"] == model_file)
+                & (cache["model_version"] == model_version)
+                & (cache["matchups_file"] == matchups_file)
+                & (cache["matchups_version"] == matchups_version)
+            ]
+        else:
+            cache = None  # written before entries recorded their source files
+
+    if cache is None or not (cache["recent_start_year"] == start_year).any():
+        fresh = compute_all_batter_avg_probs(model, feature_cols, matchups, recent_start_year)
+        fresh.insert(1, "model_file", model_file)
+        fresh.insert(2, "model_version", np.int64(model_version))
+        fresh.insert(3, "matchups_file", matchups_file)
+        fresh.insert(4, "matchups_version", np.int64(matchups_version))
+        fresh.insert(5, "recent_start_year", np.int64(start_year))
+        cache = fresh if cache is None else pd.concat([cache, fresh], ignore_index=True)
+        cache.to_parquet(cache_path, index=False)
+
+    row = cache[(cache["batter_id"] == batter_id) & (cache["recent_start_year"] == start_year)]
+    if row.empty:
+        return None
+    return row.iloc[0]
+
+
 def estimate_batter_outcome_probs_from_history(
     model,
     feature_cols: list[str],
@@ -152,6 +368,7 @@ def estimate_batter_outcome_probs_from_history(
     min_pas: int = 200,
     recent_only: bool = True,
     recent_start_year: int = 2024,
+    use_cache: bool = False,
 ) -> Dict[str, float]:
     """
     Use the trained multiclass outcome model on the batter's *real* plate appearances
@@ -159,14 +376,29 @@ def estimate_batter_outcome_probs_from_history(
 
     - filters to rows where outcome_id is not null (terminal PAs)
     - optionally restricts to recent seasons (e.g., 2024–2025)
-    - runs model.predict_proba on those rows
+    - runs the model on those rows
     - returns the mean probability vector across all PAs
 
     This avoids synthetic "neutral" rows and uses actual contexts the batter saw.
+
+    With use_cache=True, the averages come from batter_avg_probs.parquet next
+    to the model, which the first call writes (see _cached_batter_probs). Only
+    the model and matchups returned by load_artifacts are cached; anything
+    else is scored directly.
     """
 
-    df = matchups.copy()
-    df = df[df["batter"] == batter_id]
+    if use_cache:
+        cached = _cached_batter_probs(
+            model, feature_cols, matchups, batter_id,
+            recent_start_year if recent_only else None,
+        )
+        if cached is not None:
+            n_pas = int(cached["n_pas"])
+            if n_pas < min_pas:
+                print(f"Warning: only {n_pas} PAs for batter_id={batter_id} (min_pas={min_pas})")
+            return {label: float(cached[label]) for label in OUTCOME_LABELS}
+
+    df = select_batter_rows(matchups, batter_id)
     df = df[df["outcome_id"].notna()]
 
     if recent_only:
@@ -178,11 +410,11 @@ def estimate_batter_outcome_probs_from_history(
     if len(df) < min_pas:
         print(f"Warning: only {len(df)} PAs for batter_id={batter_id} (min_pas={min_pas})")
 
-    # Align to feature cols used in training
+    # Align to feature cols used in training; NaNs are left for the model,
+    # which was trained on unfilled features
     X = df.reindex(columns=feature_cols, fill_value=0)
-    X = fill_missing_values(X)
 
-    probs = model.predict_proba(X)  # shape: (num_samples, num_classes)
+    probs = _predict_proba(model, X)  # shape: (num_samples, num_classes)
     avg_probs = probs.mean(axis=0)
 
     return {label: float(p) for label, p in zip(OUTCOME_LABELS, avg_probs)}
@@ -197,5 +429,5 @@ def predict_outcome_probs_for_matchup(
     Run the multiclass outcome model and map the probabilities to OUTCOME_LABELS.
     Returns: {label -> probability}
     """
-    probs = model.predict_proba(X)[0]  # shape: (num_classes,)
+    probs = _predict_proba(model, X)[0]  # shape: (num_classes,)
     return {label: float(p) for label, p in zip(OUTCOME_LABELS, probs)}
@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 from typing import Dict
+
+import numpy as np
+
 from .build_dataset import OUTCOME_LABELS
 
 """
@@ -42,6 +45,11 @@ HITTER_OUTCOME_POINTS: Dict[str, float] = {
 }
 
 
+# HITTER_OUTCOME_POINTS in OUTCOME_LABELS order, i.e. aligned with the
+# columns of the outcome model's predict_proba output
+_POINTS_VEC = np.array([HITTER_OUTCOME_POINTS.get(label, 0.0) for label in OUTCOME_LABELS])
+
+
 def expected_hitter_points_per_pa(
     outcome_probs: Dict[str, float],
 ) -> float:
@@ -52,12 +60,16 @@ def expected_hitter_points_per_pa(
     outcome_probs should come from the multiclass model, with keys
     matching OUTCOME_LABELS.
     """
-    ev = 0.0
-    for label in OUTCOME_LABELS:
-        prob = float(outcome_probs.get(label, 0.0))
-        pts = HITTER_OUTCOME_POINTS.get(label, 0.0)
-        ev += prob * pts
-    return ev
+    probs = np.array([float(outcome_probs.get(label, 0.0)) for label in OUTCOME_LABELS])
+    return float(probs @ _POINTS_VEC)
+
+
+def expected_hitter_points_per_pa_batch(probs: np.ndarray) -> np.ndarray:
+    """
+    Expected fantasy points per PA for every row of an (N, len(OUTCOME_LABELS))
+    probability matrix, e.g. straight from the outcome model's predict_proba.
+    """
+    return np.asarray(probs) @ _POINTS_VEC
 
 
 def hitter_points_breakdown(
@@ -1,70 +1,35 @@
 from pathlib import Path
-from typing import Tuple, List
+from typing import List
 
+import numpy as np
 import pandas as pd
 
 from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import (
     accuracy_score, roc_auc_score,
     precision_score, recall_score,
-    confusion_matrix, precision_recall_curve
+    confusion_matrix,
 )
 
 import xgboost as xgb
 import joblib
 
 from . import config
-
-def load_matchup_dataset() -> pd.DataFrame:
-    path = config.MODELING_DIR / "matchups.parquet"
-    if not path.exists():
-        raise FileNotFoundError("matchups.parquet not found. Run build_dataset.py first.")
-    df = pd.read_parquet(path)
-    df = df.sort_values("date").reset_index(drop=True)
-    return df
-
-def get_feature_columns(df: pd.DataFrame) -> List[str]:
-    """
-    Select numeric feature columns only, excluding ID/date/target columns.
-    """
-    blacklist = {"date", "game_pk", "at_bat_number", "pitch_number", "batter", "pitcher", "is_hit"}
-
-    # Keep only numeric columns for modeling
-    numeric_cols = df.select_dtypes(include=["number", "bool"]).columns
-
-    return [c for c in numeric_cols if c not in blacklist]
-
-
-def split_by_date(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    # Ensure "date" is datetime64[ns]
-    df["date"] = pd.to_datetime(df["date"])
-
-    # Convert config dates (datetime.date) to pandas Timestamp
-    train_end = pd.Timestamp(config.TRAIN_END)
-    val_start = pd.Timestamp(config.VAL_START)
-    val_end = pd.Timestamp(config.VAL_END)
-    test_start = pd.Timestamp(config.TEST_START)
-
-    train = df[df["date"] <= train_end]
-    val = df[(df["date"] >= val_start) & (df["date"] <= val_end)]
-    test = df[df["date"] >= test_start]
-
-    print(f"Train: {len(train):,} rows")
-    print(f"Val:   {len(val):,} rows")
-    print(f"Test:  {len(test):,} rows")
-
-    return train, val, test
+from .training_data import load_training_splits
 
 def fill_missing_values(X: pd.DataFrame) -> pd.DataFrame:
     """
     Logistic Regression requires no NaNs.
-    We fill missing numeric values with the column median.
+    We fill missing numeric values with the column median; only columns
+    with gaps need a median, and fillna returns a new frame, so X is
+    untouched.
     """
-    X_filled = X.copy()
-    for col in X_filled.columns:
-        if X_filled[col].isna().any():
-            X_filled[col] = X_filled[col].fillna(X_filled[col].median())
-    return X_filled
+    missing = X.columns[X.isna().any().to_numpy()]
+    if missing.empty:
+        return X.copy()
+    return X.fillna(X[missing].median(numeric_only=True))
 
 def make_xy(df: pd.DataFrame, feature_cols: List[str]):
     X = df[feature_cols]
@@ -72,7 +37,12 @@ def make_xy(df: pd.DataFrame, feature_cols: List[str]):
     return X, y
 
 def train_logistic_baseline(X_train, y_train, X_val, y_val):
-    model = LogisticRegression(max_iter=1000, n_jobs=-1)
+    # Unscaled features left lbfgs running into max_iter; scaled, liblinear
+    # converges in a few iterations. (n_jobs was ignored by lbfgs anyway.)
+    model = Pipeline([
+        ("sc", StandardScaler(with_mean=False)),
+        ("lr", LogisticRegression(solver="liblinear", max_iter=200)),
+    ])
     model.fit(X_train, y_train)
 
     preds = model.predict_proba(X_val)[:, 1]
@@ -86,6 +56,11 @@ def train_logistic_baseline(X_train, y_train, X_val, y_val):
     return model
 
 def train_xgb_model(X_train, y_train, X_val, y_val):
+    """
+    XGBoost routes NaNs down a learned default branch at each split, so X is
+    passed in unfilled.
+    Returns (model, val_probs).
+    """
     params = {
         "objective": "binary:logistic",
         "eval_metric": "logloss",
@@ -94,22 +69,37 @@ def train_xgb_model(X_train, y_train, X_val, y_val):
         "subsample": 0.8,
         "colsample_bytree": 0.8,
         "n_estimators": 500,
+        # hist makes XGBClassifier.fit build QuantileDMatrix for the train set
+        # and, quantized against it, the eval set (xgboost >= 2.0)
+        "tree_method": "hist",
+        "device": config.XGB_DEVICE,  # MM_XGB_DEVICE=cuda to train on a GPU
     }
 
     model = xgb.XGBClassifier(**params)
     model.fit(X_train, y_train,
               eval_set=[(X_val, y_val)],
               verbose=False)
+    # Saved models are scored on CPU-only hosts (CLI, dashboard)
+    model.set_params(device="cpu")
 
-    preds = model.predict_proba(X_val)[:, 1]
-    auc = roc_auc_score(y_val, preds)
-    acc = accuracy_score(y_val, preds >= 0.5)
+    # Returned too, so threshold tuning reuses this pass over X_val
+    val_probs = _predict_hit_proba(model, X_val)
+    auc = roc_auc_score(y_val, val_probs)
+    acc = accuracy_score(y_val, val_probs >= 0.5)
 
     print(f"\nXGBoost Model:")
     print(f"AUC: {auc:.4f}")
     print(f"Accuracy: {acc:.4f}")
 
-    return model
+    return model, val_probs
+
+def _predict_hit_proba(model, X) -> np.ndarray:
+    """
+    P(hit) for each row of X, scored straight on the booster so the sklearn
+    wrapper doesn't build a DMatrix copy of X first.
+    """
+    X_np = X.to_numpy(dtype=np.float32) if isinstance(X, pd.DataFrame) else X
+    return model.get_booster().inplace_predict(np.ascontiguousarray(X_np))
 
 def find_best_threshold(y_val, probs):
     """
@@ -117,17 +107,27 @@ def find_best_threshold(y_val, probs):
     Here we maximize F1-score over possible thresholds.
     Returns (best_threshold, precision, recall, f1).
     """
-    precisions, recalls, thresholds = precision_recall_curve(y_val, probs)
-    # precision_recall_curve returns N+1 points, thresholds has length N.
-    # Skip the first point (threshold undefined) when pairing with thresholds.
+    # One descending sort, then cumulative true positives at the last row of
+    # each run of tied scores: predicting positive for every score >= t
+    # gives the precision/recall at threshold t for all distinct t at once.
+    probs = np.asarray(probs)
+    order = np.argsort(probs, kind="stable")[::-1]
+    sorted_probs = probs[order]
+    sorted_y = np.asarray(y_val)[order] == 1
+
+    ends = np.r_[np.flatnonzero(sorted_probs[1:] != sorted_probs[:-1]), len(sorted_probs) - 1]
+    true_pos = np.cumsum(sorted_y)[ends]
+    thresholds = sorted_probs[ends]
+    precisions = true_pos / (ends + 1)
+    recalls = true_pos / max(true_pos[-1], 1)
     f1_scores = 2 * precisions * recalls / (precisions + recalls + 1e-8)
 
-    f1_for_thresholds = f1_scores[1:]          # align with thresholds
-    idx = f1_for_thresholds.argmax()
+    # Lowest threshold among ties (the last one in descending order)
+    idx = len(f1_scores) - 1 - f1_scores[::-1].argmax()
     best_threshold = thresholds[idx]
-    best_precision = precisions[idx + 1]
-    best_recall = recalls[idx + 1]
-    best_f1 = f1_scores[idx + 1]
+    best_precision = precisions[idx]
+    best_recall = recalls[idx]
+    best_f1 = f1_scores[idx]
 
     print("\n=== Threshold tuning on validation set ===")
     print(f"Best threshold: {best_threshold:.3f}")
@@ -138,7 +138,7 @@ def find_best_threshold(y_val, probs):
     return best_threshold, best_precision, best_recall, best_f1
 
 def evaluate_on_test(model, X_test, y_test, threshold: float = 0.5):
-    probs = model.predict_proba(X_test)[:, 1]
+    probs = _predict_hit_proba(model, X_test)
     preds = (probs >= threshold).astype(int)
 
     auc = roc_auc_score(y_test, probs)
@@ -171,35 +171,30 @@ def save_model(model, name: str):
     joblib.dump(model, path)
     print(f"Saved model to {path}")
 
-def main():
-    print("Loading dataset...")
-    df = load_matchup_dataset()
-
-    print("Selecting features...")
-    feature_cols = get_feature_columns(df)
-
-    print("Splitting by date...")
-    train, val, test = split_by_date(df)
+    # XGBoost models also get XGBoost's native UBJSON format, which loads
+    # faster than unpickling the wrapper and across xgboost versions
+    if hasattr(model, "save_model"):
+        native_path = path.with_suffix(".ubj")
+        model.save_model(native_path)
+        print(f"Saved native model to {native_path}")
 
-    X_train, y_train = make_xy(train, feature_cols)
-    X_val, y_val = make_xy(val, feature_cols)
-    X_test, y_test = make_xy(test, feature_cols)
-
-    # Fill missing values for models that cannot handle NaNs
-    X_train = fill_missing_values(X_train)
-    X_val = fill_missing_values(X_val)
-    X_test = fill_missing_values(X_test)
-
-    # Baseline model
-    baseline = train_logistic_baseline(X_train, y_train, X_val, y_val)
+def main():
+    feature_cols, (X_train, y_train), (X_val, y_val), (X_test, y_test) = load_training_splits(
+        {"is_hit"}, make_xy,
+    )
+
+    # Baseline model; only logistic regression needs the NaNs filled
+    X_train_filled = fill_missing_values(X_train)
+    X_val_filled = fill_missing_values(X_val)
+    baseline = train_logistic_baseline(X_train_filled, y_train, X_val_filled, y_val)
     save_model(baseline, "baseline_logistic")
+    del X_train_filled, X_val_filled
 
     # XGBoost model
-    xgb_model = train_xgb_model(X_train, y_train, X_val, y_val)
+    xgb_model, val_probs = train_xgb_model(X_train, y_train, X_val, y_val)
     save_model(xgb_model, "xgboost_hit_model")
 
     # Tune threshold on validation set
-    val_probs = xgb_model.predict_proba(X_val)[:, 1]
     best_threshold, _, _, _ = find_best_threshold(y_val, val_probs)
 
     # Evaluate on test using tuned threshold
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import List, Tuple
+from typing import List
 
 import json
 import pandas as pd
@@ -17,54 +17,7 @@ import joblib
 
 from . import config
 from .build_dataset import OUTCOME_LABELS
-
-def load_matchup_dataset() -> pd.DataFrame:
-    path = config.MODELING_DIR / "matchups.parquet"
-    if not path.exists():
-        raise FileNotFoundError("matchups.parquet not found. Run build_dataset.py first.")
-    df = pd.read_parquet(path)
-    df = df.sort_values("date").reset_index(drop=True)
-    return df
-
-def get_feature_columns(df: pd.DataFrame) -> List[str]:
-    blacklist = {
-        "date", "game_pk", "at_bat_number", "pitch_number",
-        "batter", "pitcher",
-        "is_hit", "outcome", "outcome_id",
-    }
-    numeric_cols = df.select_dtypes(include=["number", "bool"]).columns
-    return [c for c in numeric_cols if c not in blacklist]
-
-def split_by_date(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    # Ensure "date" is datetime64[ns]
-    df["date"] = pd.to_datetime(df["date"])
-
-    # Convert config dates (datetime.date) to pandas Timestamp
-    train_end = pd.Timestamp(config.TRAIN_END)
-    val_start = pd.Timestamp(config.VAL_START)
-    val_end = pd.Timestamp(config.VAL_END)
-    test_start = pd.Timestamp(config.TEST_START)
-
-    train = df[df["date"] <= train_end]
-    val = df[(df["date"] >= val_start) & (df["date"] <= val_end)]
-    test = df[df["date"] >= test_start]
-
-    print(f"Train: {len(train):,} rows")
-    print(f"Val:   {len(val):,} rows")
-    print(f"Test:  {len(test):,} rows")
-
-    return train, val, test
-
-def fill_missing_values(X: pd.DataFrame) -> pd.DataFrame:
-    """
-    Logistic Regression requires no NaNs.
-    We fill missing numeric values with the column median.
-    """
-    X_filled = X.copy()
-    for col in X_filled.columns:
-        if X_filled[col].isna().any():
-            X_filled[col] = X_filled[col].fillna(X_filled[col].median())
-    return X_filled
+from .training_data import load_training_splits
 
 def make_xy_multiclass(df: pd.DataFrame, feature_cols: List[str]):
     X = df[feature_cols]
@@ -72,6 +25,10 @@ def make_xy_multiclass(df: pd.DataFrame, feature_cols: List[str]):
     return X, y
 
 def train_xgb_multiclass(X_train, y_train, X_val, y_val):
+    """
+    XGBoost routes NaNs down a learned default branch at each split, so the
+    features are passed in unfilled.
+    """
     params = {
         "objective": "multi:softprob",
         "num_class": len(OUTCOME_LABELS),
@@ -81,6 +38,10 @@ def train_xgb_multiclass(X_train, y_train, X_val, y_val):
         "subsample": 0.8,
         "colsample_bytree": 0.8,
         "n_estimators": 500,
+        # hist makes XGBClassifier.fit build QuantileDMatrix for the train set
+        # and, quantized against it, the eval set (xgboost >= 2.0)
+        "tree_method": "hist",
+        "device": config.XGB_DEVICE,  # MM_XGB_DEVICE=cuda to train on a GPU
     }
 
     # Compute class weights (inverse frequency)
@@ -103,6 +64,8 @@ def train_xgb_multiclass(X_train, y_train, X_val, y_val):
         eval_set=[(X_val, y_val)],
         verbose=False,
     )
+    # Saved models are scored on CPU-only hosts (CLI, dashboard)
+    model.set_params(device="cpu")
 
     # Quick sanity print
     print("\nClass counts (train):", class_counts)
@@ -112,7 +75,10 @@ def train_xgb_multiclass(X_train, y_train, X_val, y_val):
 
 
 def evaluate_multiclass_on_test(model, X_test, y_test):
-    probs = model.predict_proba(X_test)
+    # Scored straight on the booster, skipping the sklearn wrapper's DMatrix
+    # copy of X_test; returns (num_samples, num_classes) like predict_proba
+    X_np = X_test.to_numpy(dtype=np.float32) if isinstance(X_test, pd.DataFrame) else X_test
+    probs = model.get_booster().inplace_predict(np.ascontiguousarray(X_np))
     preds = probs.argmax(axis=1)
 
     acc = accuracy_score(y_test, preds)
@@ -139,6 +105,12 @@ def save_multiclass_model(model, feature_cols: List[str]):
     joblib.dump(model, model_path)
     print(f"Saved multiclass model to {model_path}")
 
+    # XGBoost's native UBJSON alongside the pickle; load_artifacts prefers it
+    # (see load_xgb), other consumers keep unpickling the .joblib
+    native_path = model_path.with_suffix(".ubj")
+    model.save_model(native_path)
+    print(f"Saved native model to {native_path}")
+
     feats_path = config.MODELS_DIR / "outcome_feature_cols.json"
     with open(feats_path, "w") as f:
         json.dump(feature_cols, f)
@@ -149,25 +121,19 @@ def save_multiclass_model(model, feature_cols: List[str]):
         json.dump(OUTCOME_LABELS, f)
     print(f"Saved outcome labels to {labels_path}")
 
-def main():
-    print("Loading dataset...")
-    df = load_matchup_dataset()
-
-    df = df[df["outcome_id"].notna()].copy()
-
-    print("Selecting features...")
-    feature_cols = get_feature_columns(df)
-
-    print("Splitting by date...")
-    train, val, test = split_by_date(df)
-
-    X_train, y_train = make_xy_multiclass(train, feature_cols)
-    X_val, y_val = make_xy_multiclass(val, feature_cols)
-    X_test, y_test = make_xy_multiclass(test, feature_cols)
+def load_xgb(path: Path) -> xgb.XGBClassifier:
+    """
+    Load a classifier saved with XGBClassifier.save_model (.ubj/.json).
+    The sklearn attributes predict_proba needs are stored in the file too.
+    """
+    model = xgb.XGBClassifier()
+    model.load_model(path)
+    return model
 
-    X_train = fill_missing_values(X_train)
-    X_val = fill_missing_values(X_val)
-    X_test = fill_missing_values(X_test)
+def main():
+    feature_cols, (X_train, y_train), (X_val, y_val), (X_test, y_test) = load_training_splits(
+        {"is_hit", "outcome", "outcome_id"}, make_xy_multiclass, dropna_target="outcome_id",
+    )
 
     model = train_xgb_multiclass(X_train, y_train, X_val, y_val)
 
@@ -0,0 +1,108 @@
+import gc
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from . import config
+from .build_dataset import _current_matchups_path, read_matchups
+
+# Numeric ID columns in matchups.parquet that are never model inputs
+ID_COLUMNS = {"game_pk", "at_bat_number", "pitch_number", "batter", "pitcher"}
+
+def load_matchup_dataset() -> pd.DataFrame:
+    # The .arrow copy when it is current, else matchups.parquet; the schema
+    # and the data both come from this one file
+    path = _current_matchups_path()
+    if not path.exists():
+        raise FileNotFoundError("matchups.parquet not found. Run build_dataset.py first.")
+    # Only decode date plus the numeric columns features and targets come
+    # from; ID columns are never used, so skip them at read time
+    schema = ds.dataset(path, format="feather" if path.suffix == ".arrow" else "parquet").schema
+    columns = ["date"] + [
+        field.name for field in schema
+        if field.name not in ID_COLUMNS
+        and (pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+             or pa.types.is_boolean(field.type))
+    ]
+    df = read_matchups(columns, path=path)
+    # finalize_and_save writes rows in date order; only older files need a sort
+    if not df["date"].is_monotonic_increasing:
+        df.sort_values("date", kind="stable", inplace=True, ignore_index=True)
+    return df
+
+def get_feature_columns(df: pd.DataFrame, target_cols: Iterable[str]) -> List[str]:
+    """
+    Select numeric feature columns only, excluding ID/date columns and the
+    given target columns.
+    """
+    blacklist = {"date", *ID_COLUMNS, *target_cols}
+
+    # Keep only numeric columns for modeling
+    # (dtype kinds select_dtypes counts as number/bool: bool, int, uint,
+    # float, complex, timedelta; read straight off df.dtypes)
+    return [c for c, dt in df.dtypes.items() if dt.kind in "biufcm" and c not in blacklist]
+
+def split_by_date(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    # Ensure "date" is datetime64[ns]
+    df["date"] = pd.to_datetime(df["date"])
+
+    # Convert config dates (datetime.date) to pandas Timestamp
+    train_end = pd.Timestamp(config.TRAIN_END)
+    val_start = pd.Timestamp(config.VAL_START)
+    val_end = pd.Timestamp(config.VAL_END)
+    test_start = pd.Timestamp(config.TEST_START)
+
+    # load_matchup_dataset sorts by date, so each split is a contiguous
+    # slice found by binary search; NaT dates sort last and are excluded
+    if not df["date"].is_monotonic_increasing:
+        df = df.sort_values("date", kind="stable")
+    dates = df["date"]
+    end = dates.searchsorted(pd.NaT, side="left")
+
+    train = df.iloc[:dates.searchsorted(train_end, side="right")]
+    val = df.iloc[dates.searchsorted(val_start, side="left"):dates.searchsorted(val_end, side="right")]
+    test = df.iloc[dates.searchsorted(test_start, side="left"):end]
+
+    print(f"Train: {len(train):,} rows")
+    print(f"Val:   {len(val):,} rows")
+    print(f"Test:  {len(test):,} rows")
+
+    return train, val, test
+
+def load_training_splits(
+    target_cols: Iterable[str],
+    make_xy: Callable[[pd.DataFrame, List[str]], Tuple[pd.DataFrame, pd.Series]],
+    dropna_target: Optional[str] = None,
+):
+    """
+    Load matchups.parquet and return (feature_cols, (X_train, y_train),
+    (X_val, y_val), (X_test, y_test)), with float32 feature matrices.
+    Rows missing dropna_target, if given, are dropped first.
+    """
+    print("Loading dataset...")
+    df = load_matchup_dataset()
+
+    if dropna_target is not None:
+        df.dropna(subset=[dropna_target], inplace=True)
+
+    print("Selecting features...")
+    feature_cols = get_feature_columns(df, target_cols)
+
+    print("Splitting by date...")
+    train, val, test = split_by_date(df)
+
+    # XGBoost bins features and inference scores float32 anyway; float32
+    # halves the feature matrices' memory and what gets copied into DMatrix
+    splits = []
+    for split in (train, val, test):
+        X, y = make_xy(split, feature_cols)
+        splits.append((X.astype("float32"), y))
+
+    # The splits are iloc views of df; X/y now hold their own copies, so the
+    # full dataset can go before training allocates its own buffers
+    del df, train, val, test, split
+    gc.collect()
+
+    return (feature_cols, *splits)